@@ -22,7 +22,8 @@ class URLs:
         There is no processing of the URLs or the URL parameters done in this class
         all of that logic is handled in the AllyAPI class.
     """
-    def __init__(self, response_format="json"):
+    def __init__(self, response_format="json", base_url="https://api.tradeking.com/v1/",
+                 stream_base_url="https://stream.tradeking.com/v1/"):
         """The URLs class constructor which defines all of the URLs used by the API.
 
             When adding new API functionality the URL needs to be added here.
@@ -32,10 +33,15 @@ class URLs:
             @param response_format - format of the response. Valid values are 'xml' and 'json'.
                 Specifying 'xml' will return an ElementTree containing the response XML while
                 'json' will return the response in the JSON format.
+            @param base_url - the API request endpoint. Only needs to be changed to
+                point the API at a different server, e.g. a local stand-in.
+            @param stream_base_url - the streaming API request endpoint.
         """
         self.format = response_format
 
-        self.base_url = "https://api.tradeking.com/v1/"
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.stream_base_url = stream_base_url if stream_base_url.endswith("/") \
+            else stream_base_url + "/"
         # self.request_token = "https://developers.tradeking.com/oauth/request_token"
         # self.user_auth = "https://developers.tradeking.com/oauth/authorize"
         # self.resource_owner_key = "https://developers.tradeking.com/oauth/resource_owner_key"
@@ -63,6 +69,9 @@ class URLs:
         self.options_strikes = "market/options/strikes.{format}".format(format=self.format)
         self.options_exps = "market/options/expirations.{format}".format(format=self.format)
 
+        # streaming, the stream is always parsed as json
+        self.stream_quotes = "market/quotes.json"
+
         # member
         self.member_profile = "member/profile.{format}".format(format=self.format)
 
@@ -245,6 +254,9 @@ class URLs:
     """
         STREAMING OPERATIONS
             MARKET
-            TODO:
-                GET market/quotes
     """
+    def stream_quotes_url(self):
+        """Combines the streaming request endpoint and streaming quotes URLs
+            @param self - the object pointer
+        """
+        return self.stream_base_url + self.stream_quotes
@@ -1,7 +1,10 @@
 from .ally import AllyAPI
+from .async_ally import AsyncAllyAPI
 from .ally import TIME_IN_FORCE
 from .ally import ORDER_TYPE
 from .ally import SIDE
 from .URLs import URLs
+from .batch import BatchExecutor, BatchResult
+from .order_pipeline import OrderPipeline, OrderResult, preview_ok
 from .responses import *
 from .requests import *
@@ -0,0 +1,141 @@
+"""@package account_snapshot
+    Concurrent refresh of the holdings, balances and orders of many accounts.
+
+    Instead of looping over get_account_holdings(id), get_account_balances(id)
+    and get_orders(id) for every account, fetch_accounts() discovers the
+    account numbers and fetches every per-account endpoint concurrently with a
+    BatchExecutor. The result is one AccountSnapshot per account.
+"""
+
+from .batch import BatchExecutor
+from .requests.account_holdings import AccountHoldingsRequest
+from .requests.account_balances import AccountBalancesRequest
+from .requests.orders import OrdersRequest
+
+ENDPOINTS = {
+    "holdings": AccountHoldingsRequest,
+    "balances": AccountBalancesRequest,
+    "orders": OrdersRequest,
+}
+
+
+class AccountSnapshot:
+    """The responses fetched for one account.
+
+        holdings - AccountHoldingsResponse
+        balances - AccountBalancesResponse
+        orders - OrdersResponse
+        timings - seconds each endpoint took, keyed by endpoint
+        errors - exception raised by each failed endpoint, keyed by endpoint
+    """
+    def __init__(self, account_id):
+        self.account_id = account_id
+        self.holdings = None
+        self.balances = None
+        self.orders = None
+        self.timings = {}
+        self.errors = {}
+
+    def ok(self):
+        """Returns True if every endpoint was fetched successfully.
+            @param self - the object pointer
+        """
+        return not self.errors
+
+    def elapsed(self):
+        """Returns the time of the slowest endpoint of this account.
+            @param self - the object pointer
+        """
+        return max(self.timings.values()) if self.timings else 0.0
+
+
+def parse_account_ids(data, response_format="json"):
+    """Returns the account numbers found in a get_accounts() or
+        get_member_profile() response.
+        @param data - response of get_accounts() or get_member_profile()
+        @param response_format - 'json' or 'xml'
+    """
+    if response_format == "json":
+        response = data["response"]
+        if "accounts" in response:
+            accounts = (response["accounts"] or {}).get("accountsummary") or []
+        else:
+            accounts = (response.get("userdata") or {}).get("account") or []
+        if isinstance(accounts, dict):
+            accounts = [accounts]
+        return [str(account["account"]) for account in accounts if account.get("account")]
+
+    ids = [el.text for el in data.findall("accounts/accountsummary/account")]
+    if not ids:
+        ids = [el.text for el in data.findall("userdata/account/account")]
+    return [account_id.strip() for account_id in ids if account_id]
+
+
+def get_account_ids(ally_api):
+    """Returns the account numbers of the user, from get_accounts() or, if
+        that lists none, from get_member_profile().
+        @param ally_api - the AllyAPI instance
+    """
+    ids = parse_account_ids(ally_api.get_accounts(), ally_api.format)
+    if not ids:
+        ids = parse_account_ids(ally_api.get_member_profile(), ally_api.format)
+    return ids
+
+
+def _build_requests(account_ids, endpoints, response_format):
+    keys = []
+    requests = []
+    for account_id in account_ids:
+        for endpoint in endpoints:
+            keys.append((account_id, endpoint))
+            requests.append(ENDPOINTS[endpoint](account_id, response_format))
+    return keys, requests
+
+
+def _collect(account_ids, keys, batch):
+    snapshots = {account_id: AccountSnapshot(account_id) for account_id in account_ids}
+    for (account_id, endpoint), result, error, latency in \
+            zip(keys, batch.results, batch.errors, batch.latencies):
+        snapshot = snapshots[account_id]
+        snapshot.timings[endpoint] = latency
+        if error is not None:
+            snapshot.errors[endpoint] = error
+        else:
+            setattr(snapshot, endpoint, result)
+    return snapshots
+
+
+def fetch_accounts(ally_api, account_ids=None, endpoints=("holdings", "balances", "orders"),
+                   max_workers=8):
+    """Fetches the endpoints of every account concurrently and returns a dict
+        of AccountSnapshot objects keyed by account number.
+        @param ally_api - the AllyAPI instance
+        @param account_ids - account numbers to fetch, discovered when not given
+        @param endpoints - any of 'holdings', 'balances' and 'orders'
+        @param max_workers - maximum number of requests in flight
+    """
+    if account_ids is None:
+        account_ids = get_account_ids(ally_api)
+    account_ids = [str(account_id) for account_id in account_ids]
+    keys, requests = _build_requests(account_ids, endpoints, ally_api.format)
+    batch = BatchExecutor(ally_api, max_workers).execute(requests)
+    return _collect(account_ids, keys, batch)
+
+
+async def fetch_accounts_async(ally_api, account_ids=None,
+                               endpoints=("holdings", "balances", "orders"), max_workers=8):
+    """The AsyncAllyAPI version of fetch_accounts().
+        @param ally_api - the AsyncAllyAPI instance
+        @param account_ids - account numbers to fetch, discovered when not given
+        @param endpoints - any of 'holdings', 'balances' and 'orders'
+        @param max_workers - maximum number of requests in flight
+    """
+    if account_ids is None:
+        account_ids = parse_account_ids(await ally_api.get_accounts(), ally_api.format)
+        if not account_ids:
+            account_ids = parse_account_ids(await ally_api.get_member_profile(),
+                                            ally_api.format)
+    account_ids = [str(account_id) for account_id in account_ids]
+    keys, requests = _build_requests(account_ids, endpoints, ally_api.format)
+    batch = await BatchExecutor(ally_api, max_workers).execute_async(requests)
+    return _collect(account_ids, keys, batch)
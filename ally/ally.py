@@ -14,16 +14,27 @@
     This project was inspired my PyAlly (https://github.com/alienbrett/PyAlly).
 """
 
-from requests_oauthlib import OAuth1
 from xml.etree import ElementTree
-import datetime
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import json
-from collections import defaultdict
-import re
-import copy
+import time
 
 from .URLs import URLs
+from .fixml import convert_fixml_json, convert_fixml_xml, fixml_to_dict, get_fixml
+from .symbols import get_symbol_string
+from .chunking import chunk_symbols, merge_quotes
+from .session import create_session, get_pool_stats
+from .rate_limit import RateLimiter
+from .signer import OAuthSigner
+from .coalesce import QuoteCoalescer
+from .cache import ResponseCache
+from .stream import QuoteStream
+from .account_snapshot import fetch_accounts
+from .json_decoder import get_decoder
+from .history import get_history_query, iter_account_history
+from .params import (get_option_quote_symbols, get_news_search_query, get_watchlist_payload,
+                     check_order_price)
 
 class AllyAPI:
     """The AllyAPI class providing blackbox use of the Ally Invest API.
@@ -43,12 +54,14 @@ class AllyAPI:
             DELETE watchlists/:id
             POST watchlists/:id/symbols
             DELETE watchlists/:id/symbols
-        STREAMING OPERATIONS
-            MARKET
-                GET market/quotes
     """
     def __init__(self, oauth_secret, oauth_token, client_key,
-                response_format="json"):
+                response_format="json", pool_connections=10, pool_maxsize=10,
+                pool_block=False, keep_alive=True, timeout=None,
+                max_url_length=2000, max_workers=4, rate_limiter=None,
+                coalesce_quotes=False, cache=None, json_decoder=None,
+                base_url="https://api.tradeking.com/v1/",
+                stream_base_url="https://stream.tradeking.com/v1/"):
         """AllyAPI constructor. Sets the response format on all of the URLs and
             the oauth/client keys required to access the API.
 
@@ -60,27 +73,74 @@ class AllyAPI:
                 @param response_format - format of the response. Valid values are 'xml' and 'json'.
                     Specifying 'xml' will return an ElementTree containing the response XML while
                     'json' will return the response in the JSON format.
+                @param pool_connections - number of per-host connection pools to cache
+                @param pool_maxsize - maximum number of connections kept open per host
+                @param pool_block - block when the pool for a host is exhausted instead
+                    of opening extra, non-pooled connections
+                @param keep_alive - reuse connections between requests
+                @param timeout - seconds to wait for the server, either a single value
+                    or a (connect, read) tuple. None waits forever.
+                @param max_url_length - longest quote URL sent to the server. Larger symbol
+                    lists are split into chunks that are requested concurrently.
+                @param max_workers - maximum number of chunks requested at the same time
+                @param rate_limiter - RateLimiter keeping calls inside Ally's per-category
+                    budgets and retrying throttled calls. Pass an instance to share it
+                    between AllyAPI objects, None for a default one or False to disable.
+                @param coalesce_quotes - share in-flight quote requests between threads
+                    asking for overlapping symbols at the same time
+                @param cache - cache the responses of slow-changing endpoints (market clock,
+                    member profile, version, status, options expirations and strikes,
+                    watchlists). True for a default ResponseCache or a cache instance.
+                @param json_decoder - JSON backend decoding the response bodies: 'orjson',
+                    'ujson', 'json' or a function taking bytes. None uses the fastest
+                    installed one. Requests pass it on to the responses they build.
+                @param base_url - the API request endpoint, e.g. a local stand-in server
+                @param stream_base_url - the streaming API request endpoint
         """
         self.format = response_format
-        self.url = URLs(response_format=response_format)
+        self.url = URLs(response_format=response_format, base_url=base_url,
+                        stream_base_url=stream_base_url)
+        self.json_decoder = get_decoder(json_decoder)
 
         self.oauth_secret = oauth_secret
         self.oauth_token = oauth_token
         self.client_key = client_key
         self.client_secret = client_key
 
-        self.auth_time = None
-        self.auth = None
-        self.valid_auth_dt = datetime.timedelta(seconds=10)
-
-    def __create_auth(self):
-        """A private method to create the OAuth1 object, if necessary."""
-        now = datetime.datetime.now()
+        self.auth = OAuthSigner(self.client_key, self.client_secret, self.oauth_token,
+                                self.oauth_secret)
+
+        self.timeout = timeout
+        self.max_url_length = max_url_length
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self.cache = ResponseCache() if cache is True else (cache or None)
+        self.quote_coalescer = None
+        if coalesce_quotes:
+            self.quote_coalescer = QuoteCoalescer(self.__fetch_quote_data, response_format)
+        self.session = create_session(pool_connections=pool_connections,
+                                      pool_maxsize=pool_maxsize,
+                                      pool_block=pool_block,
+                                      keep_alive=keep_alive)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes all pooled connections held by this instance.
+            @param self - the object pointer
+        """
+        self.session.close()
 
-        if self.auth == None or self.auth_time + self.valid_auth_dt < now:
-            self.auth_time = now
-            self.auth = OAuth1(self.client_key, self.client_secret, self.oauth_token,
-                          self.oauth_secret, signature_type='auth_header')
+    def get_pool_stats(self):
+        """Returns connection pool statistics per host, e.g. the number of
+            connections opened and requests sent, to confirm connection reuse.
+            @param self - the object pointer
+        """
+        return get_pool_stats(self.session)
 
     def __get_symbol_string(self, symbols):
         """Returns a string that is either a single quote or a comma-separated
@@ -88,136 +148,71 @@ class AllyAPI:
             @param self - the object pointer
             @param symbols - single ticker or list of ticker to get quotes for
         """
-        if not isinstance(symbols, str): # list
-            symbols = ",".join(symbols)
-        return symbols
+        return get_symbol_string(symbols)
 
-    def __convert_fixml_json(self, json_data):
+    def __convert_fixml_json(self, json_data, in_place=False):
         """Takes the order data and converts it to a consistent format.
            The FIXML message is also expanded, with the original intact.
             @param self - the object pointer
             @param json_data - original data to be converted.
+            @param in_place - convert json_data itself instead of a copy.
         """
-        # If there's no orders, there's nothing to do.
-        if not json_data["response"]["orderstatus"]["order"]:
-            return json_data
-
-        # Copy the data to keep from overwriting the input.
-        data = copy.deepcopy(json_data)
+        return convert_fixml_json(json_data, in_place)
 
-        # A single order will be a dict, and multiple a list.
-        # Convert order to always be a list of dicts.
-        if isinstance(data["response"]["orderstatus"]["order"], dict):
-            data["response"]["orderstatus"]["order"] = \
-                [data["response"]["orderstatus"]["order"]]
-
-        # Convert the FIXML message in each order.
-        # Add the keys to order itself, but preserve fixmlmessage.
-        for order in data["response"]["orderstatus"]["order"]:
-            order_xml = ElementTree.fromstring(order["fixmlmessage"])
-            order.update(self.__fixml_to_dict(order_xml))
-
-        # Return the converted data.
-        return data
-
-    def __convert_fixml_xml(self, xml_data):
+    def __convert_fixml_xml(self, xml_data, in_place=False):
         """Takes the order data and expands the FIXML message.
            The original message is left intact.
             @param self - the object pointer
             @param xml_data - original data to be converted.
+            @param in_place - convert xml_data itself instead of a copy.
         """
-        # Register the FIXML namespace.
-        ElementTree.register_namespace("", "http://www.fixprotocol.org/FIXML-5-0-SP2")
-
-        # Copy the data to keep from overwriting the input.
-        data = copy.deepcopy(xml_data)
-
-        # Each order will have a "fixmlmessage" to convert.
-        for order in data.find("orderstatus").findall("order"):
-            fixml_text = order.find("fixmlmessage").text
-            fixml = ElementTree.fromstring(fixml_text)
-            order.append(fixml)
-
-        # Return the converted data.
-        return data
+        return convert_fixml_xml(xml_data, in_place)
 
     def __fixml_to_dict(self, fixml):
         """Recursively convert FIXML to a dictionary.
             @param self - the object pointer
             @param fixml - FIXML Element to be converted.
         """
-        # Remove the Namespace from the tag.
-        tag = re.sub(r"\{[^}]*\} *", "", fixml.tag)
-
-        # Establish the final dictionary to return.
-        ret = {tag: {} if fixml.attrib else None}
-
-        # Recursively convert each subelement.
-        # Each subelement becomes a tag key with a dict value.
-        children = list(fixml)
-        if children:
-            defdict = defaultdict(list)
-            for childdict in map(self.__fixml_to_dict, children):
-                for key, val in childdict.items():
-                    defdict[key].append(val)
-            ret = {tag: {k: v[0] if len(v) == 1 else v
-                           for k, v in defdict.items()}}
-
-        # Set each attribute as a tag key.
-        if fixml.attrib:
-            ret[tag].update(("@" + k, v)
-                              for k, v in fixml.attrib.items())
-
-        # Set the value of each attribute key to the text.
-        if fixml.text:
-            text = fixml.text.strip()
-            if children or fixml.attrib:
-                if text:
-                  ret[tag]["#text"] = text
-            else:
-                ret[tag] = text
-
-        # Return the final dictionary.
-        return ret
+        return fixml_to_dict(fixml)
 
     def __get_fixml(self, ticker, amount, type, account, side, tif, price, sectype):
-        fixml = "<FIXML xmlns=\"http://www.fixprotocol.org/FIXML-5-0-SP2\">"
-        fixml += "<Order"
-        if type != ORDER_TYPE.MARKET and tif is not None:
-            fixml += " TmInForce=\"{}\"".format(tif)
-        if type != ORDER_TYPE.MARKET:
-            fixml += " Px=\"{}\"".format(price)
-        fixml += " Typ=\"{}\" Side=\"{}\" Acct=\"{}\">".format(type, side, account)
-        fixml += "<Instrmt SecTyp=\"{}\" Sym=\"{}\"/>".format(sectype, ticker)
-        fixml += "<OrdQty Qty=\"{}\"/></Order></FIXML>".format(amount)
-
-        return fixml
-
-    def __to_format(self, response, xml=False):
+        return get_fixml(ticker, amount, type, account, side, tif, price, sectype)
+
+    def __to_format(self, response, xml=False, raw=False):
         """A private method to return the API response in the desired format
             @param self - the object pointer
             @param response - response from the Ally Invest API
+            @param raw - return the undecoded response body
         """
         if response.status_code != 200:
             if response.status_code == 429:
-                print("Too many requests.")
-                exit()
+                raise requests.HTTPError("Too many requests.", response=response)
             elif response.status_code == 414:
-                print("URI too long, please chunk ticker symbols.")
-                exit()
+                raise requests.HTTPError("URI too long, lower max_url_length.",
+                                         response=response)
+        if raw:
+            return response.content
         if self.format == "json" and not xml:
-            return response.json()
+            return self.json_decoder(response.content)
         else:
             return ElementTree.fromstring(response.content)
 
-    def __get_data(self, url):
+    def __get_data(self, url, endpoint=None, raw=False):
         """A private method to return the requested data in the requested format
             for a given URL.
             @param self - the object pointer
             @param url - API URL to access
+            @param endpoint - name of a cacheable endpoint, used to look up its TTL
+            @param raw - return the undecoded response body, bypassing the cache
         """
-        self.__create_auth()
-        return self.__to_format(requests.get(url, auth=self.auth))
+        if raw or self.cache is None or endpoint is None or self.cache.ttl(endpoint) <= 0:
+            return self.__to_format(self.__request("GET", url), raw=raw)
+
+        data = self.cache.get(url)
+        if data is None:
+            data = self.__to_format(self.__request("GET", url))
+            self.cache.set(url, data, endpoint)
+        return data
 
     def __submit_post(self, url, data, headers={}, usexml=False):
         """A private method to submit a post request to the Ally Invest server
@@ -225,10 +220,34 @@ class AllyAPI:
             @param url - API URL to access
             @param data - payload for the HTTP request
         """
-        self.__create_auth()
-        res = requests.post(url, headers=headers, data=data, auth=self.auth)
+        res = self.__request("POST", url, headers=headers, data=data)
         return self.__to_format(res, usexml)
 
+    def __request(self, method, url, **kwargs):
+        """A private method to send a request through the pooled session. The
+            call waits for room in its rate limit budget and throttled calls
+            (HTTP 429) are retried with back off.
+            @param self - the object pointer
+            @param method - HTTP method
+            @param url - API URL to access
+            @param kwargs - additional arguments for requests.Session.request()
+        """
+        if not self.rate_limiter:
+            return self.session.request(method, url, auth=self.auth,
+                                        timeout=self.timeout, **kwargs)
+
+        category = self.rate_limiter.category(url, method)
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(category)
+            response = self.session.request(method, url, auth=self.auth,
+                                            timeout=self.timeout, **kwargs)
+            self.rate_limiter.update(category, response.headers)
+            if response.status_code != 429 or attempt >= self.rate_limiter.max_retries:
+                return response
+            time.sleep(self.rate_limiter.retry_delay(category, attempt, response.headers))
+            attempt += 1
+
     def get_accounts(self):
         """Returns all of the user's accounts."""
         return self.__get_data(self.url.accounts_url())
@@ -237,6 +256,20 @@ class AllyAPI:
         """Returns the balances of all of the user's accounts."""
         return self.__get_data(self.url.accounts_balances_url())
 
+    def get_accounts_snapshot(self, account_ids=None,
+                              endpoints=("holdings", "balances", "orders"), max_workers=8):
+        """Fetches the holdings, balances and orders of many accounts
+            concurrently. Returns a dict of AccountSnapshot objects keyed by
+            account number, holding the AccountHoldingsResponse,
+            AccountBalancesResponse and OrdersResponse of each account and the
+            time each endpoint took.
+            @param self - the object pointer
+            @param account_ids - account numbers, taken from get_accounts() when not given
+            @param endpoints - any of 'holdings', 'balances' and 'orders'
+            @param max_workers - maximum number of requests in flight
+        """
+        return fetch_accounts(self, account_ids, endpoints, max_workers)
+
     def get_account(self, id):
         """Returns a specific account provided the account ID (account number)
             @param self - the object pointer
@@ -251,30 +284,58 @@ class AllyAPI:
         """
         return self.__get_data(self.url.account_balances_url().format(id=str(id)))
 
-    def get_account_history(self, id):
+    def get_account_history(self, id, date_range=None, transactions=None, raw=False):
         """Returns the history of a specific account (ID = account number)
             @param self - the object pointer
             @param id - account number
+            @param date_range - 'all', 'today', 'current_week', 'current_month' or
+                'last_month', None for all
+            @param transactions - 'all', 'bookkeeping' or 'trade', None for all
+            @param raw - return the undecoded response body, e.g. for the
+                incremental xml parsing of AccountHistoryResponse
+        """
+        url = self.url.account_history_url().format(id=str(id))
+        return self.__get_data(url + get_history_query(date_range, transactions), raw=raw)
+
+    def iter_account_history(self, id, start=None, end=None, transactions=None):
+        """Yields the transactions of an account between two days, inclusive,
+            as Transaction objects. Only the history ranges covering the days
+            are requested and xml responses are parsed incrementally.
+            @param self - the object pointer
+            @param id - account number
+            @param start - first day, as a date or 'YYYY-MM-DD', None for no limit
+            @param end - last day, as a date or 'YYYY-MM-DD', None for no limit
+            @param transactions - 'all', 'bookkeeping' or 'trade', None for all
         """
-        return self.__get_data(self.url.account_history_url().format(id=str(id)))
+        return iter_account_history(self, id, start, end, transactions)
 
-    def get_account_holdings(self, id):
+    def get_account_holdings(self, id, raw=False):
         """Returns the holdings of a specific account (ID = account number)
             @param self - the object pointer
             @param id - account number
+            @param raw - return the undecoded response body, e.g. for the
+                incremental xml parsing of AccountHoldingsResponse
         """
-        return self.__get_data(self.url.account_holdings_url().format(id=str(id)))
+        return self.__get_data(self.url.account_holdings_url().format(id=str(id)), raw=raw)
 
-    def get_orders(self, id):
+    def get_orders(self, id, expand_fixml=True, raw=False):
         """Returns the orders of a specific account (ID = account number)
             @param self - the object pointer
             @param id - account number
+            @param expand_fixml - expand the FIXML message of every order. Pass
+                False to get the orders as sent by Ally, e.g. for a lazy
+                OrdersResponse, which only parses the messages that are read.
+            @param raw - return the undecoded response body, e.g. for the
+                incremental xml parsing of OrdersResponse
         """
-        data = self.__get_data(self.url.get_orders().format(id=str(id)))
+        data = self.__get_data(self.url.get_orders().format(id=str(id)), raw=raw)
+        if raw or not expand_fixml:
+          return data
+        # The data was just received, so it is converted in place.
         if self.format == "json":
-          return self.__convert_fixml_json(data)
+          return self.__convert_fixml_json(data, in_place=True)
 
-        return self.__convert_fixml_xml(data)
+        return self.__convert_fixml_xml(data, in_place=True)
 
     def post_order(self, id, fixml):
         """Posts an order and returns the response.
@@ -310,7 +371,7 @@ class AllyAPI:
             and current server timestamp.
             @param self - the object pointer
         """
-        return self.__get_data(self.url.clock_url())
+        return self.__get_data(self.url.clock_url(), "clock")
 
     def get_quote(self, symbols):
         """Returns quote information for a single ticker or list of tickers.
@@ -320,15 +381,47 @@ class AllyAPI:
             @param self - the object pointer
             @param symbols - single ticker or list of ticker to get quotes for
         """
-        url = self.url.quote_url()+"?symbols={symbols}"
-        symbols = self.__get_symbol_string(symbols)
-        return self.__get_data(url.format(symbols=symbols))
+        return self.__get_quote_data(self.__get_symbol_string(symbols).split(","))
+
+    def __get_quote_data(self, symbols):
+        """A private method to request quotes for a list of symbols, through the
+            quote coalescer when enabled.
+            @param self - the object pointer
+            @param symbols - list of ticker symbols
+        """
+        if self.quote_coalescer is not None:
+            return self.quote_coalescer.get_quotes(symbols)
+        return self.__fetch_quote_data(symbols)
+
+    def __fetch_quote_data(self, symbols):
+        """A private method to request quotes for a list of symbols. Lists too
+            long for a single URL are split into chunks which are fetched
+            concurrently and merged into one response in the original order.
+            @param self - the object pointer
+            @param symbols - list of ticker symbols
+        """
+        url = self.url.quote_url() + "?symbols={symbols}"
+        chunks = chunk_symbols(symbols, len(url) - len("{symbols}"), self.max_url_length)
+        urls = [url.format(symbols=self.__get_symbol_string(chunk)) for chunk in chunks]
+        if len(urls) == 1:
+            return self.__get_data(urls[0])
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as pool:
+            responses = list(pool.map(self.__get_data, urls))
+        return merge_quotes(responses, self.format)
 
-    def __get_option_quote_symbol(self, symbol, exp_date, strike, put_call):
-        sym = "{sym}{year}{month:02d}{day:02d}{putcall}{strike}"
-        strike = str(int(strike*1000)).zfill(8)
-        return sym.format(sym=symbol.upper(), year=str(exp_date.year)[-2:], month=exp_date.month,
-                        day=exp_date.day, putcall=put_call.upper(), strike=strike)
+    def stream_quotes(self, symbols, **kwargs):
+        """Returns a QuoteStream that yields Quote and Trade objects from the
+            streaming quotes endpoint as they arrive, e.g.
+
+                for item in ally.stream_quotes(["AAPL", "MSFT"]):
+                    print(item.symbol)
+
+            @param self - the object pointer
+            @param symbols - single ticker or list of tickers to stream
+            @param kwargs - options passed on to QuoteStream (reconnect, conflate, ...)
+        """
+        return QuoteStream(self, symbols, **kwargs)
 
     def get_option_quote(self, symbol, expiration_date, strike_price, put_call):
         """Returns a quote for an option for the symbol, expiration date, strike price
@@ -340,29 +433,10 @@ class AllyAPI:
             @param strike_price - option's strike price
             @param put_call - c=call, p=put
         """
-        url = self.url.quote_url() + "?symbols={sym}"
-
-        if isinstance(symbol, str): # single ticker
-            if not isinstance(expiration_date, datetime.datetime):
-                print("In 'get_option_quote': datetime.datetime expected for expiration date.")
-                return None
-            sym = self.__get_option_quote_symbol(symbol, expiration_date, strike_price, put_call)
-        elif isinstance(symbol, list) and isinstance(expiration_date, list) \
-            and isinstance(strike_price, list) and isinstance(put_call, list):
-            if not isinstance(expiration_date[0], datetime.datetime):
-                print("In 'get_option_quote': datetime.datetime expected for expiration date.")
-                return None
-            request_sym = []
-            for i in range(len(symbol)):
-                request_sym.append(self.__get_option_quote_symbol(symbol[i], expiration_date[i],
-                            strike_price[i], put_call[i]))
-            sym = self.__get_symbol_string(request_sym)
-        else:
-            print("In 'get_option_quote': symbol, expiration_date, strike_price, and put_call \
-                  must all be single values or lists.")
+        request_sym = get_option_quote_symbols(symbol, expiration_date, strike_price, put_call)
+        if request_sym is None:
             return None
-
-        return self.__get_data(url.format(sym=sym))
+        return self.__get_quote_data(request_sym)
 
     def news_search(self, symbols, startdate=None, enddate=None, maxhits=10):
         """Retrieves a listing of news headlines based on symbols.
@@ -372,19 +446,8 @@ class AllyAPI:
             @param enddate - search for articles between this date and startdate
             @param maxhits - number of articles to return
         """
-        if startdate is None or enddate is None:
-            print("news_search: either enddate or startdate is not specified, ignoring both.")
-
-        if (startdate is not None and enddate is not None) and (enddate < startdate):
-            print("news_search: start date is after end date.")
-            raise Exception("Start date is after end date in news search.")
-
-        url = self.url.news_search_url() + "?symbols={syms}&maxhits={mxhits}".format(mxhits=maxhits, syms="{syms}")
-        if startdate is not None and enddate is not None:
-            url += "&startdate={sdate}&enddate={edate}" \
-                .format(sdate=startdate.strftime("%m/%d/%Y"), edate=enddate.strftime("%m/%d/%Y"))
-
-        return self.__get_data(url.format(syms=self.__get_symbol_string(symbols)))
+        query = get_news_search_query(symbols, startdate, enddate, maxhits)
+        return self.__get_data(self.url.news_search_url() + query)
 
     def get_news_article(self, article_id):
         """Gets a single news article based on the article ID. This ID can be retrieved
@@ -420,37 +483,37 @@ class AllyAPI:
 
     def get_options_strikes(self, symbol):
         url = self.url.options_strikes_url() + ("?symbol={}".format(symbol))
-        return self.__get_data(url)
+        return self.__get_data(url, "options_strikes")
 
     def get_options_expirations(self, symbol):
         url = self.url.options_exps_url() + ("?symbol={}".format(symbol))
-        return self.__get_data(url)
+        return self.__get_data(url, "options_expirations")
 
     def get_member_profile(self):
         """Returns general information associated with the user including account
             numbers and account information.
             @param self - the object pointer
         """
-        return self.__get_data(self.url.member_profile_url())
+        return self.__get_data(self.url.member_profile_url(), "member_profile")
 
     def get_status(self):
         """Returns an error if the API endpoint/server is unavailable. Otherwise
             returns the current server timestamp.
             @param self - the object pointer
         """
-        return self.__get_data(self.url.status_url())
+        return self.__get_data(self.url.status_url(), "status")
 
     def get_version(self):
         """Gets the current version of the API of the endpoint called.
             @param self - the object pointer
         """
-        return self.__get_data(self.url.version_url())
+        return self.__get_data(self.url.version_url(), "version")
 
     def get_watchlists(self):
         """Retrieves all watchlists belonging to the member.
             @param self - the object pointer
         """
-        return self.__get_data(self.url.get_watchlists_url())
+        return self.__get_data(self.url.get_watchlists_url(), "watchlists")
 
 
     def create_watchlist(self, watchlist_name, symbols=""):
@@ -461,11 +524,11 @@ class AllyAPI:
             @param watchist_id - name of the watchlist
             @param symbols - single ticker or list of tickers to add to the watchlist
         """
-        print("WARNING create_watchlist(): There appears to be an issue when adding a list of symbols. It is recommended that one ticker symbol is added at a time.")
-        payload = {"id": watchlist_name}
-        if not symbols == "":
-            payload["symbols"] = symbols
-        return self.__submit_post(self.url.post_watchlist_url(), payload)
+        payload = get_watchlist_payload(watchlist_name, symbols)
+        response = self.__submit_post(self.url.post_watchlist_url(), payload)
+        if self.cache is not None:
+            self.cache.invalidate(endpoint="watchlists")
+        return response
 
     def order_common_stock(self, ticker, shares, type, account_nbr, side,
                             time_in_force=None, price=None):
@@ -482,8 +545,7 @@ class AllyAPI:
                 - use the provided enum for these values
             @param price - the price to purchase the security (only for limit and stop limit orders)
         """
-        if price == None and type != ORDER_TYPE.MARKET:
-            raise("Price is required for non-market order types.")
+        check_order_price(type, price)
         payload = self.__get_fixml(ticker, shares, type, account_nbr, side, time_in_force, price, "CS")
         headers = {
             'TKI_OVERRIDE': 'true',
@@ -0,0 +1,416 @@
+"""@package AsyncAllyAPI
+    An asyncio version of the AllyAPI class.
+
+    AsyncAllyAPI exposes the same methods as AllyAPI, but every method is a
+    coroutine. Many requests can be in flight at once on a single event loop
+    without a thread per request. The URLs, the FIXML helpers and the
+    Request/Response classes are shared with AllyAPI, so e.g.
+
+        response = await QuotesRequest(symbols=['AAPL']).execute(async_ally)
+
+    This class requires aiohttp (pip install AllyInvestPy[async]).
+"""
+
+from xml.etree import ElementTree
+from urllib.parse import urlencode, parse_qsl
+import asyncio
+
+from .URLs import URLs
+from .fixml import convert_fixml_json, convert_fixml_xml, get_fixml
+from .symbols import get_symbol_string
+from .chunking import chunk_symbols, merge_quotes
+from .rate_limit import RateLimiter
+from .signer import OAuthSigner
+from .json_decoder import get_decoder
+from .history import get_history_query
+from .params import (get_option_quote_symbols, get_news_search_query, get_watchlist_payload,
+                     check_order_price)
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncAllyAPI:
+    """The asyncio counterpart of AllyAPI.
+
+    All HTTP traffic goes through one aiohttp.ClientSession whose connector
+    limits the total number of open connections and the number per host.
+    The session is created on first use, inside the running event loop, and
+    must be released with close() (or by using the class as an async context
+    manager).
+    """
+    def __init__(self, oauth_secret, oauth_token, client_key,
+                response_format="json", limit=100, limit_per_host=0,
+                timeout=None, base_url="https://api.tradeking.com/v1/",
+                max_url_length=2000, rate_limiter=None, json_decoder=None):
+        """AsyncAllyAPI constructor. Sets the response format on all of the URLs
+            and the oauth/client keys required to access the API.
+
+            Parameters
+                @param self - the object pointer
+                @param oauth_secret - secret oauth key from Ally
+                @param oauth_token - oauth token from Ally
+                @param client_key - client key from Ally
+                @param response_format - format of the response. Valid values are 'xml' and 'json'.
+                @param limit - maximum number of simultaneously open connections
+                @param limit_per_host - maximum number of connections per host, 0 is unlimited
+                @param timeout - total number of seconds a request may take, None waits forever
+                @param base_url - the API request endpoint, e.g. a local stand-in server
+                @param max_url_length - longest quote URL sent to the server. Larger symbol
+                    lists are split into chunks that are requested concurrently.
+                @param rate_limiter - RateLimiter keeping calls inside Ally's per-category
+                    budgets, None for a default one or False to disable
+                @param json_decoder - JSON backend decoding the response bodies: 'orjson',
+                    'ujson', 'json' or a function taking bytes. None uses the fastest
+                    installed one. Requests pass it on to the responses they build.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncAllyAPI requires aiohttp: pip install aiohttp")
+
+        self.format = response_format
+        self.url = URLs(response_format=response_format, base_url=base_url)
+        self.json_decoder = get_decoder(json_decoder)
+
+        self.oauth_secret = oauth_secret
+        self.oauth_token = oauth_token
+        self.client_key = client_key
+        self.client_secret = client_key
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.max_url_length = max_url_length
+        self.rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self.session = None
+        self.auth = OAuthSigner(self.client_key, self.client_secret, self.oauth_token,
+                                self.oauth_secret)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Closes the underlying HTTP session and all of its connections.
+            @param self - the object pointer
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def __get_session(self):
+        """A private method to create the aiohttp session, if necessary."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit,
+                                             limit_per_host=self.limit_per_host)
+            self.session = aiohttp.ClientSession(connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self.session
+
+    def __sign(self, url, method, body=None, headers=None):
+        """A private method returning the request headers including the OAuth
+            Authorization header.
+            @param self - the object pointer
+            @param url - API URL to access
+            @param method - HTTP method
+            @param body - form encoded payload, if any
+            @param headers - additional request headers
+        """
+        headers = dict(headers or {})
+        body_params = parse_qsl(body, keep_blank_values=True) if body else None
+        headers["Authorization"] = self.auth.sign(method, url, body_params)
+        return headers
+
+    async def __to_format(self, response, xml=False, raw=False):
+        """A private method to return the API response in the desired format
+            @param self - the object pointer
+            @param response - response from the Ally Invest API
+            @param raw - return the undecoded response body
+        """
+        if response.status in (414, 429):
+            response.raise_for_status()
+        content = await response.read()
+        if raw:
+            return content
+        if self.format == "json" and not xml:
+            return self.json_decoder(content)
+        else:
+            return ElementTree.fromstring(content)
+
+    async def __get_data(self, url, raw=False):
+        """A private method to return the requested data in the requested format
+            for a given URL.
+            @param self - the object pointer
+            @param url - API URL to access
+            @param raw - return the undecoded response body
+        """
+        async with await self.__request("GET", url) as response:
+            return await self.__to_format(response, raw=raw)
+
+    async def __submit_post(self, url, data, headers={}, usexml=False):
+        """A private method to submit a post request to the Ally Invest server
+            @param self - the object pointer
+            @param url - API URL to access
+            @param data - payload for the HTTP request
+        """
+        async with await self.__request("POST", url, data, headers) as response:
+            return await self.__to_format(response, usexml)
+
+    async def __request(self, method, url, data=None, headers=None):
+        """A private method to send a signed request. The call waits for room
+            in its rate limit budget and throttled calls (HTTP 429) are retried
+            with back off.
+            @param self - the object pointer
+            @param method - HTTP method
+            @param url - API URL to access
+            @param data - payload for the HTTP request
+            @param headers - additional request headers
+        """
+        body = None
+        if isinstance(data, dict):
+            # Form payloads take part in the OAuth signature.
+            data = urlencode(data, doseq=True)
+            headers = dict(headers or {}, **{'Content-Type': 'application/x-www-form-urlencoded'})
+            body = data
+
+        category = self.rate_limiter.category(url, method) if self.rate_limiter else None
+        attempt = 0
+        while True:
+            if category is not None:
+                delay = self.rate_limiter.reserve(category)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            signed_headers = self.__sign(url, method, body, headers)
+            response = await self.__get_session().request(method, url, headers=signed_headers,
+                                                          data=data)
+            if category is None:
+                return response
+            self.rate_limiter.update(category, response.headers)
+            if response.status != 429 or attempt >= self.rate_limiter.max_retries:
+                return response
+            response.release()
+            await asyncio.sleep(self.rate_limiter.retry_delay(category, attempt, response.headers))
+            attempt += 1
+
+    async def get_accounts(self):
+        """Returns all of the user's accounts."""
+        return await self.__get_data(self.url.accounts_url())
+
+    async def get_accounts_balances(self):
+        """Returns the balances of all of the user's accounts."""
+        return await self.__get_data(self.url.accounts_balances_url())
+
+    async def get_account(self, id):
+        """Returns a specific account provided the account ID (account number)
+            @param self - the object pointer
+            @param id - account number
+        """
+        return await self.__get_data(self.url.account_url().format(id=str(id)))
+
+    async def get_account_balances(self, id):
+        """Returns the balances of a specific account (ID = account number)
+            @param self - the object pointer
+            @param id - account number
+        """
+        return await self.__get_data(self.url.account_balances_url().format(id=str(id)))
+
+    async def get_account_history(self, id, date_range=None, transactions=None, raw=False):
+        """Returns the history of a specific account (ID = account number)
+            @param self - the object pointer
+            @param id - account number
+            @param date_range - 'all', 'today', 'current_week', 'current_month' or
+                'last_month', None for all
+            @param transactions - 'all', 'bookkeeping' or 'trade', None for all
+            @param raw - return the undecoded response body
+        """
+        url = self.url.account_history_url().format(id=str(id))
+        return await self.__get_data(url + get_history_query(date_range, transactions), raw=raw)
+
+    async def get_account_holdings(self, id, raw=False):
+        """Returns the holdings of a specific account (ID = account number)
+            @param self - the object pointer
+            @param id - account number
+            @param raw - return the undecoded response body
+        """
+        return await self.__get_data(self.url.account_holdings_url().format(id=str(id)),
+                                     raw=raw)
+
+    async def get_orders(self, id, expand_fixml=True, raw=False):
+        """Returns the orders of a specific account (ID = account number)
+            @param self - the object pointer
+            @param id - account number
+            @param expand_fixml - expand the FIXML message of every order
+            @param raw - return the undecoded response body
+        """
+        data = await self.__get_data(self.url.get_orders().format(id=str(id)), raw=raw)
+        if raw or not expand_fixml:
+            return data
+        if self.format == "json":
+            return convert_fixml_json(data, in_place=True)
+
+        return convert_fixml_xml(data, in_place=True)
+
+    async def post_order(self, id, fixml):
+        """Posts an order and returns the response.
+            @param self - the object pointer
+            @param id - account number
+            @param fixml - FIXML string to send.
+        """
+        headers = {
+            'TKI_OVERRIDE': 'true',
+            'Content-Type': 'application/xml',
+        }
+        # The GET and POST have the same URL.
+        url = self.url.get_orders().format(id=str(id))
+        return await self.__submit_post(url, fixml, headers,
+                                        self.format=='xml')
+
+    async def post_order_preview(self, id, fixml):
+        """Posts an order for preview and returns the response.
+            @param self - the object pointer
+            @param id - account number
+            @param fixml - FIXML string to send.
+        """
+        headers = {
+            'TKI_OVERRIDE': 'true',
+            'Content-Type': 'application/xml',
+        }
+        url = self.url.post_order_preview().format(id=str(id))
+        return await self.__submit_post(url, fixml, headers,
+                                        self.format=='xml')
+
+    async def get_market_clock(self):
+        """Returns the state of the market, the time until next state change,
+            and current server timestamp.
+            @param self - the object pointer
+        """
+        return await self.__get_data(self.url.clock_url())
+
+    async def get_quote(self, symbols):
+        """Returns quote information for a single ticker or list of tickers.
+            @param self - the object pointer
+            @param symbols - single ticker or list of ticker to get quotes for
+        """
+        return await self.__get_quote_data(get_symbol_string(symbols).split(","))
+
+    async def __get_quote_data(self, symbols):
+        """A private method to request quotes for a list of symbols. Lists too
+            long for a single URL are split into chunks which are fetched
+            concurrently and merged into one response in the original order.
+            @param self - the object pointer
+            @param symbols - list of ticker symbols
+        """
+        url = self.url.quote_url() + "?symbols={symbols}"
+        chunks = chunk_symbols(symbols, len(url) - len("{symbols}"), self.max_url_length)
+        responses = await asyncio.gather(*[self.__get_data(url.format(symbols=get_symbol_string(chunk)))
+                                           for chunk in chunks])
+        return merge_quotes(list(responses), self.format)
+
+    async def get_option_quote(self, symbol, expiration_date, strike_price, put_call):
+        """Returns a quote for an option for the symbol, expiration date, strike price
+            and put/call specifier.
+
+            @param self - object pointer
+            @param symbol - underlying stock's ticker symbol
+            @param expiration_date - options expiration date
+            @param strike_price - option's strike price
+            @param put_call - c=call, p=put
+        """
+        request_sym = get_option_quote_symbols(symbol, expiration_date, strike_price, put_call)
+        if request_sym is None:
+            return None
+        return await self.__get_quote_data(request_sym)
+
+    async def news_search(self, symbols, startdate=None, enddate=None, maxhits=10):
+        """Retrieves a listing of news headlines based on symbols.
+            @param self - the object pointer
+            @param symbols - single ticker or list of ticker to get quotes for
+            @param startdate - search for articles between this date and enddate
+            @param enddate - search for articles between this date and startdate
+            @param maxhits - number of articles to return
+        """
+        query = get_news_search_query(symbols, startdate, enddate, maxhits)
+        return await self.__get_data(self.url.news_search_url() + query)
+
+    async def get_news_article(self, article_id):
+        """Gets a single news article based on the article ID.
+            @param self - the object pointer
+            @param article_id - ID of the article to retrieve
+        """
+        return await self.__get_data(self.url.news_article_url().format(article_id=article_id))
+
+    async def get_toplists(self, listtype="topgainers", exchange="N"):
+        """Returns a ranked list depending on listtype and exchange. See
+            AllyAPI.get_toplists() for the accepted values.
+            @param listtype - type of list to be queried
+            @param exchange - exchange to be queried
+        """
+        url = self.url.toplists_url().format(listtype=listtype)
+        url += "?exchange={ex}".format(ex=exchange)
+        return await self.__get_data(url)
+
+    async def get_options(self, symbol):
+        url = self.url.options_search_url() + ("?symbol={}".format(symbol))
+        return await self.__get_data(url)
+
+    async def get_options_strikes(self, symbol):
+        url = self.url.options_strikes_url() + ("?symbol={}".format(symbol))
+        return await self.__get_data(url)
+
+    async def get_options_expirations(self, symbol):
+        url = self.url.options_exps_url() + ("?symbol={}".format(symbol))
+        return await self.__get_data(url)
+
+    async def get_member_profile(self):
+        """Returns general information associated with the user including account
+            numbers and account information.
+            @param self - the object pointer
+        """
+        return await self.__get_data(self.url.member_profile_url())
+
+    async def get_status(self):
+        """Returns an error if the API endpoint/server is unavailable. Otherwise
+            returns the current server timestamp.
+            @param self - the object pointer
+        """
+        return await self.__get_data(self.url.status_url())
+
+    async def get_version(self):
+        """Gets the current version of the API of the endpoint called.
+            @param self - the object pointer
+        """
+        return await self.__get_data(self.url.version_url())
+
+    async def get_watchlists(self):
+        """Retrieves all watchlists belonging to the member.
+            @param self - the object pointer
+        """
+        return await self.__get_data(self.url.get_watchlists_url())
+
+    async def create_watchlist(self, watchlist_name, symbols=""):
+        """Creates a watchlist and adds a symbol or list of symbols to a watchlist.
+            WARNING: There appears to be an issue when adding a list of symbols.
+                It is recommended that one ticker symbol is added at a time.
+            @param self - the object pointer
+            @param watchist_id - name of the watchlist
+            @param symbols - single ticker or list of tickers to add to the watchlist
+        """
+        payload = get_watchlist_payload(watchlist_name, symbols)
+        return await self.__submit_post(self.url.post_watchlist_url(), payload)
+
+    async def order_common_stock(self, ticker, shares, type, account_nbr, side,
+                            time_in_force=None, price=None):
+        """Creates an order for common stock (as opposed to options). See
+            AllyAPI.order_common_stock() for the parameters.
+        """
+        check_order_price(type, price)
+        payload = get_fixml(ticker, shares, type, account_nbr, side, time_in_force, price, "CS")
+        headers = {
+            'TKI_OVERRIDE': 'true',
+            'Content-Type': 'application/xml',
+        }
+        url = self.url.get_post_order().format(id=account_nbr)
+        return await self.__submit_post(url, payload, headers, True)
@@ -0,0 +1,118 @@
+"""@package batch
+    Concurrent execution of lists of Request objects.
+
+    The Request classes (QuotesRequest, OrdersRequest, AccountHoldingsRequest,
+    ...) are executed one at a time by calling execute(ally_api). The
+    BatchExecutor runs a whole list of them on a bounded thread pool (AllyAPI)
+    or event loop (AsyncAllyAPI). Results keep the order of the input and a
+    failing request does not abort the rest of the batch.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+
+
+class BatchResult:
+    """The outcome of a batch. results[i] and errors[i] belong to the i-th
+        request; exactly one of them is None.
+    """
+    def __init__(self, size):
+        self.results = [None] * size
+        self.errors = [None] * size
+        self.latencies = [0.0] * size
+        self.wall_time = 0.0
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def ok(self):
+        """Returns True if every request succeeded.
+            @param self - the object pointer
+        """
+        return not any(error is not None for error in self.errors)
+
+    def failed(self):
+        """Returns a list of (index, exception) for the failed requests.
+            @param self - the object pointer
+        """
+        return [(i, error) for i, error in enumerate(self.errors) if error is not None]
+
+    def get_stats(self):
+        """Returns timing statistics. 'speedup' is the sum of the request
+            latencies divided by the wall-clock time of the batch.
+            @param self - the object pointer
+        """
+        total = sum(self.latencies)
+        return {
+            "requests": len(self.results),
+            "errors": len(self.failed()),
+            "wall_time": self.wall_time,
+            "total_latency": total,
+            "max_latency": max(self.latencies) if self.latencies else 0.0,
+            "speedup": total / self.wall_time if self.wall_time else 0.0,
+        }
+
+
+class BatchExecutor:
+    """Executes lists of Request objects concurrently."""
+    def __init__(self, ally_api, max_workers=8):
+        """BatchExecutor constructor.
+            @param self - the object pointer
+            @param ally_api - AllyAPI or AsyncAllyAPI instance the requests run against
+            @param max_workers - maximum number of requests executed at the same time
+        """
+        self.ally_api = ally_api
+        self.max_workers = max_workers
+
+    def execute(self, requests):
+        """Executes the requests on a thread pool and returns a BatchResult.
+            Use execute_async() with an AsyncAllyAPI instance.
+            @param self - the object pointer
+            @param requests - list of Request objects
+        """
+        requests = list(requests)
+        batch = BatchResult(len(requests))
+        start = time.perf_counter()
+        if requests:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(requests))) as pool:
+                for i, request in enumerate(requests):
+                    pool.submit(self.__run, batch, i, request)
+        batch.wall_time = time.perf_counter() - start
+        return batch
+
+    async def execute_async(self, requests):
+        """Executes the requests on the running event loop and returns a
+            BatchResult. Requires an AsyncAllyAPI instance.
+            @param self - the object pointer
+            @param requests - list of Request objects
+        """
+        requests = list(requests)
+        batch = BatchResult(len(requests))
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run(i, request):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    batch.results[i] = await request.execute(self.ally_api)
+                except Exception as e:
+                    batch.errors[i] = e
+                batch.latencies[i] = time.perf_counter() - started
+
+        start = time.perf_counter()
+        await asyncio.gather(*[run(i, request) for i, request in enumerate(requests)])
+        batch.wall_time = time.perf_counter() - start
+        return batch
+
+    def __run(self, batch, i, request):
+        """A private method executing one request of a batch."""
+        started = time.perf_counter()
+        try:
+            batch.results[i] = request.execute(self.ally_api)
+        except Exception as e:
+            batch.errors[i] = e
+        batch.latencies[i] = time.perf_counter() - started
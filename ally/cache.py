@@ -0,0 +1,125 @@
+"""@package cache
+    An in-memory response cache for API endpoints whose data rarely changes.
+
+    Entries are keyed by the full request URL, expire after a time to live set
+    per endpoint and the least recently used entries are evicted once the
+    cache is full. Cached payloads are shared between callers and should be
+    treated as read-only.
+
+    Any object providing the same get(), set(), ttl() and invalidate() methods
+    can be passed to AllyAPI instead.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class ResponseCache:
+    """A thread-safe TTL + LRU cache of API responses."""
+
+    # Seconds each endpoint's response stays valid.
+    DEFAULT_TTLS = {
+        "clock": 5,
+        "member_profile": 300,
+        "version": 3600,
+        "status": 30,
+        "options_expirations": 3600,
+        "options_strikes": 3600,
+        "watchlists": 60,
+    }
+
+    def __init__(self, max_size=256, ttls=None):
+        """ResponseCache constructor.
+            @param self - the object pointer
+            @param max_size - maximum number of cached responses
+            @param ttls - dict of seconds to live keyed by endpoint, overriding
+                DEFAULT_TTLS. A TTL of 0 disables caching for the endpoint.
+        """
+        self.max_size = max_size
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl(self, endpoint):
+        """Returns the time to live of an endpoint's responses in seconds.
+            @param self - the object pointer
+            @param endpoint - endpoint name, e.g. 'clock'
+        """
+        return self.ttls.get(endpoint, 0)
+
+    def get(self, url):
+        """Returns the cached response for a URL, or None if there is no valid
+            entry.
+            @param self - the object pointer
+            @param url - full request URL
+        """
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self.entries[url]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(url)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, url, data, endpoint):
+        """Stores a response.
+            @param self - the object pointer
+            @param url - full request URL
+            @param data - response data
+            @param endpoint - endpoint name the response belongs to
+        """
+        ttl = self.ttl(endpoint)
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[url] = (time.monotonic() + ttl, endpoint, data)
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, url=None, endpoint=None):
+        """Removes cached responses. With no arguments the whole cache is
+            cleared.
+            @param self - the object pointer
+            @param url - remove the response of this URL
+            @param endpoint - remove all responses of this endpoint
+        """
+        with self.lock:
+            if url is None and endpoint is None:
+                self.entries.clear()
+                return
+            if url is not None:
+                self.entries.pop(url, None)
+            if endpoint is not None:
+                for key in [k for k, v in self.entries.items() if v[1] == endpoint]:
+                    del self.entries[key]
+
+    def clear(self):
+        """Removes every cached response.
+            @param self - the object pointer
+        """
+        self.invalidate()
+
+    def get_stats(self):
+        """Returns the hit/miss/eviction counters and the current size.
+            @param self - the object pointer
+        """
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self.entries),
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
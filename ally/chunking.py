@@ -0,0 +1,82 @@
+"""@package chunking
+    Splitting of large symbol lists into URL-length-safe chunks and merging of
+    the per-chunk quote responses back into a single response.
+
+    Ally answers a quote request whose URL is too long with HTTP 414, so large
+    symbol lists have to be requested in several pieces.
+"""
+
+def chunk_symbols(symbols, base_length, max_url_length):
+    """Splits a list of symbols into chunks so that the base URL followed by
+        the comma-separated chunk is never longer than max_url_length.
+        The order of the symbols is preserved.
+
+        @param symbols - list of ticker symbols
+        @param base_length - length of the URL without any symbols
+        @param max_url_length - maximum length of the full URL
+    """
+    budget = max(max_url_length - base_length, 1)
+    chunks = []
+    chunk = []
+    length = 0
+    for symbol in symbols:
+        # Every symbol after the first in a chunk also costs a comma.
+        needed = len(symbol) + (1 if chunk else 0)
+        if chunk and length + needed > budget:
+            chunks.append(chunk)
+            chunk = []
+            length = 0
+            needed = len(symbol)
+        chunk.append(symbol)
+        length += needed
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def merge_quotes(responses, response_format="json"):
+    """Merges the quote responses of several chunks into one response, keeping
+        the quotes in chunk order. The first response is used as the template
+        for the merged one; in xml mode it is extended in place.
+
+        @param responses - list of responses in the order the chunks were requested
+        @param response_format - 'json' or 'xml'
+    """
+    if len(responses) == 1:
+        return responses[0]
+    if response_format == "json":
+        return _merge_json(responses)
+    return _merge_xml(responses)
+
+def _merge_json(responses):
+    quotes = []
+    error = None
+    for data in responses:
+        response = data["response"]
+        if error is None and response.get("error", "Success") != "Success":
+            error = response["error"]
+        chunk_quotes = (response.get("quotes") or {}).get("quote")
+        if isinstance(chunk_quotes, list):
+            quotes.extend(chunk_quotes)
+        elif chunk_quotes is not None:
+            quotes.append(chunk_quotes)
+
+    merged = dict(responses[0])
+    merged["response"] = dict(responses[0]["response"])
+    merged["response"]["quotes"] = {"quote": quotes}
+    if error is not None:
+        merged["response"]["error"] = error
+    return merged
+
+def _merge_xml(responses):
+    merged = responses[0]
+    quotes = merged.find("quotes")
+    for data in responses[1:]:
+        chunk_quotes = data.find("quotes")
+        if chunk_quotes is None:
+            continue
+        if quotes is None:
+            quotes = chunk_quotes
+            merged.append(quotes)
+            continue
+        quotes.extend(chunk_quotes.findall("quote"))
+    return merged
@@ -0,0 +1,141 @@
+"""@package coalesce
+    Single-flight coalescing of concurrent quote requests.
+
+    When several threads ask for quotes of overlapping symbol sets at the same
+    time, only the symbols that are not already being fetched are requested.
+    Callers wait for the in-flight requests that cover the rest of their
+    symbols and each gets back a quotes payload holding just its own symbols.
+"""
+
+from concurrent.futures import Future
+from xml.etree import ElementTree
+import threading
+
+
+def split_quotes(data, response_format="json"):
+    """Returns a dictionary of the quotes in a quotes payload keyed by the
+        upper case symbol.
+        @param data - quotes payload in json or xml format
+        @param response_format - 'json' or 'xml'
+    """
+    if response_format == "json":
+        quotes = (data["response"].get("quotes") or {}).get("quote") or []
+        if isinstance(quotes, dict):
+            quotes = [quotes]
+        return {quote.get("symbol", "").upper(): quote for quote in quotes}
+
+    quotes = data.find("quotes")
+    if quotes is None:
+        return {}
+    return {(quote.findtext("symbol") or "").upper(): quote
+            for quote in quotes.findall("quote")}
+
+
+def build_quotes(template, quotes, response_format="json"):
+    """Builds a quotes payload holding the given quotes, copying everything
+        else from a template payload.
+        @param template - quotes payload the other fields are taken from
+        @param quotes - list of quotes (dicts or Elements) in the desired order
+        @param response_format - 'json' or 'xml'
+    """
+    if response_format == "json":
+        data = dict(template)
+        data["response"] = dict(template["response"])
+        data["response"]["quotes"] = {"quote": quotes[0] if len(quotes) == 1 else quotes}
+        return data
+
+    data = ElementTree.Element(template.tag, template.attrib)
+    for child in template:
+        if child.tag == "quotes":
+            quotes_el = ElementTree.SubElement(data, "quotes", child.attrib)
+            quotes_el.extend(quotes)
+        else:
+            data.append(child)
+    return data
+
+
+class QuoteCoalescer:
+    """Shares in-flight quote requests between threads asking for overlapping
+        symbols.
+    """
+    def __init__(self, fetch, response_format="json"):
+        """QuoteCoalescer constructor.
+            @param self - the object pointer
+            @param fetch - callable taking a list of symbols and returning the
+                quotes payload for them
+            @param response_format - 'json' or 'xml'
+        """
+        self.fetch = fetch
+        self.response_format = response_format
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.stats = {"calls": 0, "requests": 0, "symbols": 0, "coalesced": 0}
+
+    def get_quotes(self, symbols):
+        """Returns a quotes payload for the symbols, joining requests already
+            in flight for any of them.
+            @param self - the object pointer
+            @param symbols - list of ticker symbols
+        """
+        keys = [symbol.upper() for symbol in symbols]
+        futures = {}
+        owned = []
+        with self.lock:
+            self.stats["calls"] += 1
+            for symbol, key in zip(symbols, keys):
+                if key in futures:
+                    continue
+                future = self.in_flight.get(key)
+                if future is None:
+                    future = Future()
+                    self.in_flight[key] = future
+                    owned.append((symbol, key))
+                else:
+                    self.stats["coalesced"] += 1
+                futures[key] = future
+
+        payload = None
+        if owned:
+            payload = self.__fetch(owned, futures)
+            if len(owned) == len(symbols):
+                # Nothing was shared with other callers.
+                return payload
+
+        template = None
+        quotes = []
+        for key in keys:
+            data, quote = futures[key].result()
+            if template is None:
+                template = data
+            if quote is not None:
+                quotes.append(quote)
+        return build_quotes(payload if payload is not None else template,
+                            quotes, self.response_format)
+
+    def __fetch(self, owned, futures):
+        """Requests the symbols this caller owns and resolves their futures."""
+        try:
+            payload = self.fetch([symbol for symbol, _ in owned])
+            quotes = split_quotes(payload, self.response_format)
+            for _, key in owned:
+                futures[key].set_result((payload, quotes.get(key)))
+            return payload
+        except BaseException as e:
+            for _, key in owned:
+                futures[key].set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.stats["requests"] += 1
+                self.stats["symbols"] += len(owned)
+                for _, key in owned:
+                    if self.in_flight.get(key) is futures[key]:
+                        del self.in_flight[key]
+
+    def get_stats(self):
+        """Returns the number of calls, HTTP requests made, symbols requested
+            and symbols served from another caller's request.
+            @param self - the object pointer
+        """
+        with self.lock:
+            return dict(self.stats)
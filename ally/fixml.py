@@ -0,0 +1,329 @@
+"""@package fixml
+    FIXML helpers shared by the synchronous and asyncio API clients.
+
+    Ally returns each order as an escaped FIXML message. These functions expand
+    those messages so the order details can be read like the rest of the
+    response, and build the FIXML used to place orders.
+
+    order_fixml(), multileg_fixml() and orders_fixml() write the FIXML of
+    Order objects straight to bytes from precompiled templates. The output
+    is byte for byte that of ElementTree.tostring() of Order.to_fixml() and
+    get_multileg_fixml(), without building a tree per order.
+"""
+
+from xml.etree import ElementTree
+import copy
+import functools
+import re
+
+from .responses.order import (ORDER_TYPE, SIDE, SECURITY_TYPE, ACCOUNT_TYPE,
+                              get_multileg_fields)
+
+FIXML_NAMESPACE = "http://www.fixprotocol.org/FIXML-5-0-SP2"
+
+
+def convert_fixml_json(json_data, in_place=False):
+    """Takes the order data and converts it to a consistent format.
+       The FIXML message is also expanded, with the original intact.
+        @param json_data - original data to be converted.
+        @param in_place - convert json_data itself. Otherwise only the dicts
+            and lists on the path to the orders are copied; the result shares
+            the rest of the payload with json_data.
+    """
+    # If there's no orders, there's nothing to do.
+    if not json_data["response"]["orderstatus"]["order"]:
+        return json_data
+
+    data = json_data
+    if not in_place:
+        # Copy the containers that are modified to keep from overwriting the input.
+        data = dict(json_data)
+        data["response"] = dict(data["response"])
+        data["response"]["orderstatus"] = dict(data["response"]["orderstatus"])
+
+    # A single order will be a dict, and multiple a list.
+    # Convert order to always be a list of dicts.
+    orders = data["response"]["orderstatus"]["order"]
+    if isinstance(orders, dict):
+        orders = [orders]
+    elif not in_place:
+        orders = list(orders)
+    data["response"]["orderstatus"]["order"] = orders
+
+    # Convert the FIXML message in each order.
+    # Add the keys to order itself, but preserve fixmlmessage.
+    messages = parse_fixml_messages([order["fixmlmessage"] for order in orders])
+    for i, (order, order_xml) in enumerate(zip(orders, messages)):
+        if not in_place:
+            order = orders[i] = dict(order)
+        order.update(fixml_to_dict(order_xml))
+
+    # Return the converted data.
+    return data
+
+
+def convert_fixml_xml(xml_data, in_place=False):
+    """Takes the order data and expands the FIXML message.
+       The original message is left intact.
+        @param xml_data - original data to be converted.
+        @param in_place - convert xml_data itself. Otherwise only the elements
+            on the path to the orders are copied; the result shares the rest of
+            the tree with xml_data.
+    """
+    # Register the FIXML namespace.
+    ElementTree.register_namespace("", FIXML_NAMESPACE)
+
+    data = xml_data
+    orderstatus = data.find("orderstatus")
+    if orderstatus is None:
+        return data
+    if not in_place:
+        # Copy the elements that are modified to keep from overwriting the input.
+        # copy.copy() of an Element shares its children.
+        data = copy.copy(xml_data)
+        copied = copy.copy(orderstatus)
+        data[list(data).index(orderstatus)] = copied
+        orderstatus = copied
+
+    # Each order will have a "fixmlmessage" to convert.
+    indexes = [i for i, order in enumerate(orderstatus) if order.tag == "order"]
+    messages = parse_fixml_messages([orderstatus[i].find("fixmlmessage").text
+                                     for i in indexes])
+    for i, fixml in zip(indexes, messages):
+        order = orderstatus[i]
+        if not in_place:
+            order = orderstatus[i] = copy.copy(order)
+        order.append(fixml)
+
+    # Return the converted data.
+    return data
+
+
+def parse_fixml_messages(messages, batch_size=256):
+    """Parses FIXML message strings, yielding one Element per message.
+        Batches of messages are parsed as one document, which is about twice
+        as fast as parsing them one by one; a batch that cannot be combined
+        is parsed message by message.
+        @param messages - list of FIXML strings
+        @param batch_size - number of messages parsed together
+    """
+    for start in range(0, len(messages), batch_size):
+        batch = messages[start:start + batch_size]
+        elements = None
+        if len(batch) > 1:
+            try:
+                elements = list(ElementTree.fromstring("<m>" + "".join(batch) + "</m>"))
+            except (ElementTree.ParseError, TypeError):
+                pass
+        if elements is None or len(elements) != len(batch):
+            elements = [ElementTree.fromstring(message) for message in batch]
+        yield from elements
+
+
+@functools.lru_cache(maxsize=256)
+def strip_namespace(tag):
+    """Removes the namespace from an element tag. Cached, since FIXML
+        messages only use a handful of tags.
+        @param tag - Element tag, e.g. '{http://www.fixprotocol.org/FIXML-5-0-SP2}ExecRpt'
+    """
+    return re.sub(r"\{[^}]*\} *", "", tag)
+
+
+def fixml_to_dict(fixml):
+    """Recursively convert FIXML to a dictionary.
+        @param fixml - FIXML Element to be converted.
+    """
+    tag, value = _element_to_dict(fixml)
+    return {tag: value}
+
+
+def _element_to_dict(fixml):
+    """Returns (tag, value) of an element for fixml_to_dict()."""
+    # Remove the Namespace from the tag.
+    tag = strip_namespace(fixml.tag)
+    attrib = fixml.attrib
+
+    # Each subelement becomes a tag key, several subelements with the same
+    # tag a list of values.
+    value = {} if attrib else None
+    children = len(fixml)
+    if children:
+        value = {}
+        lists = None
+        for child in fixml:
+            key, val = _element_to_dict(child)
+            if key in value:
+                if lists is None:
+                    lists = set()
+                if key not in lists:
+                    lists.add(key)
+                    value[key] = [value[key]]
+                value[key].append(val)
+            else:
+                value[key] = val
+
+    # Set each attribute as a tag key.
+    if attrib:
+        for k, v in attrib.items():
+            value["@" + k] = v
+
+    # Set the value of each attribute key to the text.
+    if fixml.text:
+        text = fixml.text.strip()
+        if children or attrib:
+            if text:
+                value["#text"] = text
+        else:
+            value = text
+
+    return tag, value
+
+
+def get_fixml(ticker, amount, type, account, side, tif, price, sectype):
+    """Builds the FIXML string for a simple (non-option) order.
+        @param ticker - ticker symbol of the security
+        @param amount - number of shares
+        @param type - the order type, use ORDER_TYPE
+        @param account - account number
+        @param side - the side of the trade, use SIDE
+        @param tif - time in force, use TIME_IN_FORCE
+        @param price - limit price, ignored for market orders
+        @param sectype - security type, e.g. 'CS'
+    """
+    ticker, amount, type, account, side, tif, price, sectype = [
+        None if value is None else escape_attribute(str(value))
+        for value in (ticker, amount, type, account, side, tif, price, sectype)]
+    fixml = "<FIXML xmlns=\"{}\">".format(FIXML_NAMESPACE)
+    fixml += "<Order"
+    if type != ORDER_TYPE.MARKET and tif is not None:
+        fixml += " TmInForce=\"{}\"".format(tif)
+    if type != ORDER_TYPE.MARKET:
+        fixml += " Px=\"{}\"".format(price)
+    fixml += " Typ=\"{}\" Side=\"{}\" Acct=\"{}\">".format(type, side, account)
+    fixml += "<Instrmt SecTyp=\"{}\" Sym=\"{}\"/>".format(sectype, ticker)
+    fixml += "<OrdQty Qty=\"{}\"/></Order></FIXML>".format(amount)
+
+    return fixml
+
+
+# Characters ElementTree escapes in attribute values.
+ATTRIBUTE_ESCAPES = {ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;',
+                     ord('"'): '&quot;', ord('\r'): '&#13;', ord('\n'): '&#10;',
+                     ord('\t'): '&#09;'}
+NEEDS_ESCAPE = re.compile('[&<>"\r\n\t]')
+
+FIXML_START = '<FIXML xmlns="{}">'.format(FIXML_NAMESPACE)
+FIXML_END = '</FIXML>'
+
+
+def escape_attribute(value):
+    """Returns an attribute value escaped like ElementTree does. Non-ASCII
+        characters are left to the encoding step.
+        @param value - the attribute value, which must be a str
+    """
+    if value.__class__ is not str:
+        if not isinstance(value, str):
+            raise TypeError("cannot serialize {!r} (type {})".format(
+                value, type(value).__name__))
+    if NEEDS_ESCAPE.search(value) is None:
+        return value
+    return value.translate(ATTRIBUTE_ESCAPES)
+
+
+def _attributes(names):
+    """Returns a template of attributes, e.g. ' Acct="{}" Typ="{}"'."""
+    return ''.join(' {}="{{}}"'.format(name) for name in names)
+
+
+# Single orders: (tag, template of the opening tag with its fixed attributes).
+ORDER_TEMPLATES = {
+    tag: (tag, FIXML_START + '<' + tag + _attributes(('Acct', 'Typ', 'Side')))
+    for tag in ('Order', 'OrdCxlReq', 'OrdCxlRplcReq')
+}
+INSTRMT = '><Instrmt' + _attributes(('SecTyp', 'Sym'))
+OPTION_INSTRMT = _attributes(('CFI', 'StrkPx', 'MMY', 'MatDt'))
+ORDQTY = ' /><OrdQty' + _attributes(('Qty',)) + ' /></{}>' + FIXML_END
+
+# Multi-leg orders.
+MLEG_ORDER = '<Ord' + _attributes(('OrdQty', 'PosEfct')) + '><Leg' + \
+             _attributes(('Side', 'Strk', 'Mat', 'MMY', 'SecTyp', 'CFI', 'Sym')) + ' /></Ord>'
+
+
+def order_fixml(order, cancel=False):
+    """Returns the FIXML of a common stock or single-leg option order as
+        bytes, identical to ElementTree.tostring(order.to_fixml(cancel)).
+        @param order - the Order
+        @param cancel - should this order be cancelled only?
+    """
+    escape = escape_attribute
+    ord_id = order.ord_id
+    tag, start = ORDER_TEMPLATES['OrdCxlReq' if ord_id and cancel else
+                                 'OrdCxlRplcReq' if ord_id else 'Order']
+    parts = [start.format(escape(order.acct), escape(order.typ), escape(order.side))]
+    # Attributes in the order Order.to_fixml sets them.
+    if ord_id:
+        parts.append(' OrigID="{}"'.format(escape(ord_id)))
+    if order.side == SIDE.BUY and order.acct_typ == ACCOUNT_TYPE.SHORT:
+        parts.append(' AcctTyp="{}"'.format(escape(order.acct_typ)))
+    if order.typ != ORDER_TYPE.MARKET:
+        parts.append(' TmInForce="{}"'.format(escape(order.tm_in_force)))
+        if order.typ != ORDER_TYPE.STOP:
+            parts.append(' Px="{}"'.format(escape(order.px)))
+    option = order.sec_typ == SECURITY_TYPE.OPTION
+    if option:
+        parts.append(' PosEfct="{}"'.format(escape(order.pos_efct)))
+    parts.append(INSTRMT.format(escape(order.sec_typ), escape(order.sym)))
+    if option:
+        parts.append(OPTION_INSTRMT.format(escape(order.cfi), escape(order.strk_px),
+                                           escape(order.mmy), escape(order.mat_dt.isoformat())))
+    parts.append(ORDQTY.format(escape(order.qty), tag))
+    return ''.join(parts).encode('ascii', 'xmlcharrefreplace')
+
+
+def multileg_fixml(orders, cancel=False, validate=True):
+    """Returns the FIXML of a multi-leg option order as bytes, identical to
+        ElementTree.tostring(get_multileg_fixml(orders, cancel)), None if
+        there are no legs. The legs are validated the same way.
+        @param orders - A list of the orders, one per leg.
+        @param cancel - should this order be cancelled only?
+        @param validate - validate the legs, False if they already were
+    """
+    if not orders:
+        return None
+    fields = get_multileg_fields(orders, validate)
+    escape = escape_attribute
+    ord_id = fields['ord_id']
+    tag = 'OrdCxlReq' if ord_id and cancel else 'MLegOrdCxlRplc' if ord_id else 'NewOrdMLeg'
+    parts = [FIXML_START, '<', tag, ' Acct="{}"'.format(escape(str(fields['acct'])))]
+    if ord_id:
+        parts.append(' OrigCIOrdID="{}"'.format(escape(ord_id)))
+    if ord_id and cancel:
+        parts.append('><Instrmt SecTyp="{}" Sym="{}" />'.format(
+            SECURITY_TYPE.MULTI_LEG, escape(fields['sym'])))
+    else:
+        parts.append(' OrdTyp="{}"'.format(escape(fields['typ'])))
+        if fields['typ'] == ORDER_TYPE.LIMIT:
+            parts.append(' TmInForce="{}" Px="{}"'.format(escape(fields['tm_in_force']),
+                                                       escape(str(fields['px']))))
+        parts.append('>')
+        for order in orders:
+            parts.append(MLEG_ORDER.format(
+                escape(str(order.qty)), escape(str(order.pos_efct)), escape(str(order.side)),
+                escape(str(order.strk_px)), escape(str(order.mat_dt.isoformat())),
+                escape(str(order.mmy)), escape(str(order.sec_typ)), escape(str(order.cfi)),
+                escape(order.sym)))
+    parts.append('</{}>{}'.format(tag, FIXML_END))
+    return ''.join(parts).encode('ascii', 'xmlcharrefreplace')
+
+
+def orders_fixml(orders, cancel=False, validate=True):
+    """Returns the FIXML of many orders as a list of bytes, in the same
+        order. The multi-leg orders are validated like get_multileg_fixml();
+        use check_orders() to validate all the orders at once.
+        @param orders - list of Order objects, or lists of Order objects for
+            multi-leg orders
+        @param cancel - should the orders be cancelled only?
+        @param validate - validate the multi-leg orders
+    """
+    return [multileg_fixml(order, cancel, validate) if isinstance(order, list) else
+            order_fixml(order, cancel) for order in orders]
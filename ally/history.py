@@ -0,0 +1,294 @@
+"""@package history
+    Streaming account history and a local store synced incrementally.
+
+    Ally returns the history of an account in one response, filtered by one
+    of a few fixed ranges (RANGES) and a transaction type (TRANSACTION_TYPES).
+    iter_account_history() picks the smallest ranges covering the dates asked
+    for and yields Transaction objects one at a time, parsing xml responses
+    incrementally, so years of history are never held in memory as a whole:
+
+        for transaction in api.iter_account_history(id, start='2020-01-01'):
+            ...
+
+    HistoryStore keeps the transactions in a SQLite database indexed by
+    account and date. sync() only requests the history from the day of the
+    last sync on, and skips the transactions already stored:
+
+        with HistoryStore('history.db') as store:
+            for id in account_ids:
+                store.sync(api, id)
+            for transaction in store.get_transactions(id, '2020-01-01', '2020-12-31'):
+                ...
+"""
+
+from collections import Counter
+import datetime
+import hashlib
+import json
+import sqlite3
+
+from .responses.transaction import Transaction
+from .responses.xml_items import XMLItemParser
+
+# Values of the range parameter, from the shortest to the longest.
+RANGES = ('today', 'current_week', 'current_month', 'last_month', 'all')
+
+# Values of the transactions parameter.
+TRANSACTION_TYPES = ('all', 'bookkeeping', 'trade')
+
+
+def get_history_query(date_range=None, transactions=None):
+    """Returns the query string of an account history request, '' for the
+        defaults.
+        @param date_range - one of RANGES, None for all
+        @param transactions - one of TRANSACTION_TYPES, None for all
+    """
+    params = []
+    if date_range is not None:
+        if date_range not in RANGES:
+            raise ValueError("Invalid range '{}', valid values are {}".format(
+                date_range, ", ".join(RANGES)))
+        params.append("range=" + date_range)
+    if transactions is not None:
+        if transactions not in TRANSACTION_TYPES:
+            raise ValueError("Invalid transactions '{}', valid values are {}".format(
+                transactions, ", ".join(TRANSACTION_TYPES)))
+        params.append("transactions=" + transactions)
+    return "?" + "&".join(params) if params else ""
+
+
+def to_day(value):
+    """Returns a date as a 'YYYY-MM-DD' string, None for None.
+        @param value - date, datetime or string starting with 'YYYY-MM-DD',
+            e.g. a transaction date '2020-10-15T00:00:00-04:00'
+    """
+    if value is None:
+        return None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+def get_ranges(start, today=None):
+    """Returns the Ally ranges to request to get every transaction from the
+        start day on, fewest transactions first.
+        @param start - first day wanted, None for the whole history
+        @param today - the current date, defaults to today
+    """
+    start = to_day(start)
+    if start is None:
+        return ['all']
+    today = today or datetime.date.today()
+    month = today.replace(day=1)
+    last_month = (month - datetime.timedelta(days=1)).replace(day=1)
+    # A week starting on Monday is never earlier than Ally's current week.
+    week = today - datetime.timedelta(days=today.weekday())
+    if start >= to_day(today):
+        return ['today']
+    if start >= to_day(week):
+        return ['current_week']
+    if start >= to_day(month):
+        return ['current_month']
+    if start >= to_day(last_month):
+        return ['last_month', 'current_month']
+    return ['all']
+
+
+def iter_transactions(data, response_format):
+    """Yields a Transaction for every transaction of a history response.
+        @param data - decoded json response, or xml response body or Element
+        @param response_format - 'json' or 'xml'
+    """
+    if response_format == 'xml':
+        for element in XMLItemParser(data, 'transactions', 'transaction'):
+            transaction = Transaction()
+            transaction.from_xml(element)
+            yield transaction
+        return
+    transactions = (data['response'].get('transactions') or {}).get('transaction') or []
+    for transaction_json in transactions if isinstance(transactions, list) else [transactions]:
+        transaction = Transaction()
+        transaction.from_json(transaction_json)
+        yield transaction
+
+
+def iter_range(ally_api, account_id, date_range, start=None, end=None, transactions=None):
+    """Yields the transactions of an account in one Ally range between two
+        days, inclusive.
+        @param ally_api - AllyAPI used for the request
+        @param account_id - account number
+        @param date_range - one of RANGES
+        @param start - first day, as a date or 'YYYY-MM-DD', None for no limit
+        @param end - last day, as a date or 'YYYY-MM-DD', None for no limit
+        @param transactions - one of TRANSACTION_TYPES, None for all
+    """
+    start, end = to_day(start), to_day(end)
+    xml = ally_api.format == 'xml'
+    data = ally_api.get_account_history(account_id, date_range, transactions, raw=xml)
+    for transaction in iter_transactions(data, ally_api.format):
+        day = to_day(getattr(transaction, 'date', None))
+        if (start is None or (day and day >= start)) and \
+           (end is None or (day and day <= end)):
+            yield transaction
+
+
+def iter_account_history(ally_api, account_id, start=None, end=None, transactions=None):
+    """Yields the transactions of an account between two days, inclusive.
+        @param ally_api - AllyAPI used for the requests
+        @param account_id - account number
+        @param start - first day, as a date or 'YYYY-MM-DD', None for no limit
+        @param end - last day, as a date or 'YYYY-MM-DD', None for no limit
+        @param transactions - one of TRANSACTION_TYPES, None for all
+    """
+    for date_range in get_ranges(start):
+        for transaction in iter_range(ally_api, account_id, date_range, start, end,
+                                      transactions):
+            yield transaction
+
+
+def get_transaction_digest(fields):
+    """Returns a digest of the fields of a transaction. Ally does not send
+        transaction ids, so stored transactions are identified by their digest
+        and the number of identical transactions of the same day before them.
+        @param fields - Transaction.to_dict() of the transaction
+    """
+    return hashlib.sha1(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class HistoryStore:
+    """A SQLite store of account transactions indexed by account and date."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS transactions ("
+        " account TEXT NOT NULL,"
+        " day TEXT NOT NULL,"
+        " key TEXT NOT NULL,"
+        " fields TEXT NOT NULL,"
+        " PRIMARY KEY (account, key))",
+        "CREATE INDEX IF NOT EXISTS transactions_account_day"
+        " ON transactions (account, day)",
+        "CREATE TABLE IF NOT EXISTS syncs ("
+        " account TEXT PRIMARY KEY,"
+        " day TEXT NOT NULL)",
+    )
+
+    def __init__(self, path=":memory:"):
+        """HistoryStore constructor. Creates the database if necessary.
+            @param self - the object pointer
+            @param path - SQLite database file
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes the database.
+            @param self - the object pointer
+        """
+        self.connection.close()
+
+    def add(self, account_id, transactions):
+        """Stores transactions, skipping those already stored. Returns the
+            number of transactions added.
+
+            Ally does not send transaction ids, so a transaction is identified
+            by the digest of its fields and the number of identical
+            transactions of the same day before it in this call. Two
+            identical fills are stored as two rows, while the transactions of
+            an overlapping response are recognised as stored, as long as each
+            call gets whole days of a single response, as sync() does.
+            @param self - the object pointer
+            @param account_id - account number
+            @param transactions - iterable of Transaction objects
+        """
+        account_id = str(account_id)
+        seen = Counter()
+        added = 0
+        with self.connection:
+            for transaction in transactions:
+                fields = transaction.to_dict()
+                digest = get_transaction_digest(fields)
+                key = "{}:{}".format(digest, seen[digest])
+                seen[digest] += 1
+                cursor = self.connection.execute(
+                    "INSERT OR IGNORE INTO transactions (account, day, key, fields)"
+                    " VALUES (?, ?, ?, ?)",
+                    (account_id, to_day(fields.get('date')) or '', key, json.dumps(fields)))
+                added += cursor.rowcount
+        return added
+
+    def get_last_day(self, account_id):
+        """Returns the day of the last stored transaction of an account as
+            'YYYY-MM-DD', None if there is none.
+            @param self - the object pointer
+            @param account_id - account number
+        """
+        row = self.connection.execute("SELECT MAX(day) FROM transactions WHERE account = ?",
+                                      (str(account_id),)).fetchone()
+        return row[0] or None
+
+    def get_last_sync(self, account_id):
+        """Returns the day of the last sync of an account as 'YYYY-MM-DD', None
+            if it was never synced.
+            @param self - the object pointer
+            @param account_id - account number
+        """
+        row = self.connection.execute("SELECT day FROM syncs WHERE account = ?",
+                                      (str(account_id),)).fetchone()
+        return row[0] if row else None
+
+    def get_transactions(self, account_id, start=None, end=None):
+        """Yields the stored transactions of an account between two days,
+            inclusive, oldest first.
+            @param self - the object pointer
+            @param account_id - account number
+            @param start - first day, as a date or 'YYYY-MM-DD', None for no limit
+            @param end - last day, as a date or 'YYYY-MM-DD', None for no limit
+        """
+        query = "SELECT fields FROM transactions WHERE account = ? AND day >= ? AND day <= ?" \
+                " ORDER BY day, rowid"
+        # '~' sorts after every digit, so it is later than any day.
+        rows = self.connection.execute(query, (str(account_id), to_day(start) or '',
+                                               to_day(end) or '~'))
+        for (fields,) in rows:
+            transaction = Transaction()
+            for attr, value in json.loads(fields).items():
+                setattr(transaction, attr, value)
+            yield transaction
+
+    def sync(self, ally_api, account_id, transactions=None):
+        """Stores the transactions of an account made since the last sync and
+            returns the number of transactions added.
+
+            Ally only filters the history by a few fixed ranges (see
+            get_ranges()), so the first sync, and any sync when the last one
+            was before the start of last month, downloads the whole history;
+            syncs at least monthly only download the current or last month.
+            @param self - the object pointer
+            @param ally_api - AllyAPI used for the requests
+            @param account_id - account number
+            @param transactions - one of TRANSACTION_TYPES, None for all
+        """
+        today = to_day(datetime.date.today())
+        # The day of the last sync is fetched again as it may have gained
+        # transactions since; the ones already stored are skipped.
+        start = max(self.get_last_day(account_id) or '',
+                    self.get_last_sync(account_id) or '') or None
+        added = 0
+        # Each range is added on its own, so a transaction sent in two
+        # overlapping ranges is stored once.
+        for date_range in get_ranges(start):
+            added += self.add(account_id, iter_range(ally_api, account_id, date_range, start,
+                                                     transactions=transactions))
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO syncs (account, day) VALUES (?, ?)",
+                                    (str(account_id), today))
+        return added
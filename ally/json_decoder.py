@@ -0,0 +1,64 @@
+"""@package json_decoder
+    Pluggable JSON decoding of response bodies.
+
+    Response bodies are decoded straight from the bytes received, without
+    first decoding them to text. orjson and ujson are used when installed,
+    in that order, falling back to the standard library json module:
+
+        loads = get_decoder()           # fastest installed backend
+        loads = get_decoder('json')     # always the standard library
+        data = loads(response.content)
+
+    Install the optional backends with pip install AllyInvestPy[fast-json].
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+# Backend name -> decoder taking bytes or str, None when not installed.
+BACKENDS = {
+    "orjson": orjson.loads if orjson is not None else None,
+    "ujson": ujson.loads if ujson is not None else None,
+    "json": json.loads,
+}
+
+# Order in which the backends are tried when none is requested.
+PREFERRED = ("orjson", "ujson", "json")
+
+
+def get_backends():
+    """Returns the names of the installed backends, fastest first."""
+    return [name for name in PREFERRED if BACKENDS[name] is not None]
+
+
+def get_decoder(backend=None):
+    """Returns a function decoding a JSON document from bytes or str.
+        @param backend - 'orjson', 'ujson' or 'json', None for the fastest
+            installed one, or a decoding function, which is returned as is
+    """
+    if callable(backend):
+        return backend
+    if backend is None:
+        backend = get_backends()[0]
+    if backend not in BACKENDS:
+        raise ValueError("Unknown JSON backend '{}', valid values are {}".format(
+            backend, ", ".join(PREFERRED)))
+    decoder = BACKENDS[backend]
+    if decoder is None:
+        raise ImportError("JSON backend '{}' is not installed: pip install {}".format(
+            backend, backend))
+    return decoder
+
+
+# The default decoder, used for response bodies passed to the Response classes.
+loads = get_decoder()
@@ -0,0 +1,250 @@
+"""@package order_pipeline
+    Bulk submission of a basket of orders.
+
+    OrderPipeline places a basket of Order objects (lists of Order objects for
+    multi-leg orders) in stages instead of previewing and posting one order
+    at a time:
+
+        validate    every order is checked up front; an invalid basket raises
+                    OrderValidationError before anything is sent
+        serialize   the FIXML of every order is written in one call
+        preview     previews run concurrently, max_previews at a time
+        gate        a check of each preview, preview_ok by default, decides
+                    whether the order is submitted, or with all_or_nothing
+                    the basket
+        submit      orders are posted, max_submits at a time
+
+    Previews and submissions go through the AllyAPI rate limiter, so they
+    stay inside the trade budget however many run at once. Results are
+    yielded as each order finishes, and get_stats() reports the time spent
+    in every stage:
+
+        pipeline = OrderPipeline(api, account_id)
+        for result in pipeline.run(basket):
+            print(result.index, result.status(), result.response)
+        pipeline.get_stats()['preview']
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import threading
+import time
+
+from .fixml import orders_fixml
+from .responses.order import check_orders
+from .responses.post_order import PostOrderResponse
+from .responses.post_order_preview import PostOrderPreviewResponse
+
+# Stages in the order they run.
+STAGES = ('validate', 'serialize', 'preview', 'submit')
+
+
+def preview_ok(order, preview):
+    """A gate passing the orders whose preview reports no error.
+        @param order - the Order, or list of legs
+        @param preview - its PostOrderPreviewResponse
+    """
+    return preview.error in (None, '', 'Success')
+
+
+class OrderResult:
+    """The outcome of one order of a basket.
+
+        index - position of the order in the basket
+        order - the Order, or list of legs
+        preview - PostOrderPreviewResponse, None when not previewed
+        response - PostOrderResponse, None when not submitted
+        error - exception raised by the preview or the submission
+        skipped - True when the gate held the order back
+        latencies - seconds spent in each stage, keyed by stage
+    """
+    def __init__(self, index, order):
+        self.index = index
+        self.order = order
+        self.preview = None
+        self.response = None
+        self.error = None
+        self.skipped = False
+        self.latencies = {}
+
+    def ok(self):
+        """Returns True if the order was submitted without error.
+            @param self - the object pointer
+        """
+        return self.response is not None and self.error is None
+
+    def status(self):
+        """Returns 'submitted', 'skipped' or 'failed'.
+            @param self - the object pointer
+        """
+        if self.error is not None:
+            return 'failed'
+        return 'skipped' if self.skipped else 'submitted'
+
+
+class OrderPipeline:
+    """Validates, previews and submits baskets of orders."""
+    def __init__(self, ally_api, account_id, preview=True, gate=preview_ok,
+                 all_or_nothing=False, max_previews=4, max_submits=2):
+        """OrderPipeline constructor.
+            @param self - the object pointer
+            @param ally_api - AllyAPI instance the orders are placed with
+            @param account_id - account number
+            @param preview - preview every order before submitting it
+            @param gate - callable(order, preview) returning whether the order
+                may be submitted. The default, preview_ok, holds back the
+                orders whose preview reports an error; None submits every
+                order whose preview request did not fail.
+            @param all_or_nothing - wait for every preview and submit none of
+                the orders unless all pass
+            @param max_previews - maximum number of previews in flight
+            @param max_submits - maximum number of submissions in flight
+        """
+        self.ally_api = ally_api
+        self.account_id = account_id
+        self.preview = preview
+        self.gate = gate
+        self.all_or_nothing = all_or_nothing
+        self.max_previews = max_previews
+        self.max_submits = max_submits
+        self.stage_times = {}
+        self.spans = {}
+        self.lock = threading.Lock()
+        self.results = []
+
+    def run(self, orders, cancel=False):
+        """Places a basket of orders and yields an OrderResult for every order
+            as it finishes, submitted, skipped or failed. Raises
+            OrderValidationError, before sending anything, if any order is
+            invalid.
+            @param self - the object pointer
+            @param orders - list of Order objects, or lists of Order objects for
+                multi-leg orders
+            @param cancel - should the orders be cancelled only?
+        """
+        orders = list(orders)
+        self.stage_times = {stage: 0.0 for stage in STAGES}
+        self.spans = {}
+        self.results = [OrderResult(i, order) for i, order in enumerate(orders)]
+
+        started = time.perf_counter()
+        check_orders(orders)
+        self.stage_times['validate'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        fixmls = orders_fixml(orders, cancel, validate=False)
+        self.stage_times['serialize'] = time.perf_counter() - started
+        return self.__run(fixmls)
+
+    def __run(self, fixmls):
+        """A private generator previewing and submitting serialized orders."""
+        if not fixmls:
+            return
+        with ThreadPoolExecutor(max_workers=self.max_previews) as previews, \
+             ThreadPoolExecutor(max_workers=self.max_submits) as submits:
+            if not self.preview:
+                pending = self.__submit_all(submits, self.results, fixmls)
+            else:
+                pending = {previews.submit(self.__preview, result, fixml): 'preview'
+                           for result, fixml in zip(self.results, fixmls)}
+                if self.all_or_nothing:
+                    wait(pending)
+                    passed = [self.__passes(result) for result in self.results]
+                    if not all(passed):
+                        # Hold back the whole basket.
+                        for result in self.results:
+                            result.skipped = result.error is None
+                            yield result
+                        return
+                    pending = self.__submit_all(submits, self.results, fixmls)
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stage = pending.pop(future)
+                        result = future.result()
+                        if stage == 'preview' and self.__passes(result):
+                            pending[submits.submit(self.__submit, result,
+                                                   fixmls[result.index])] = 'submit'
+                        else:
+                            yield result
+            finally:
+                # When the caller stops early, orders not sent yet are dropped.
+                for future in pending:
+                    future.cancel()
+
+    def __submit_all(self, submits, results, fixmls):
+        """A private method queueing the submission of orders."""
+        return {submits.submit(self.__submit, result, fixml): 'submit'
+                for result, fixml in zip(results, fixmls)}
+
+    def __passes(self, result):
+        """A private method applying the gate to a previewed order."""
+        if result.error is not None:
+            return False
+        passed = self.gate is None or bool(self.gate(result.order, result.preview))
+        result.skipped = not passed
+        return passed
+
+    def __preview(self, result, fixml):
+        """A private method previewing one order."""
+        started = time.perf_counter()
+        try:
+            data = self.ally_api.post_order_preview(self.account_id, fixml)
+            result.preview = PostOrderPreviewResponse(self.account_id, self.ally_api.format, data,
+                                                      json_decoder=self.ally_api.json_decoder)
+        except Exception as e:
+            result.error = e
+        self.__record(result, 'preview', started)
+        return result
+
+    def __submit(self, result, fixml):
+        """A private method submitting one order."""
+        started = time.perf_counter()
+        try:
+            data = self.ally_api.post_order(self.account_id, fixml)
+            result.response = PostOrderResponse(self.account_id, self.ally_api.format, data,
+                                                json_decoder=self.ally_api.json_decoder)
+        except Exception as e:
+            result.error = e
+        self.__record(result, 'submit', started)
+        return result
+
+    def __record(self, result, stage, started):
+        """A private method recording the latency of an order in a stage and
+            extending the stage's wall time span.
+        """
+        finished = time.perf_counter()
+        result.latencies[stage] = finished - started
+        with self.lock:
+            first, last = self.spans.get(stage, (started, finished))
+            self.spans[stage] = (min(first, started), max(last, finished))
+
+    def get_stats(self):
+        """Returns the time spent in every stage of the last run, keyed by
+            stage. 'wall_time' is the elapsed time of the stage; for the
+            preview and submit stages 'total_latency', 'max_latency' and
+            'mean_latency' are over the orders of the stage.
+            @param self - the object pointer
+        """
+        stats = {}
+        for stage in STAGES:
+            if stage in self.spans:
+                first, last = self.spans[stage]
+                stats[stage] = {"wall_time": last - first}
+            else:
+                stats[stage] = {"wall_time": self.stage_times.get(stage, 0.0)}
+            latencies = [result.latencies[stage] for result in self.results
+                         if stage in result.latencies]
+            if stage in ('preview', 'submit'):
+                total = sum(latencies)
+                stats[stage].update({
+                    "orders": len(latencies),
+                    "total_latency": total,
+                    "max_latency": max(latencies) if latencies else 0.0,
+                    "mean_latency": total / len(latencies) if latencies else 0.0,
+                })
+        stats["orders"] = len(self.results)
+        stats["submitted"] = sum(1 for result in self.results if result.ok())
+        stats["skipped"] = sum(1 for result in self.results if result.skipped)
+        stats["failed"] = sum(1 for result in self.results if result.error is not None)
+        return stats
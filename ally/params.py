@@ -0,0 +1,84 @@
+"""@package params
+    Checks and builds the arguments of API calls. AllyAPI and AsyncAllyAPI
+    both go through these functions, so the same call prints the same
+    warnings and rejects the same arguments on either client.
+"""
+
+import datetime
+
+from .symbols import get_symbol_string, get_option_quote_symbol
+from .responses.order import ORDER_TYPE
+
+
+def get_option_quote_symbols(symbol, expiration_date, strike_price, put_call):
+    """Returns the list of OCC symbols of the options to quote, None after
+        printing the reason if the arguments are invalid.
+        @param symbol - underlying stock's ticker symbol, or list of them
+        @param expiration_date - options expiration date, or list of them
+        @param strike_price - option's strike price, or list of them
+        @param put_call - c=call, p=put, or list of them
+    """
+    if isinstance(symbol, str): # single ticker
+        if not isinstance(expiration_date, datetime.datetime):
+            print("In 'get_option_quote': datetime.datetime expected for expiration date.")
+            return None
+        return [get_option_quote_symbol(symbol, expiration_date, strike_price, put_call)]
+    elif isinstance(symbol, list) and isinstance(expiration_date, list) \
+        and isinstance(strike_price, list) and isinstance(put_call, list):
+        if not isinstance(expiration_date[0], datetime.datetime):
+            print("In 'get_option_quote': datetime.datetime expected for expiration date.")
+            return None
+        request_sym = []
+        for i in range(len(symbol)):
+            request_sym.append(get_option_quote_symbol(symbol[i], expiration_date[i],
+                        strike_price[i], put_call[i]))
+        return request_sym
+    print("In 'get_option_quote': symbol, expiration_date, strike_price, and put_call \
+          must all be single values or lists.")
+    return None
+
+
+def get_news_search_query(symbols, startdate=None, enddate=None, maxhits=10):
+    """Returns the query string of a news search. The dates are ignored, with
+        a warning, unless both are given; raises an exception if the start
+        date is after the end date.
+        @param symbols - single ticker or list of ticker to get news for
+        @param startdate - search for articles between this date and enddate
+        @param enddate - search for articles between this date and startdate
+        @param maxhits - number of articles to return
+    """
+    if startdate is None or enddate is None:
+        print("news_search: either enddate or startdate is not specified, ignoring both.")
+
+    if (startdate is not None and enddate is not None) and (enddate < startdate):
+        print("news_search: start date is after end date.")
+        raise Exception("Start date is after end date in news search.")
+
+    query = "?symbols={syms}&maxhits={mxhits}".format(syms=get_symbol_string(symbols),
+                                                      mxhits=maxhits)
+    if startdate is not None and enddate is not None:
+        query += "&startdate={sdate}&enddate={edate}" \
+            .format(sdate=startdate.strftime("%m/%d/%Y"), edate=enddate.strftime("%m/%d/%Y"))
+    return query
+
+
+def get_watchlist_payload(watchlist_name, symbols=""):
+    """Returns the form data creating a watchlist, warning about lists of
+        symbols.
+        @param watchlist_name - name of the watchlist
+        @param symbols - single ticker or list of tickers to add to the watchlist
+    """
+    print("WARNING create_watchlist(): There appears to be an issue when adding a list of symbols. It is recommended that one ticker symbol is added at a time.")
+    payload = {"id": watchlist_name}
+    if not symbols == "":
+        payload["symbols"] = symbols
+    return payload
+
+
+def check_order_price(type, price):
+    """Raises ValueError if an order type other than market has no price.
+        @param type - the order type, one of ORDER_TYPE
+        @param price - the order price
+    """
+    if price is None and type != ORDER_TYPE.MARKET:
+        raise ValueError("Price is required for non-market order types.")
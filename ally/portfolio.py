@@ -0,0 +1,250 @@
+"""@package portfolio
+    Vectorized aggregation of the holdings of many accounts.
+
+    Portfolio loads the Holding objects of any number of accounts into NumPy
+    arrays once, one row per holding, and computes totals, exposures and
+    unrealized P&L over the arrays instead of looping over the strings Ally
+    sends:
+
+        portfolio = Portfolio({id: api_holdings_response for id in account_ids})
+        portfolio.totals()                  # {'marketvalue': ..., 'costbasis': ..., 'gainloss': ...}
+        portfolio.exposure('symbol')        # {'AAPL': 5951.0, ...}
+        portfolio.pnl('account')            # unrealized gain/loss per account
+
+    update_quotes() reprices the holdings of the quoted symbols only and
+    adjusts the totals and the exposures computed so far by the difference,
+    so fresh quotes (a QuotesResponse, QuoteBatch or streamed quotes and
+    trades) are applied without rebuilding anything.
+
+    The asset class is the holding's assetclass, or its security type when
+    Ally does not send one. Requires numpy (pip install AllyInvestPy[numpy]).
+"""
+
+from operator import attrgetter
+
+from .responses.quote_batch import numpy, to_float_array, to_string_array
+
+# Groupings supported by exposure() and pnl().
+GROUPS = ('symbol', 'assetclass', 'account')
+
+# Values summed per group and in totals().
+SUMS = ('marketvalue', 'costbasis', 'gainloss')
+
+# Holding attributes read, optional ones last.
+ATTRIBUTES = ('qty', 'costbasis', 'marketvalue', 'gainloss', 'lastprice', 'sym',
+              'mult', 'assetclass', 'sectyp')
+
+
+def get_attributes(objects, attrs):
+    """Returns one list of values per attribute, None where an object does not
+        have the attribute.
+        @param objects - list of objects, e.g. Holding
+        @param attrs - attribute names
+    """
+    columns = []
+    for attr in attrs:
+        try:
+            columns.append(list(map(attrgetter(attr), objects)))
+        except AttributeError:
+            columns.append([getattr(obj, attr, None) for obj in objects])
+    return columns
+
+
+class Portfolio:
+    """The holdings of many accounts as columns of typed arrays."""
+
+    # Numeric columns as (Holding attribute, column name).
+    NUMERIC_FIELDS = (
+        ('qty', 'qty'),
+        ('costbasis', 'costbasis'),
+        ('marketvalue', 'marketvalue'),
+        ('gainloss', 'gainloss'),
+        ('lastprice', 'lastprice'),
+        ('mult', 'mult'),
+    )
+
+    def __init__(self, accounts=None):
+        """Portfolio constructor.
+            @param self - the object pointer
+            @param accounts - dict of account number -> list of Holding objects
+                or AccountHoldingsResponse
+        """
+        if numpy is None:
+            raise ImportError("Portfolio requires numpy: pip install numpy")
+        self.rows = []
+        self.columns = {}
+        self.groups = {}
+        self.sums = {}
+        self.total = None
+        for account_id, holdings in (accounts or {}).items():
+            self.add(account_id, holdings, rebuild=False)
+        self.__build()
+
+    def add(self, account_id, holdings, rebuild=True):
+        """Adds the holdings of an account.
+            @param self - the object pointer
+            @param account_id - account number
+            @param holdings - list of Holding objects or an AccountHoldingsResponse
+            @param rebuild - rebuild the arrays now; pass False when adding many
+                accounts and call add() with the last one or rebuild() after
+        """
+        if hasattr(holdings, 'get_holdings'):
+            holdings = holdings.get_holdings()
+        account_id = str(account_id)
+        for holding in holdings:
+            self.rows.append((account_id, holding))
+        if rebuild:
+            self.__build()
+
+    def rebuild(self):
+        """Rebuilds the arrays from the holdings added.
+            @param self - the object pointer
+        """
+        self.__build()
+
+    def __build(self):
+        """A private method converting the holdings to arrays."""
+        holdings = [holding for account_id, holding in self.rows]
+        values = dict(zip(ATTRIBUTES, get_attributes(holdings, ATTRIBUTES)))
+        columns = {}
+        for attr, column in self.NUMERIC_FIELDS:
+            columns[column] = to_float_array(values[attr])
+        columns['account'] = to_string_array([account_id for account_id, h in self.rows])
+        columns['symbol'] = to_string_array(values['sym'])
+        columns['assetclass'] = to_string_array([assetclass or sectyp for assetclass, sectyp
+                                                 in zip(values['assetclass'], values['sectyp'])])
+        # Contract multiplier: Ally's mult, else implied by the market value.
+        mult = columns['mult']
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            implied = columns['marketvalue'] / (columns['qty'] * columns['lastprice'])
+        mult[numpy.isnan(mult)] = implied[numpy.isnan(mult)]
+        mult[~numpy.isfinite(mult)] = 1.0
+        self.columns = columns
+        self.groups = {}
+        self.sums = {}
+        self.total = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __get_group(self, by):
+        """A private method returning (keys, codes) of a grouping: the sorted
+            distinct keys and the index of the key of every row.
+        """
+        group = self.groups.get(by)
+        if group is None:
+            if by not in GROUPS:
+                raise ValueError("Invalid grouping '{}', valid values are {}".format(
+                    by, ", ".join(GROUPS)))
+            values = self.columns[by]
+            values = numpy.array(['' if v is None else v for v in values], dtype=object)
+            group = self.groups[by] = numpy.unique(values, return_inverse=True)
+        return group
+
+    def __get_sums(self, by):
+        """A private method returning the SUMS of every group of a grouping,
+            computed once and kept up to date by update_quotes().
+        """
+        sums = self.sums.get(by)
+        if sums is None:
+            keys, codes = self.__get_group(by)
+            sums = self.sums[by] = {
+                name: numpy.bincount(codes, numpy.nan_to_num(self.columns[name]),
+                                     minlength=len(keys))
+                for name in SUMS}
+        return sums
+
+    def totals(self):
+        """Returns the total market value, cost basis and unrealized gain/loss
+            of all holdings. Missing values count as 0.
+            @param self - the object pointer
+        """
+        if self.total is None:
+            self.total = {name: float(numpy.nansum(self.columns[name])) for name in SUMS}
+        return dict(self.total)
+
+    def exposure(self, by='symbol', value='marketvalue'):
+        """Returns the market value (or cost basis, or gain/loss) held per
+            symbol, asset class or account.
+            @param self - the object pointer
+            @param by - 'symbol', 'assetclass' or 'account'
+            @param value - 'marketvalue', 'costbasis' or 'gainloss'
+        """
+        keys, codes = self.__get_group(by)
+        return dict(zip(keys.tolist(), self.__get_sums(by)[value].tolist()))
+
+    def pnl(self, by=None):
+        """Returns the unrealized gain/loss, per row when by is None or per
+            symbol, asset class or account.
+            @param self - the object pointer
+            @param by - None, 'symbol', 'assetclass' or 'account'
+        """
+        if by is None:
+            return self.columns['gainloss']
+        return self.exposure(by, 'gainloss')
+
+    def update_quotes(self, quotes):
+        """Reprices the holdings of the quoted symbols at their last price and
+            updates the totals and exposures by the difference. Returns the
+            number of holdings repriced.
+            @param self - the object pointer
+            @param quotes - QuotesResponse, QuoteBatch, dict of symbol -> price,
+                or iterable of objects with symbol and last attributes such as
+                Quote and Trade
+        """
+        symbols, prices = self.__get_prices(quotes)
+        keys, codes = self.__get_group('symbol')
+        if not len(keys) or not len(symbols):
+            return 0
+        # Price of every distinct held symbol, NaN when not quoted.
+        positions = numpy.minimum(numpy.searchsorted(keys, symbols), len(keys) - 1)
+        found = (keys[positions] == symbols) & ~numpy.isnan(prices)
+        price = numpy.full(len(keys), numpy.nan)
+        price[positions[found]] = prices[found]
+        rows = numpy.flatnonzero(~numpy.isnan(price[codes]))
+        if not len(rows):
+            return 0
+
+        columns = self.columns
+        last = price[codes[rows]]
+        marketvalue = columns['qty'][rows] * last * columns['mult'][rows]
+        gainloss = marketvalue - columns['costbasis'][rows]
+        deltas = {
+            'marketvalue': numpy.nan_to_num(marketvalue) -
+                           numpy.nan_to_num(columns['marketvalue'][rows]),
+            'gainloss': numpy.nan_to_num(gainloss) -
+                        numpy.nan_to_num(columns['gainloss'][rows]),
+        }
+        columns['lastprice'][rows] = last
+        columns['marketvalue'][rows] = marketvalue
+        columns['gainloss'][rows] = gainloss
+
+        if self.total is not None:
+            for name, delta in deltas.items():
+                self.total[name] += float(delta.sum())
+        for by, sums in self.sums.items():
+            group_codes = self.groups[by][1][rows]
+            for name, delta in deltas.items():
+                numpy.add.at(sums[name], group_codes, delta)
+        return len(rows)
+
+    def __get_prices(self, quotes):
+        """A private method returning the symbols and last prices of quotes as
+            an object array and a float array.
+        """
+        if hasattr(quotes, 'get_quote_batch'):
+            quotes = quotes.get_quote_batch()
+        if hasattr(quotes, 'columns') and 'symbol' in quotes.columns:
+            symbols, prices = quotes['symbol'], quotes['last']
+        else:
+            if isinstance(quotes, dict):
+                pairs = list(quotes.items())
+            else:
+                pairs = [(getattr(q, 'symbol', None), getattr(q, 'last', None)) for q in quotes]
+            symbols = to_string_array([symbol for symbol, price in pairs])
+            prices = to_float_array([price for symbol, price in pairs])
+        missing = numpy.array([symbol is None for symbol in symbols], dtype=bool)
+        return symbols[~missing], prices[~missing]
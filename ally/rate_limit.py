@@ -0,0 +1,191 @@
+"""@package rate_limit
+    Client side rate limiting for the Ally Invest API.
+
+    Ally limits the number of calls per minute separately for market data,
+    trading and account (everything else) calls and answers calls over the
+    budget with HTTP 429. The RateLimiter keeps one token bucket per category,
+    delays calls that would exceed the budget, follows the X-RateLimit-*
+    headers returned by the server and works out how long to back off before
+    retrying a throttled call.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """A thread-safe token bucket. Tokens are added continuously at `rate` per
+        second up to `capacity`. Reserving a token never blocks; it returns how
+        long the caller has to wait before the token is theirs, so waiting
+        callers are served in the order they arrived.
+    """
+    def __init__(self, rate, capacity):
+        """TokenBucket constructor.
+            @param self - the object pointer
+            @param rate - tokens added per second
+            @param capacity - maximum number of tokens (the burst size)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def __refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Takes one token and returns the number of seconds to wait before
+            using it.
+            @param self - the object pointer
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.__refill(now)
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(delay, self.blocked_until - now)
+
+    def sync(self, remaining=None, reset_in=None):
+        """Brings the bucket in line with the budget reported by the server.
+            @param self - the object pointer
+            @param remaining - calls the server still allows in this period
+            @param reset_in - seconds until the server's period resets
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.__refill(now)
+            if remaining is not None:
+                # Other clients may share the budget; trust the lower count.
+                self.tokens = min(self.tokens, float(remaining))
+                if remaining <= 0 and reset_in is not None:
+                    self.blocked_until = max(self.blocked_until, now + reset_in)
+
+
+class RateLimiter:
+    """Tracks the per-category budgets Ally enforces and throttles calls to
+        stay inside them. One instance may be shared by several AllyAPI
+        objects using the same credentials.
+    """
+    # Calls per minute allowed by Ally for each category.
+    DEFAULT_LIMITS = {
+        "market": 60,
+        "trade": 40,
+        "account": 180,
+    }
+
+    def __init__(self, limits=None, period=60.0, max_retries=5, backoff=1.0,
+                 max_backoff=60.0):
+        """RateLimiter constructor.
+            @param self - the object pointer
+            @param limits - dict of calls per period keyed by category, defaults
+                to DEFAULT_LIMITS
+            @param period - length of the rate limit period in seconds
+            @param max_retries - number of times a throttled (429) call is retried
+            @param backoff - initial back off in seconds, doubled on every retry
+            @param max_backoff - upper bound of the back off in seconds
+        """
+        self.limits = dict(self.DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.period = period
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.buckets = {category: TokenBucket(limit / period, limit)
+                        for category, limit in self.limits.items()}
+        self.lock = threading.Lock()
+        self.counters = {category: {"calls": 0, "delayed": 0, "throttled": 0, "wait": 0.0}
+                         for category in self.limits}
+
+    @staticmethod
+    def category(url, method="GET"):
+        """Returns the rate limit category of an API call.
+            @param url - API URL being accessed
+            @param method - HTTP method
+        """
+        path = url.split("?", 1)[0]
+        if "/market/" in path:
+            return "market"
+        if method.upper() == "POST" and "/orders" in path:
+            return "trade"
+        return "account"
+
+    def reserve(self, category):
+        """Reserves a call in the category's budget and returns the number of
+            seconds the caller has to wait before making it. Used directly by
+            the asyncio client.
+            @param self - the object pointer
+            @param category - 'market', 'trade' or 'account'
+        """
+        delay = self.buckets[category].reserve()
+        with self.lock:
+            counters = self.counters[category]
+            counters["calls"] += 1
+            if delay > 0:
+                counters["delayed"] += 1
+                counters["wait"] += delay
+        return delay
+
+    def acquire(self, category):
+        """Blocks until a call in the category's budget is available.
+            @param self - the object pointer
+            @param category - 'market', 'trade' or 'account'
+        """
+        delay = self.reserve(category)
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, category, headers):
+        """Updates the category's budget from the rate limit headers of a
+            response.
+            @param self - the object pointer
+            @param category - 'market', 'trade' or 'account'
+            @param headers - response headers
+        """
+        remaining = self.__header(headers, "X-RateLimit-Remaining")
+        expire = self.__header(headers, "X-RateLimit-Expire")
+        reset_in = max(expire - time.time(), 0.0) if expire is not None else None
+        if remaining is not None:
+            self.buckets[category].sync(int(remaining), reset_in)
+
+    def retry_delay(self, category, attempt, headers):
+        """Returns the number of seconds to wait before retrying a throttled
+            call. Server hints (Retry-After, X-RateLimit-Expire) take
+            precedence over the exponential back off.
+            @param self - the object pointer
+            @param category - 'market', 'trade' or 'account'
+            @param attempt - number of retries made so far
+            @param headers - headers of the 429 response
+        """
+        with self.lock:
+            self.counters[category]["throttled"] += 1
+        self.buckets[category].sync(0)
+
+        retry_after = self.__header(headers, "Retry-After")
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        expire = self.__header(headers, "X-RateLimit-Expire")
+        if expire is not None and expire > time.time():
+            return min(expire - time.time(), self.max_backoff)
+        return min(self.backoff * (2 ** attempt), self.max_backoff)
+
+    def get_stats(self):
+        """Returns the number of calls, delayed calls, throttled calls and the
+            total time spent waiting, per category.
+            @param self - the object pointer
+        """
+        with self.lock:
+            return {category: dict(counters) for category, counters in self.counters.items()}
+
+    @staticmethod
+    def __header(headers, name):
+        value = headers.get(name) if headers is not None else None
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
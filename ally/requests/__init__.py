@@ -3,6 +3,7 @@ from .option_quote import *
 from .account_balances import *
 from .accounts_balances import *
 from .account_holdings import * 
+from .account_history import *
 from .orders import *
 from .post_order import *
 from .post_order_preview import *
\ No newline at end of file
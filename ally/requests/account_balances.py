@@ -7,4 +7,6 @@ class AccountBalancesRequest(Request):
         self.account_id = account_id
 
     def execute(self, ally_api):
-        return AccountBalancesResponse(self.account_id, self.response_format, ally_api.get_account_balances(self.account_id))
+        return self.build_response(ally_api.get_account_balances(self.account_id),
+            lambda data: AccountBalancesResponse(self.account_id, self.response_format, data,
+                                                 json_decoder=ally_api.json_decoder))
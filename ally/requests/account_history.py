@@ -0,0 +1,19 @@
+from .request import *
+from ..responses.account_history import *
+
+class AccountHistoryRequest(Request):
+    def __init__(self, account_id, response_format='json', date_range=None, transactions=None,
+                 keep_raw=True):
+        super().__init__(response_format)
+        self.account_id = account_id
+        self.date_range = date_range
+        self.transactions = transactions
+        self.keep_raw = keep_raw
+
+    def execute(self, ally_api):
+        # xml responses are parsed incrementally from the response body.
+        xml = self.response_format == 'xml'
+        return self.build_response(ally_api.get_account_history(self.account_id, self.date_range,
+                                                                self.transactions, raw=xml),
+            lambda data: AccountHistoryResponse(self.account_id, self.response_format, data,
+                                                self.keep_raw, json_decoder=ally_api.json_decoder))
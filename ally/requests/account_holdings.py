@@ -2,9 +2,16 @@ from .request import *
 from ..responses.account_holdings import *
 
 class AccountHoldingsRequest(Request):
-    def __init__(self, account_id, response_format='json'):
+    def __init__(self, account_id, response_format='json', lazy=False, keep_raw=True):
         super().__init__(response_format)
+        self.lazy = lazy
+        self.keep_raw = keep_raw
         self.account_id = account_id
 
     def execute(self, ally_api):
-        return AccountHoldingsResponse(self.account_id, self.response_format, ally_api.get_account_holdings(self.account_id))
+        # xml responses are parsed incrementally from the response body.
+        xml = self.response_format == 'xml'
+        return self.build_response(ally_api.get_account_holdings(self.account_id, raw=xml),
+            lambda data: AccountHoldingsResponse(self.account_id, self.response_format, data,
+                                                  self.lazy, self.keep_raw,
+                                                  json_decoder=ally_api.json_decoder))
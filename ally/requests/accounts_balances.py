@@ -6,4 +6,6 @@ class AccountsBalancesRequest(Request):
         super().__init__(response_format)
 
     def execute(self, ally_api):
-        return AccountsBalancesResponse(self.response_format, ally_api.get_accounts_balances())
+        return self.build_response(ally_api.get_accounts_balances(),
+            lambda data: AccountsBalancesResponse(self.response_format, data,
+                                                  json_decoder=ally_api.json_decoder))
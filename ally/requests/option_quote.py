@@ -10,4 +10,6 @@ class OptionQuoteRequest(Request):
         self.put_call = put_call
 
     def execute(self, allyApi):
-        return QuotesResponse(self.response_format, allyApi.get_option_quote(self.symbol, self.exp_date, self.strike, self.put_call))
+        return self.build_response(allyApi.get_option_quote(self.symbol, self.exp_date, self.strike, self.put_call),
+            lambda data: QuotesResponse(self.response_format, data,
+                                        json_decoder=allyApi.json_decoder))
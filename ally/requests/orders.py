@@ -2,9 +2,18 @@ from .request import *
 from ..responses.orders import *
 
 class OrdersRequest(Request):
-    def __init__(self, account_id, response_format='json'):
+    def __init__(self, account_id, response_format='json', lazy=False, keep_raw=True):
         super().__init__(response_format)
+        self.lazy = lazy
+        self.keep_raw = keep_raw
         self.account_id = account_id
 
     def execute(self, ally_api):
-        return OrdersResponse(self.account_id, self.response_format, ally_api.get_orders(self.account_id))
+        # Lazy json responses parse the FIXML of the orders that are read and
+        # xml responses are parsed incrementally from the response body.
+        xml = self.response_format == 'xml'
+        expand_fixml = not (self.lazy or xml)
+        return self.build_response(ally_api.get_orders(self.account_id, expand_fixml, raw=xml),
+            lambda data: OrdersResponse(self.account_id, self.response_format, data,
+                                         self.lazy, self.keep_raw,
+                                         json_decoder=ally_api.json_decoder))
@@ -1,8 +1,7 @@
-from xml.etree import ElementTree
-
 from .request import *
 from ..responses.post_order import *
 from ..responses.order import *
+from ..fixml import order_fixml, multileg_fixml
 
 class PostOrderRequest(Request):
     def __init__(self, account_id, order, response_format='json'):
@@ -11,17 +10,14 @@ class PostOrderRequest(Request):
         self.order = order
 
     def execute(self, ally_api, cancel=False):
+        # Never trust order contents; always validate it.
+        check_orders([self.order])
         if isinstance(self.order, list):
             # This is a multi-leg option order.
-            # Never trust order contents; always validate it.
-            for order in self.order:
-                order.validate()
-            # Convert to string.
-            fixml_string = ElementTree.tostring(get_multileg_fixml(self.order, cancel=cancel))
+            fixml_string = multileg_fixml(self.order, cancel=cancel, validate=False)
         else:
             # This is a single-leg option or common stock order.
-            # Never trust order contents; always validate it.
-            self.order.validate()
-            # Convert to string.
-            fixml_string = ElementTree.tostring(self.order.to_fixml(cancel=cancel))
-        return PostOrderResponse(self.account_id, self.response_format, ally_api.post_order(self.account_id, fixml_string))
+            fixml_string = order_fixml(self.order, cancel=cancel)
+        return self.build_response(ally_api.post_order(self.account_id, fixml_string),
+            lambda data: PostOrderResponse(self.account_id, self.response_format, data,
+                                           json_decoder=ally_api.json_decoder))
@@ -2,8 +2,10 @@ from .request import *
 from ..responses.quotes import *
 
 class QuotesRequest(Request):
-    def __init__(self, symbols=[], fids=[], response_format='json'):
+    def __init__(self, symbols=[], fids=[], response_format='json', lazy=False, keep_raw=True):
         super().__init__(response_format)
+        self.lazy = lazy
+        self.keep_raw = keep_raw
         self.symbols = symbols
         self.fids = fids
 
@@ -20,4 +22,6 @@ class QuotesRequest(Request):
         return self.fids
 
     def execute(self, allyApi):
-        return QuotesResponse(self.response_format, allyApi.get_quote(self.symbols))
+        return self.build_response(allyApi.get_quote(self.symbols),
+            lambda data: QuotesResponse(self.response_format, data, self.lazy, self.keep_raw,
+                                        json_decoder=allyApi.json_decoder))
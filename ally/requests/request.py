@@ -1,6 +1,24 @@
+import inspect
+
 class Request():
     def __init__(self, response_format):
         self.response_format = response_format
 
     def execute(self):
         pass
+
+    def build_response(self, data, build):
+        """Wraps the data returned by an API call in a Response object.
+
+            When the API call was made through AsyncAllyAPI the data is an
+            awaitable; a coroutine is returned instead, so execute() can be
+            awaited.
+            @param self - the object pointer
+            @param data - value (or awaitable) returned by the API call
+            @param build - callable creating the Response from the data
+        """
+        if inspect.isawaitable(data):
+            async def build_async():
+                return build(await data)
+            return build_async()
+        return build(data)
@@ -3,6 +3,10 @@ from .accounts_balances import *
 from .account import *          # accounts/:id
 from .accounts import *         # accounts/
 from .quotes import *           # reponse from executing QuotesRequest
+from .quote_batch import QuoteBatch
 from .account_holdings import *
+from .account_history import *
 from .orders import *
-from .order import * 
\ No newline at end of file
+from .order import * 
+from .lazy import LazyList, LazyQuote, LazyHolding, LazyOrder
+from .trade import *            # trades from the quote stream
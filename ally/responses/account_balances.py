@@ -1,8 +1,8 @@
 from .response import *
 
 class AccountBalancesResponse(Response):
-    def __init__(self, account_id, response_format, data):
-        super().__init__(response_format, data)
+    def __init__(self, account_id, response_format, data, keep_raw=True, json_decoder=None):
+        super().__init__(response_format, data, keep_raw, json_decoder)
         self.account_id = account_id
 
     def __parse_xml(self, data):
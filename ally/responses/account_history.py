@@ -0,0 +1,28 @@
+from .response import *
+from .transaction import *
+
+class AccountHistoryResponse(Response):
+    def __init__(self, account_id, response_format, data, keep_raw=True, json_decoder=None):
+        super().__init__(response_format, data, keep_raw, json_decoder)
+        self.account_id = account_id
+        self.transactions = []
+        if response_format.lower() == 'xml':
+            self.__parse_xml(self.payload)
+        elif response_format.lower() == 'json':
+            self.__parse_json(self.payload)
+        self.release(views=True)
+
+    def __parse_xml(self, data):
+        self.transactions = super().parse_xml_items(data, 'transactions', 'transaction',
+                                                    Transaction)
+
+    def __parse_json(self, data):
+        super().parse_json(data)
+        transactions = (self.json.get('transactions') or {}).get('transaction') or []
+        for transaction_json in transactions if isinstance(transactions, list) else [transactions]:
+            transaction = Transaction()
+            transaction.from_json(transaction_json)
+            self.transactions.append(transaction)
+
+    def get_transactions(self):
+        return self.transactions
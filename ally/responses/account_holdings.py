@@ -1,25 +1,44 @@
 from .response import *
 from .holding import *
+from .lazy import LazyList, LazyHolding
 
 class AccountHoldingsResponse(Response):
-    def __init__(self, account_id, response_format, data):
-        super().__init__(response_format, data)
+    def __init__(self, account_id, response_format, data, lazy=False, keep_raw=True,
+                 json_decoder=None):
+        """AccountHoldingsResponse constructor.
+            @param self - the object pointer
+            @param account_id - account number
+            @param response_format - 'json' or 'xml'
+            @param data - decoded payload, or the response body as bytes or str
+            @param lazy - wrap the holdings in LazyHolding views decoded on access;
+                json only, raises ValueError for xml
+            @param keep_raw - keep raw_data after parsing
+            @param json_decoder - decodes a json response body, None for the
+                fastest installed backend
+        """
+        self.check_lazy(response_format, lazy)
+        super().__init__(response_format, data, keep_raw, json_decoder)
+        self.lazy = lazy
         self.account_id = account_id
         self.holdings = []
         if response_format.lower() == 'xml':
-            self.__parse_xml(data)
+            self.__parse_xml(self.payload)
         elif response_format.lower() == 'json':
-            self.__parse_json(data)
+            self.__parse_json(self.payload)
+        self.release(views=not lazy)
 
     def __parse_xml(self, data):
-        super().parse_json(data)
-        for holding_json in data['accountholdings']:
-            holding = Holding()
-            self.holdings.append(holding.from_xml(holding_json))
+        self.holdings = super().parse_xml_items(data, 'accountholdings', 'holding', Holding)
 
     def __parse_json(self, data):
         super().parse_json(data)
-        for holding_json in self.json['accountholdings']['holding']:
+        # Ally sends a single holding as an object rather than a list.
+        holdings = self.json['accountholdings']['holding'] or []
+        holdings = holdings if isinstance(holdings, list) else [holdings]
+        if self.lazy:
+            self.holdings = LazyList(holdings, LazyHolding)
+            return
+        for holding_json in holdings:
             holding = Holding()
             holding.from_json(holding_json)
             self.holdings.append(holding)
@@ -1,13 +1,14 @@
 from .response import *
 
 class AccountsBalancesResponse(Response):
-    def __init__(self, response_format, data):
-        super().__init__(response_format, data)
+    def __init__(self, response_format, data, keep_raw=True, json_decoder=None):
+        super().__init__(response_format, data, keep_raw, json_decoder)
         self.account_data = {}      # a dictionary of dictionaries
         if response_format.lower() == 'xml':
-            self.__parse_xml(data)
+            self.__parse_xml(self.payload)
         elif response_format.lower() == 'json':
-            self.__parse_json(data)
+            self.__parse_json(self.payload)
+        self.release()
 
     def get_account_data_by_account(self, id):
         return self.account_data[str(id)]
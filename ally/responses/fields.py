@@ -0,0 +1,41 @@
+def set_fields(obj, json, sections):
+    """Sets an attribute of an object for every field of a field table found
+        in a json item, leaving the fields missing from the response unset.
+
+        The table is a sequence of (section, ((response key, attribute), ...)).
+        section is the key of a nested dict to read the fields from, a path
+        such as 'transaction/security' for deeper dicts, None for the json
+        itself.
+        @param obj - the object to set the attributes of, e.g. a Quote
+        @param json - the item of the json response
+        @param sections - the field table
+    """
+    for section, fields in sections:
+        data = json
+        if section is not None:
+            for key in section.split('/'):
+                data = data.get(key) or {}
+        for key, attr in fields:
+            if key in data:
+                setattr(obj, attr, data[key])
+
+
+def element_to_json(element, sections):
+    """Returns the fields of an xml element in the shape of the json
+        response, so from_json() methods built by compile_from_json() read
+        both formats with the same field table. Only the sections of the
+        table are converted.
+        @param element - the item Element, e.g. a quote or holding
+        @param sections - the field table
+    """
+    json = {child.tag: child.text for child in element}
+    for section, fields in sections:
+        if section is None:
+            continue
+        *parents, key = section.split('/')
+        data = json
+        for parent in parents:
+            data = data.get(parent) or {}
+        child = element.find(section)
+        data[key] = None if child is None else {c.tag: c.text for c in child}
+    return json
@@ -1,57 +1,102 @@
+from .fields import element_to_json
+
 class Holding():
+    # Holding fields as (section, ((response key, attribute name), ...)). The
+    # section is the nested dict of the holding the keys are read from, None
+    # for the holding itself. from_json() reads the same fields.
+    FIELDS = (
+        (None, (
+            ('accounttype', 'accounttype'),
+            ('assetclass', 'assetclass'),
+            ('cfi', 'cfi'),
+            ('costbasis', 'costbasis'),
+            ('gainloss', 'gainloss'),
+            ('marketvalue', 'marketvalue'),
+            ('marketvaluechange', 'marketvaluechange'),
+            ('mmy', 'mmy'),
+            ('mult', 'mult'),
+            ('price', 'price'),
+            ('purchaseprice', 'purchaseprice'),
+            ('qty', 'qty'),
+            ('totalsecurities', 'totalsecurities'),
+        )),
+        ('quote', (
+            ('change', 'change'),
+            ('lastprice', 'lastprice'),
+        )),
+        ('instrument', (
+            ('cusip', 'cusip'),
+            ('desc', 'desc'),
+            ('factor', 'factor'),
+            ('matdt', 'matdt'),     # simplex options use matdt
+            ('mat', 'matdt'),       # multilegs use mat
+            ('putcall', 'putcall'),
+            ('sectyp', 'sectyp'),
+            ('strkpx', 'strkpx'),
+            ('sym', 'sym'),
+        )),
+    )
+
     def __init__(self):
         pass
 
     def from_xml(self, xml):
-        pass
+        """Sets an attribute for every field of a holding element and its
+            quote and instrument elements. Fields missing from the response
+            are left unset.
+            @param self - the object pointer
+            @param xml - the holding Element of the response
+        """
+        self.from_json(element_to_json(xml, self.FIELDS))
 
     def from_json(self, json):
-        # Feeling thankful for Notepad++ macros...
+        quote = json.get('quote') or {}
+        instrument = json.get('instrument') or {}
         if 'accounttype' in json:
-        	self.accounttype = json['accounttype']
+            self.accounttype = json['accounttype']
         if 'assetclass' in json:
-        	self.assetclass = json['assetclass']
+            self.assetclass = json['assetclass']
         if 'cfi' in json:
-        	self.cfi = json['cfi']
-        if 'change' in json['quote']:
-        	self.change = json['quote']['change']
+            self.cfi = json['cfi']
+        if 'change' in quote:
+            self.change = quote['change']
         if 'costbasis' in json:
-        	self.costbasis = json['costbasis']
-        if 'cusip' in json['instrument']:
-        	self.cusip = json['instrument']['cusip']
-        if 'desc' in json['instrument']:
-        	self.desc = json['instrument']['desc']
-        if 'factor' in json['instrument']:
-        	self.factor = json['instrument']['factor']
+            self.costbasis = json['costbasis']
+        if 'cusip' in instrument:
+            self.cusip = instrument['cusip']
+        if 'desc' in instrument:
+            self.desc = instrument['desc']
+        if 'factor' in instrument:
+            self.factor = instrument['factor']
         if 'gainloss' in json:
-        	self.gainloss = json['gainloss']
-        if 'lastprice' in json['quote']:
-        	self.lastprice = json['quote']['lastprice']
+            self.gainloss = json['gainloss']
+        if 'lastprice' in quote:
+            self.lastprice = quote['lastprice']
         if 'marketvalue' in json:
-        	self.marketvalue = json['marketvalue']
+            self.marketvalue = json['marketvalue']
         if 'marketvaluechange' in json:
-        	self.marketvaluechange = json['marketvaluechange']
-        if 'matdt' in json['instrument']:   # simplex options use matdt
-        	self.matdt = json['instrument']['matdt']
-        if 'mat' in json['instrument']:     # multilegs use mat
-        	self.matdt = json['instrument']['mat']
+            self.marketvaluechange = json['marketvaluechange']
+        if 'matdt' in instrument:   # simplex options use matdt
+            self.matdt = instrument['matdt']
+        if 'mat' in instrument:     # multilegs use mat
+            self.matdt = instrument['mat']
         if 'mmy' in json:
-        	self.mmy = json['mmy']
+            self.mmy = json['mmy']
         if 'mult' in json:
-        	self.mult = json['mult']
+            self.mult = json['mult']
         if 'price' in json:
-        	self.price = json['price']
+            self.price = json['price']
         if 'purchaseprice' in json:
-        	self.purchaseprice = json['purchaseprice']
-        if 'putcall' in json['instrument']:
-        	self.putcall = json['instrument']['putcall']
+            self.purchaseprice = json['purchaseprice']
+        if 'putcall' in instrument:
+            self.putcall = instrument['putcall']
         if 'qty' in json:
-        	self.qty = json['qty']
-        if 'sectyp' in json['instrument']:
-        	self.sectyp = json['instrument']['sectyp']
-        if 'strkpx' in json['instrument']:
-        	self.strkpx = json['instrument']['strkpx']
-        if 'sym' in json['instrument']:
-        	self.sym = json['instrument']['sym']
+            self.qty = json['qty']
+        if 'sectyp' in instrument:
+            self.sectyp = instrument['sectyp']
+        if 'strkpx' in instrument:
+            self.strkpx = instrument['strkpx']
+        if 'sym' in instrument:
+            self.sym = instrument['sym']
         if 'totalsecurities' in json:
-        	self.totalsecurities = json['totalsecurities']
+            self.totalsecurities = json['totalsecurities']
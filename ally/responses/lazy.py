@@ -0,0 +1,160 @@
+"""@package lazy
+    Lazily decoded response items.
+
+    In lazy mode json QuotesResponse, AccountHoldingsResponse and OrdersResponse
+    keep the decoded payload and wrap it in a LazyList. The Quote, Holding and
+    Order views are only built when an item is first accessed, and each view
+    only reads a field from the payload when that attribute is read. Callers
+    polling a large universe but reading a handful of fields skip most of the
+    parsing work and memory.
+
+    Attribute names and values are the same as those of the eager objects
+    (strings, as sent by Ally); number() returns a field as a float and
+    caches the conversion. Like every response, lazy responses share the
+    payload they were given, so it should not be modified afterwards; it is
+    kept even when keep_raw is False since the views read from it.
+"""
+
+from xml.etree import ElementTree
+
+from .quote import Quote
+from .holding import Holding
+from .order import Order
+from .quote_batch import to_float
+
+
+class LazyList:
+    """A read-only list building its items on first access."""
+    def __init__(self, items, factory):
+        """LazyList constructor.
+            @param self - the object pointer
+            @param items - the raw items of the payload
+            @param factory - callable building an item from a raw item
+        """
+        self.items = items
+        self.factory = factory
+        self.built = [None] * len(items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.items)))]
+        item = self.built[index]
+        if item is None:
+            item = self.built[index] = self.factory(self.items[index])
+        return item
+
+    def __iter__(self):
+        for i in range(len(self.items)):
+            yield self[i]
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+class LazyItem:
+    """Base class of the lazy views. Subclasses set FIELDS, a dict of
+        attribute name -> (section, response key), where section is the nested
+        dict holding the key, None for the item itself.
+    """
+    __slots__ = ('_data', '_numbers')
+
+    FIELDS = {}
+
+    def __init__(self, data):
+        self._data = data
+        self._numbers = None
+
+    def _source(self):
+        """Returns the dict the sections are looked up in."""
+        return self._data
+
+    def __getattr__(self, name):
+        field = type(self).FIELDS.get(name)
+        if field is None:
+            raise AttributeError(name)
+        section, key = field
+        data = self._source()
+        if section is not None:
+            data = data.get(section) if data else None
+        if not data or key not in data:
+            return self._missing(name)
+        return data[key]
+
+    def _missing(self, name):
+        raise AttributeError(name)
+
+    def number(self, name):
+        """Returns a field as a float, NaN if it is missing or not a number.
+            The conversion is cached.
+            @param self - the object pointer
+            @param name - attribute name, e.g. 'last'
+        """
+        numbers = self._numbers
+        if numbers is None:
+            numbers = self._numbers = {}
+        value = numbers.get(name)
+        if value is None:
+            try:
+                raw = getattr(self, name)
+            except AttributeError:
+                raw = None
+            value = numbers[name] = to_float(raw)
+        return value
+
+
+class LazyQuote(LazyItem):
+    """A Quote decoding its fields on access."""
+    __slots__ = ()
+
+    FIELDS = {attr: (None, key) for key, attr in Quote.FIELDS}
+
+
+class LazyHolding(LazyItem):
+    """A Holding decoding its fields on access."""
+    __slots__ = ()
+
+    FIELDS = {}
+    for section, fields in Holding.FIELDS:
+        for key, attr in fields:
+            FIELDS.setdefault(attr, (section, key))
+    del section, fields, key, attr
+
+    def __getattr__(self, name):
+        if name == 'matdt':
+            # Multilegs use mat, simplex options matdt.
+            instrument = self._data.get('instrument') or {}
+            if 'mat' in instrument:
+                return instrument['mat']
+        return LazyItem.__getattr__(self, name)
+
+
+class LazyOrder(LazyItem):
+    """An Order decoding its FIXML execution report on access. When the
+        FIXML message was not expanded it is parsed on first access.
+    """
+    __slots__ = ('_exec_rpt',)
+
+    FIELDS = {attr: (section, key) for section, fields in Order.FIELDS
+              for key, attr in fields}
+
+    def __init__(self, data):
+        LazyItem.__init__(self, data)
+        self._exec_rpt = None
+
+    def _source(self):
+        exec_rpt = self._exec_rpt
+        if exec_rpt is None:
+            fixml = self._data.get('FIXML')
+            if fixml is None and self._data.get('fixmlmessage'):
+                from ..fixml import fixml_to_dict
+                fixml = fixml_to_dict(ElementTree.fromstring(
+                    self._data['fixmlmessage']))['FIXML']
+            exec_rpt = self._exec_rpt = (fixml or {}).get('ExecRpt') or {}
+        return exec_rpt
+
+    def _missing(self, name):
+        # Order.from_json sets every field, None when it is not in the report.
+        return None
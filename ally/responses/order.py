@@ -5,6 +5,37 @@ def get_class_vars(class_type):
             not k.startswith('_')]
 
 class Order():
+    # Execution report fields as (section, ((FIXML attribute, attribute name), ...)).
+    # The section is the child element of ExecRpt holding the attributes, None
+    # for ExecRpt itself.
+    FIELDS = (
+        (None, (
+            ('@OrdID', 'ord_id'),
+            ('@ID', 'id'),
+            ('@Stat', 'stat'),
+            ('@Acct', 'acct'),
+            ('@AcctTyp', 'acct_typ'),
+            ('@Side', 'side'),
+            ('@Typ', 'typ'),
+            ('@Px', 'px'),
+            ('@TmInForce', 'tm_in_force'),
+            ('@LeavesQty', 'leaves_qty'),
+            ('@TrdDt', 'trd_dt'),
+            ('@TxnTm', 'txn_tm'),
+        )),
+        ('Instrmt', (
+            ('@Sym', 'sym'),
+            ('@SecTyp', 'sec_typ'),
+            ('@Desc', 'desc'),
+        )),
+        ('OrdQty', (
+            ('@Qty', 'qty'),
+        )),
+        ('Comm', (
+            ('@Comm', 'comm'),
+        )),
+    )
+
     def __init__(self, **data):
         # From Request Object.
         self.acct = data.get('acct')
@@ -45,111 +76,46 @@ class Order():
         self.mmy = data.get('mmy')
 
     def validate(self):
-        """Verify all required information is in the order.
+        """Verify all required information is in the order. Raises an
+            OrderValidationError listing every invalid field.
         """
-        # Account must exist.
-        assert self.acct
-        # Symbol must exist.
-        assert self.sym
-        # Quantity must exist and be an integer greater than zero.
-        # Partials are sold when # shares held is less than one.
-        assert int(self.qty) > 0
-        # Order type must exist and be in ORDER_TYPE.
-        assert self.typ
-        assert self.typ in get_class_vars(ORDER_TYPE)
-        # Side must exist and be in SIDE.
-        assert self.side
-        assert self.side in get_class_vars(SIDE)
-        # Security type must exist and be in SECURITY_TYPE.
-        assert self.sec_typ
-        assert self.sec_typ in get_class_vars(SECURITY_TYPE)
-
-        # If Account Type is used, it must be in ACCOUNT_TYPE.
-        if self.acct_typ:
-            assert self.acct_type in get_class_vars(ACCOUNT_TYPE)
-
-        if self.typ != ORDER_TYPE.MARKET:
-            # Time in Force must exist and be in TIME_IN_FORCE.
-            assert self.tm_in_force
-            assert self.tm_in_force in get_class_vars(TIME_IN_FORCE)
-        if self.typ in [ORDER_TYPE.LIMIT, ORDER_TYPE.STOP_LIMIT]:
-            # Price must exist and be a float greater than zero.
-            assert self.px
-            assert float(self.px) > 0.0
-
-        if self.sec_typ == SECURITY_TYPE.OPTION:
-            # Position must exist and be in OPTION_POSITION.
-            assert self.pos_efct
-            assert self.pos_efct in get_class_vars(OPTION_POSITION)
-            # Strike Price must exist & be a float greater than zero.
-            assert self.strk_px
-            assert float(self.strk_px) > 0.0
-            # CFI must exist and be in OPTION_CLASS.
-            assert self.cfi
-            assert self.cfi in get_class_vars(OPTION_CLASS)
-            # Date of Maturity must exist.
-            assert self.mat_dt
-            # Option Expiration must exist.
-            assert self.mmy
-
+        errors = VALIDATOR.check(self)
+        if errors:
+            raise OrderValidationError(errors)
         return True
 
     def from_xml(self, xml):
+        """Reads the order from an order element, either with the expanded
+            FIXML (see convert_fixml_xml) or with only the fixmlmessage text.
+            @param self - the object pointer
+            @param xml - the order Element of the response
+        """
         nsp = {'': 'http://www.fixprotocol.org/FIXML-5-0-SP2'}
-        exec_rpt = xml.find('FIXML', nsp).find('ExecRpt', nsp)
-        if not exec_rpt:
+        fixml = xml.find('FIXML', nsp)
+        if fixml is None:
+            message = xml.findtext('fixmlmessage')
+            if not message:
+              return
+            fixml = ElementTree.fromstring(message)
+        exec_rpt = fixml.find('ExecRpt', nsp)
+        if exec_rpt is None:
           return
-        self.ord_id = exec_rpt.attrib.get('OrdID')
-        self.id = exec_rpt.attrib.get('ID')
-        self.stat = exec_rpt.attrib.get('Stat')
-        self.acct = exec_rpt.attrib.get('Acct')
-        self.acct_typ = exec_rpt.attrib.get('AcctTyp')
-        self.side = exec_rpt.attrib.get('Side')
-        self.typ = exec_rpt.attrib.get('Typ')
-        self.px = exec_rpt.attrib.get('Px')
-        self.tm_in_force = exec_rpt.attrib.get('TmInForce')
-        self.leaves_qty = exec_rpt.attrib.get('LeavesQty')
-        self.trd_dt = exec_rpt.attrib.get('TrdDt')
-        self.txn_tm = exec_rpt.attrib.get('TxnTm')
-        instrmt = exec_rpt.find('Instrmt', nsp)
-        if instrmt:
-            self.sym = instrmt.attrib.get('Sym')
-            self.sec_typ = instrmt.attrib.get('SecTyp')
-            self.desc = instrmt.attrib.get('Desc')
-        ordqty = exec_rpt.find('OrdQty', nsp)
-        if ordqty:
-            self.qty = ordqty.attrib.get('Qty')
-        comm = exec_rpt.find('Comm', nsp)
-        if comm:
-            self.comm = comm.attrib.get('Comm')
+        for section, fields in self.FIELDS:
+            data = exec_rpt if section is None else exec_rpt.find(section, nsp)
+            if data is not None:
+                for key, attr in fields:
+                    # FIELDS holds the json keys, '@' + attribute name.
+                    setattr(self, attr, data.attrib.get(key[1:]))
 
     def from_json(self, json):
         exec_rpt = json.get('FIXML', {}).get('ExecRpt')
         if not exec_rpt:
           return
-        self.ord_id = exec_rpt.get('@OrdID')
-        self.id = exec_rpt.get('@ID')
-        self.stat = exec_rpt.get('@Stat')
-        self.acct = exec_rpt.get('@Acct')
-        self.acct_typ = exec_rpt.get('@AcctTyp')
-        self.side = exec_rpt.get('@Side')
-        self.typ = exec_rpt.get('@Typ')
-        self.px = exec_rpt.get('@Px')
-        self.tm_in_force = exec_rpt.get('@TmInForce')
-        self.leaves_qty = exec_rpt.get('@LeavesQty')
-        self.trd_dt = exec_rpt.get('@TrdDt')
-        self.txn_tm = exec_rpt.get('@TxnTm')
-        instrmt = exec_rpt.get('Instrmt')
-        if instrmt:
-            self.sym = instrmt.get('@Sym')
-            self.sec_typ = instrmt.get('@SecTyp')
-            self.desc = instrmt.get('@Desc')
-        ordqty = exec_rpt.get('OrdQty')
-        if ordqty:
-            self.qty = ordqty.get('@Qty')
-        comm = exec_rpt.get('Comm')
-        if comm:
-            self.comm = comm.get('@Comm')
+        for section, fields in self.FIELDS:
+            data = exec_rpt if section is None else exec_rpt.get(section)
+            if data:
+                for key, attr in fields:
+                    setattr(self, attr, data.get(key))
 
     def to_fixml(self, cancel=False):
         """Convert the contents of the order to FIXML.
@@ -196,6 +162,25 @@ class Order():
 
         return base_xml
 
+def get_multileg_fields(orders, validate=True):
+    """Validates the legs of a multi-leg order and returns the fields they
+        must share (ord_id, typ, tm_in_force, px, acct and sym).
+        @param orders - A list of the orders.
+        @param validate - validate the legs, False if they already were
+    """
+    if validate:
+        errors = VALIDATOR.check_multileg(orders)
+        if errors:
+            raise OrderValidationError(errors)
+    first = orders[0]
+    return dict(ord_id=first.ord_id,
+                typ=first.typ,
+                tm_in_force=first.tm_in_force,
+                px=first.px,
+                acct=first.acct,
+                sym=first.sym,
+               )
+
 def get_multileg_fixml(orders, cancel=False):
     """Create FIXML for a multi-leg option chain using multiple orders.
         @param orders - A list of the orders.
@@ -203,24 +188,7 @@ def get_multileg_fixml(orders, cancel=False):
     """
     if not orders:
         return None
-    # Validate all the orders have the same basic info.
-    orders[0].validate()
-    chk_dict = dict(ord_id=orders[0].ord_id,
-                    typ=orders[0].typ,
-                    tm_in_force=orders[0].tm_in_force,
-                    px=orders[0].px,
-                    acct=orders[0].acct,
-                    sym=orders[0].sym,
-                   )
-    for order in orders[1:]:
-        # Along with validation, all basic data must match.
-        order.validate()
-        assert order.ord_id == chk_dict['ord_id']
-        assert order.typ == chk_dict['typ']
-        assert order.tm_in_force == chk_dict['tm_in_force']
-        assert order.px == chk_dict['px']
-        assert order.acct == chk_dict['acct']
-        assert order.sym == chk_dict['sym']
+    chk_dict = get_multileg_fields(orders)
 
     # Set the Namespace and base tag name.
     nsp = {'xmlns': 'http://www.fixprotocol.org/FIXML-5-0-SP2'}
@@ -241,7 +209,7 @@ def get_multileg_fixml(orders, cancel=False):
     if chk_dict['ord_id'] and cancel:
         # For a cancel, the FIXML is much simpler.
         instrmt = ElementTree.SubElement(mleg, 'Instrmt')
-        instrmt.set('SecTyp', SECURITY_TYPE.MLEG)
+        instrmt.set('SecTyp', SECURITY_TYPE.MULTI_LEG)
         instrmt.set('Sym', chk_dict['sym'])
     else:
         # For all others, fill in the rest of the info for each leg.
@@ -296,3 +264,190 @@ class OPTION_POSITION:
 class OPTION_CLASS:
     CALL = "OC"
     PUT = "OP"
+
+
+class OrderError:
+    """A field of an order failing validation."""
+    __slots__ = ('index', 'leg', 'field', 'message')
+
+    def __init__(self, field, message, index=None, leg=None):
+        """OrderError constructor.
+            @param self - the object pointer
+            @param field - name of the Order attribute, e.g. 'px'
+            @param message - what is wrong with it
+            @param index - position of the order in the validated list
+            @param leg - position of the leg in a multi-leg order
+        """
+        self.index = index
+        self.leg = leg
+        self.field = field
+        self.message = message
+
+    def __repr__(self):
+        return "OrderError(index={!r}, leg={!r}, field={!r}, message={!r})".format(
+            self.index, self.leg, self.field, self.message)
+
+    def __str__(self):
+        where = []
+        if self.index is not None:
+            where.append("order {}".format(self.index))
+        if self.leg is not None:
+            where.append("leg {}".format(self.leg))
+        prefix = ", ".join(where) + ": " if where else ""
+        return "{}{}: {}".format(prefix, self.field, self.message)
+
+
+class OrderValidationError(ValueError):
+    """Raised for invalid orders, with the OrderError of every invalid field
+        in errors.
+    """
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(str(error) for error in errors))
+
+
+class OrderValidator:
+    """Checks orders against the enumerations, precomputed as sets.
+
+        Problems are returned as OrderError objects rather than raised, so a
+        whole basket can be checked in one pass, and the checks do not rely
+        on assert, so they also run under python -O.
+    """
+    ORDER_TYPES = frozenset(get_class_vars(ORDER_TYPE))
+    SIDES = frozenset(get_class_vars(SIDE))
+    SECURITY_TYPES = frozenset(get_class_vars(SECURITY_TYPE))
+    ACCOUNT_TYPES = frozenset(get_class_vars(ACCOUNT_TYPE))
+    TIMES_IN_FORCE = frozenset(get_class_vars(TIME_IN_FORCE))
+    OPTION_POSITIONS = frozenset(get_class_vars(OPTION_POSITION))
+    OPTION_CLASSES = frozenset(get_class_vars(OPTION_CLASS))
+    PRICED_TYPES = frozenset((ORDER_TYPE.LIMIT, ORDER_TYPE.STOP_LIMIT))
+
+    # Fields all the legs of a multi-leg order must share.
+    MULTILEG_FIELDS = ('ord_id', 'typ', 'tm_in_force', 'px', 'acct', 'sym')
+
+    def check(self, order, index=None, leg=None):
+        """Returns the list of OrderErrors of an order, empty if it is valid.
+            @param self - the object pointer
+            @param order - the Order
+            @param index - position of the order, set on the errors
+            @param leg - position of the leg, set on the errors
+        """
+        errors = []
+
+        def error(field, message):
+            errors.append(OrderError(field, message, index, leg))
+
+        # Account and symbol must exist.
+        if not order.acct:
+            error('acct', 'missing')
+        if not order.sym:
+            error('sym', 'missing')
+        # Quantity must exist and be an integer greater than zero.
+        # Partials are sold when # shares held is less than one.
+        qty = getattr(order, 'qty', None)
+        if not positive(qty, int):
+            error('qty', 'must be an integer greater than zero, got {!r}'.format(qty))
+        # Order type, side and security type must be in their enumerations.
+        typ = order.typ
+        if typ not in self.ORDER_TYPES:
+            error('typ', 'not an ORDER_TYPE: {!r}'.format(typ))
+        if order.side not in self.SIDES:
+            error('side', 'not a SIDE: {!r}'.format(order.side))
+        if order.sec_typ not in self.SECURITY_TYPES:
+            error('sec_typ', 'not a SECURITY_TYPE: {!r}'.format(order.sec_typ))
+
+        # If Account Type is used, it must be in ACCOUNT_TYPE.
+        if order.acct_typ and order.acct_typ not in self.ACCOUNT_TYPES:
+            error('acct_typ', 'not an ACCOUNT_TYPE: {!r}'.format(order.acct_typ))
+
+        if typ != ORDER_TYPE.MARKET and order.tm_in_force not in self.TIMES_IN_FORCE:
+            error('tm_in_force', 'not a TIME_IN_FORCE: {!r}'.format(order.tm_in_force))
+        if typ in self.PRICED_TYPES and not positive(order.px, float):
+            error('px', 'must be a price greater than zero, got {!r}'.format(order.px))
+
+        if order.sec_typ == SECURITY_TYPE.OPTION:
+            if order.pos_efct not in self.OPTION_POSITIONS:
+                error('pos_efct', 'not an OPTION_POSITION: {!r}'.format(order.pos_efct))
+            if not positive(order.strk_px, float):
+                error('strk_px', 'must be a price greater than zero, got {!r}'.format(
+                    order.strk_px))
+            if order.cfi not in self.OPTION_CLASSES:
+                error('cfi', 'not an OPTION_CLASS: {!r}'.format(order.cfi))
+            # Date of Maturity and Option Expiration must exist.
+            if not order.mat_dt:
+                error('mat_dt', 'missing')
+            if not order.mmy:
+                error('mmy', 'missing')
+        return errors
+
+    def check_multileg(self, orders, index=None):
+        """Returns the list of OrderErrors of the legs of a multi-leg order,
+            including the shared fields that differ from the first leg.
+            @param self - the object pointer
+            @param orders - A list of the orders, one per leg.
+            @param index - position of the multi-leg order, set on the errors
+        """
+        errors = []
+        first = orders[0]
+        for leg, order in enumerate(orders):
+            errors.extend(self.check(order, index, leg))
+            if leg:
+                for field in self.MULTILEG_FIELDS:
+                    if getattr(order, field) != getattr(first, field):
+                        errors.append(OrderError(field, 'differs from the first leg', index, leg))
+        return errors
+
+    def validate(self, orders):
+        """Returns the list of OrderErrors of a list of orders, empty if they
+            are all valid. Each error's index is the position of its order.
+            @param self - the object pointer
+            @param orders - list of Order objects, or lists of Order objects for
+                multi-leg orders
+        """
+        errors = []
+        check = self.check
+        for index, order in enumerate(orders):
+            if isinstance(order, list):
+                if order:
+                    errors.extend(self.check_multileg(order, index))
+                else:
+                    errors.append(OrderError('legs', 'no legs', index))
+            else:
+                found = check(order, index)
+                if found:
+                    errors.extend(found)
+        return errors
+
+
+def positive(value, convert):
+    """Returns True if a value converts to a number greater than zero.
+        @param value - the field value
+        @param convert - int or float
+    """
+    try:
+        return bool(value) and convert(value) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+VALIDATOR = OrderValidator()
+
+
+def validate_orders(orders):
+    """Returns the OrderErrors of a list of orders, empty if they are all
+        valid.
+        @param orders - list of Order objects, or lists of Order objects for
+            multi-leg orders
+    """
+    return VALIDATOR.validate(orders)
+
+
+def check_orders(orders):
+    """Raises an OrderValidationError listing every invalid field of a list
+        of orders.
+        @param orders - list of Order objects, or lists of Order objects for
+            multi-leg orders
+    """
+    errors = VALIDATOR.validate(orders)
+    if errors:
+        raise OrderValidationError(errors)
@@ -1,26 +1,44 @@
 from .response import *
 from .order import *
+from .lazy import LazyList, LazyOrder
 
 class OrdersResponse(Response):
-    def __init__(self, account_id, response_format, data):
-        super().__init__(response_format, data)
+    def __init__(self, account_id, response_format, data, lazy=False, keep_raw=True,
+                 json_decoder=None):
+        """OrdersResponse constructor.
+            @param self - the object pointer
+            @param account_id - account number
+            @param response_format - 'json' or 'xml'
+            @param data - decoded payload, or the response body as bytes or str
+            @param lazy - wrap the orders in LazyOrder views decoded on access;
+                json only, raises ValueError for xml
+            @param keep_raw - keep raw_data after parsing
+            @param json_decoder - decodes a json response body, None for the
+                fastest installed backend
+        """
+        self.check_lazy(response_format, lazy)
+        super().__init__(response_format, data, keep_raw, json_decoder)
+        self.lazy = lazy
         self.account_id = account_id
         self.orders = []
         if response_format.lower() == 'xml':
-            self.__parse_xml(data)
+            self.__parse_xml(self.payload)
         elif response_format.lower() == 'json':
-            self.__parse_json(data)
+            self.__parse_json(self.payload)
+        self.release(views=not lazy)
 
     def __parse_xml(self, data):
-        super().parse_xml(data)
-        for order_xml in self.xml.find('orderstatus').findall('order'):
-            order = Order()
-            order.from_xml(order_xml)
-            self.orders.append(order)
+        self.orders = super().parse_xml_items(data, 'orderstatus', 'order', Order)
 
     def __parse_json(self, data):
         super().parse_json(data)
-        for order_json in self.json['orderstatus']['order']:
+        # Ally sends a single order as an object rather than a list.
+        orders = self.json['orderstatus']['order'] or []
+        orders = orders if isinstance(orders, list) else [orders]
+        if self.lazy:
+            self.orders = LazyList(orders, LazyOrder)
+            return
+        for order_json in orders:
             order = Order()
             order.from_json(order_json)
             self.orders.append(order)
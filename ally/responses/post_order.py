@@ -1,13 +1,14 @@
 from .response import *
 
 class PostOrderResponse(Response):
-    def __init__(self, account_id, response_format, data):
-        super().__init__(response_format, data)
+    def __init__(self, account_id, response_format, data, keep_raw=True, json_decoder=None):
+        super().__init__(response_format, data, keep_raw, json_decoder)
         self.account_id = account_id
         if response_format.lower() == 'xml':
-            self.__parse_xml(data)
+            self.__parse_xml(self.payload)
         elif response_format.lower() == 'json':
-            self.__parse_json(data)
+            self.__parse_json(self.payload)
+        self.release()
 
     def __parse_xml(self, data):
         super().parse_xml(data)
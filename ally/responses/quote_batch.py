@@ -0,0 +1,177 @@
+"""@package quote_batch
+    A columnar view of many quotes.
+
+    Ally returns every quote field as a string. QuoteBatch converts each
+    numeric field once into a NumPy float64 array (NaN where a quote does not
+    have the field or Ally sends 'na'), so screening and spread math can run
+    vectorized over thousands of quotes:
+
+        batch = QuotesResponse('json', data).get_quote_batch()
+        spread = batch.ask - batch.bid
+        liquid = batch.symbol[batch.vl > 1e6]
+
+    Counts such as vl and openinterest are float64 too, so they can hold NaN.
+    String fields are object arrays of interned strings, None where missing.
+
+    Requires numpy (pip install AllyInvestPy[numpy]).
+"""
+
+from operator import itemgetter
+import sys
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .quote import Quote
+
+
+def to_float(value):
+    """Converts an Ally number to float, NaN if it is missing or 'na'.
+        Handles percentages ('-0.08 %') and thousands separators ('17,001,802,000').
+        @param value - the field value
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    if isinstance(value, str):
+        try:
+            return float(value.replace(",", "").rstrip("% "))
+        except ValueError:
+            pass
+    return float("nan")
+
+
+# Values Ally sends for missing numbers.
+MISSING = {None: 'nan', '': 'nan', 'na': 'nan', 'NA': 'nan'}
+
+
+def to_float_array(values):
+    """Converts a sequence of Ally numbers to a float64 array, NaN where
+        missing.
+        @param values - sequence of field values
+    """
+    try:
+        return numpy.fromiter(map(float, map(MISSING.get, values, values)),
+                              dtype=numpy.float64, count=len(values))
+    except (TypeError, ValueError):
+        # Percentages, thousands separators or unexpected values.
+        return numpy.fromiter(map(to_float, values), dtype=numpy.float64,
+                              count=len(values))
+
+
+def to_string_array(values):
+    """Converts a sequence of Ally strings to an object array of interned
+        strings, None where missing.
+        @param values - sequence of field values
+    """
+    intern = sys.intern
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = [intern(value) if value.__class__ is str and value != 'na' else None
+                for value in values]
+    return array
+
+
+def get_columns(quotes, keys):
+    """Returns one tuple of values per key, None where a quote lacks the key.
+        @param quotes - list of quote dicts
+        @param keys - response keys
+    """
+    if not quotes:
+        return [()] * len(keys)
+    getter = itemgetter(*keys)
+    try:
+        rows = list(map(getter, quotes))
+    except KeyError:
+        rows = [tuple(map(quote.get, keys)) for quote in quotes]
+    return list(zip(*rows))
+
+
+class QuoteBatch:
+    """One column per quote field for a list of quotes."""
+
+    # Numeric columns as (response key, column name).
+    NUMERIC_FIELDS = tuple((key, key) for key in (
+        'adp_100', 'adp_200', 'adp_50', 'adv_21', 'adv_30', 'adv_90', 'ask', 'asksz',
+        'beta', 'bid', 'bidsz', 'chg', 'cl', 'contract_size', 'days_to_expiration', 'div',
+        'dollar_value', 'eps', 'hi', 'iad', 'idelta', 'igamma', 'imp_volatility',
+        'incr_vl', 'irho', 'itheta', 'ivega', 'last', 'lo', 'openinterest', 'opn',
+        'opt_val', 'pchg', 'pcls', 'pe', 'phi', 'plo', 'popn', 'pr_adp_100', 'pr_adp_200',
+        'pr_adp_50', 'pr_openinterest', 'prbook', 'prchg', 'prem_mult', 'pvol', 'sho',
+        'strikeprice', 'timestamp', 'tr_num', 'vl', 'volatility12', 'vwap', 'wk52hi',
+        'wk52lo', 'xday', 'xmonth', 'xyear',
+    )) + (
+        ('yield', 'yld'),
+    )
+
+    # String columns as (response key, column name).
+    STRING_FIELDS = tuple((key, key) for key in (
+        'symbol', 'exch', 'exch_desc', 'name', 'put_call', 'rootsymbol', 'undersymbol',
+        'date', 'datetime', 'xdate',
+    ))
+
+    def __init__(self, quotes):
+        """QuoteBatch constructor.
+            @param self - the object pointer
+            @param quotes - list of quote dicts from a json response, or of
+                Quote or LazyQuote objects
+        """
+        if numpy is None:
+            raise ImportError("QuoteBatch requires numpy: pip install numpy")
+        # Quote objects are read through the attribute names of Quote, which
+        # LazyQuote shares.
+        quotes = [quote if isinstance(quote, dict) else
+                  {key: getattr(quote, attr) for key, attr in Quote.FIELDS if hasattr(quote, attr)}
+                  for quote in quotes]
+        self.size = len(quotes)
+        self.columns = {}
+        fields = self.NUMERIC_FIELDS
+        for (key, column), values in zip(fields, get_columns(quotes, [k for k, c in fields])):
+            self.columns[column] = to_float_array(values)
+        fields = self.STRING_FIELDS
+        for (key, column), values in zip(fields, get_columns(quotes, [k for k, c in fields])):
+            self.columns[column] = to_string_array(values)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __getattr__(self, column):
+        try:
+            return self.__dict__["columns"][column]
+        except KeyError:
+            raise AttributeError(column)
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    def index(self, symbol):
+        """Returns the row of a symbol.
+            @param self - the object pointer
+            @param symbol - ticker or option symbol
+        """
+        matches = numpy.flatnonzero(self.columns["symbol"] == symbol)
+        if not len(matches):
+            raise KeyError(symbol)
+        return int(matches[0])
+
+    def select(self, mask):
+        """Returns a new QuoteBatch with the rows selected by a boolean mask or
+            an index array, e.g. batch.select(batch.vl > 1e6).
+            @param self - the object pointer
+            @param mask - boolean mask or array of row numbers
+        """
+        batch = QuoteBatch.__new__(QuoteBatch)
+        batch.columns = {name: values[mask] for name, values in self.columns.items()}
+        batch.size = len(batch.columns["symbol"])
+        return batch
+
+    def to_dict(self):
+        """Returns the columns as a dict of arrays, e.g. for pandas.DataFrame.
+            @param self - the object pointer
+        """
+        return dict(self.columns)
@@ -1,20 +1,40 @@
 from .response import *
 from .quote import *
+from .quote_batch import QuoteBatch
+from .lazy import LazyList, LazyQuote
 
 class QuotesResponse(Response):
-    def __init__(self, response_format, data):
-        super().__init__(response_format, data)
+    def __init__(self, response_format, data, lazy=False, keep_raw=True, json_decoder=None):
+        """QuotesResponse constructor.
+            @param self - the object pointer
+            @param response_format - 'json' or 'xml'
+            @param data - decoded payload, or the response body as bytes or str
+            @param lazy - wrap the quotes in LazyQuote views decoded on access;
+                json only, raises ValueError for xml
+            @param keep_raw - keep raw_data after parsing
+            @param json_decoder - decodes a json response body, None for the
+                fastest installed backend
+        """
+        self.check_lazy(response_format, lazy)
+        super().__init__(response_format, data, keep_raw, json_decoder)
+        self.lazy = lazy
         self.quotes = []
+        self.quote_batch = None
         if response_format.lower() == 'xml':
-            self.__parse_xml(data)
+            self.__parse_xml(self.payload)
         elif response_format.lower() == 'json':
-            self.__parse_json(data)
+            self.__parse_json(self.payload)
+        self.release(views=not lazy)
 
     def __parse_xml(self, data):
-        pass
+        self.quotes = super().parse_xml_items(data, 'quotes', 'quote', Quote)
 
     def __parse_json(self, data):
         super().parse_json(data)
+        if self.lazy:
+            quotes = self.json['quotes']['quote']
+            self.quotes = LazyList(quotes if isinstance(quotes, list) else [quotes], LazyQuote)
+            return
         if isinstance(self.json['quotes']['quote'], list):
             for quote_json in self.json['quotes']['quote']:
                 quote = Quote()
@@ -27,3 +47,16 @@ class QuotesResponse(Response):
 
     def get_quotes(self):
         return self.quotes
+
+    def get_quote_batch(self):
+        """Returns the quotes as a columnar QuoteBatch of NumPy arrays.
+            Requires numpy.
+            @param self - the object pointer
+        """
+        if self.quote_batch is None:
+            if self.response_format.lower() == 'json' and self.json is not None:
+                quotes = self.json['quotes']['quote']
+                self.quote_batch = QuoteBatch(quotes if isinstance(quotes, list) else [quotes])
+            else:
+                self.quote_batch = QuoteBatch(self.quotes)
+        return self.quote_batch
@@ -1,17 +1,112 @@
-import json
+from xml.etree import ElementTree
+from ..json_decoder import get_decoder, loads
+
+from .xml_items import XMLItemParser
 
 class Response():
-    def __init__(self, response_format, data):
+    def __init__(self, response_format, data, keep_raw=True, json_decoder=None):
+        """Response constructor.
+            The payload is decoded once, here, and shared read-only between
+            raw_data and the parsed views (json, xml and the typed objects),
+            so it should not be modified afterwards. An xml response body is
+            kept as is in payload and only parsed into the Element returned
+            by raw_data when raw_data is first read.
+            @param self - the object pointer
+            @param response_format - 'json' or 'xml'
+            @param data - decoded payload, or the response body as bytes or str
+            @param keep_raw - keep raw_data after parsing; when False the payload
+                is released once the typed objects are built
+            @param json_decoder - decodes a json response body, see
+                json_decoder.get_decoder(); None for the fastest installed
+                backend. Requests pass the decoder of their API.
+        """
         self.response_format = response_format
-        self.raw_data = data
+        self.keep_raw = keep_raw
+        self.json_decoder = loads if json_decoder is None else get_decoder(json_decoder)
+        self.payload = self.decode(data)
         self.error = ''
 
+    @property
+    def raw_data(self):
+        """The decoded json payload or the xml Element of the response, None
+            once released.
+        """
+        if self.response_format.lower() == 'xml' and \
+           isinstance(self.payload, (bytes, bytearray, str)):
+            self.payload = ElementTree.fromstring(self.payload)
+        return self.payload
+
+    @raw_data.setter
+    def raw_data(self, data):
+        self.payload = data
+
+    @staticmethod
+    def check_lazy(response_format, lazy):
+        """Raises ValueError if lazy parsing is asked for a format other than
+            json. xml responses are already parsed incrementally.
+            @param response_format - 'json' or 'xml'
+            @param lazy - whether lazy views were asked for
+        """
+        if lazy and response_format.lower() != 'json':
+            raise ValueError("Lazy parsing is only supported for json responses, not '{}'".format(
+                response_format))
+
+    def decode(self, data):
+        """Returns the decoded payload of a json response body. Other data,
+            including xml bodies which are parsed incrementally, is returned
+            as is.
+            @param self - the object pointer
+            @param data - decoded payload or response body
+        """
+        if self.response_format.lower() == 'json' and isinstance(data, (bytes, bytearray, str)):
+            return self.json_decoder(data)
+        return data
+
+    def release(self, views=False):
+        """Drops the raw payload after parsing unless keep_raw was given.
+            @param self - the object pointer
+            @param views - also drop the json and xml views, for responses whose
+                data is entirely held by their typed objects
+        """
+        if self.keep_raw:
+            return
+        self.payload = None
+        if views:
+            self.json = None
+            self.xml = None
+
     def parse_xml(self, data):
+        if not isinstance(data, ElementTree.Element):
+            parsed = ElementTree.fromstring(data)
+            if data is self.payload:
+                # Parsed once for both the xml view and raw_data.
+                self.payload = parsed
+            data = parsed
         self.xml = data
         self.error = data.find('error').text
 
+    def parse_xml_items(self, data, container, item, cls):
+        """Returns a cls object read with from_xml() for every item element.
+            A response body (bytes or a file-like object) is parsed
+            incrementally, keeping only one item element in memory.
+            @param self - the object pointer
+            @param data - response body or parsed Element
+            @param container - tag of the element holding the items
+            @param item - tag of the items
+            @param cls - class of the objects to build, e.g. Holding
+        """
+        self.xml = data if isinstance(data, ElementTree.Element) else None
+        parser = XMLItemParser(data, container, item)
+        items = []
+        for element in parser:
+            obj = cls()
+            obj.from_xml(element)
+            items.append(obj)
+        self.error = parser.error
+        return items
+
     def parse_json(self, data):
-        self.json = json.loads(json.dumps(data["response"]))
+        self.json = data["response"]
         self.error = self.json['error']
 
     def get_raw_data(self):
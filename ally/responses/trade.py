@@ -0,0 +1,21 @@
+class Trade():
+    def __init__(self):
+        pass
+
+    def from_json(self, json):
+        if 'cvol' in json:
+            self.cvol = json['cvol']
+        if 'datetime' in json:
+            self.datetime = json['datetime']
+        if 'exch' in json:
+            self.exch = json['exch']
+        if 'last' in json:
+            self.last = json['last']
+        if 'symbol' in json:
+            self.symbol = json['symbol']
+        if 'timestamp' in json:
+            self.timestamp = json['timestamp']
+        if 'vl' in json:
+            self.vl = json['vl']
+        if 'vwap' in json:
+            self.vwap = json['vwap']
@@ -0,0 +1,66 @@
+from .fields import set_fields, element_to_json
+
+class Transaction():
+    # Transaction fields as (section, ((response key, attribute name), ...)).
+    # The section is the path of the nested dict of the transaction the keys
+    # are read from, None for the transaction itself.
+    FIELDS = (
+        (None, (
+            ('activity', 'activity'),
+            ('amount', 'amount'),
+            ('date', 'date'),
+            ('desc', 'desc'),
+            ('symbol', 'symbol'),
+        )),
+        ('transaction', (
+            ('accounttype', 'accounttype'),
+            ('buysell', 'buysell'),
+            ('commission', 'commission'),
+            ('description', 'description'),
+            ('fee', 'fee'),
+            ('price', 'price'),
+            ('quantity', 'quantity'),
+            ('secfee', 'secfee'),
+            ('settlementdate', 'settlementdate'),
+            ('side', 'side'),
+            ('source', 'source'),
+            ('tradedate', 'tradedate'),
+            ('transactiondate', 'transactiondate'),
+        )),
+        ('transaction/security', (
+            ('cusip', 'cusip'),
+            ('id', 'id'),
+            ('sectyp', 'sectyp'),
+            ('sym', 'sym'),
+        )),
+    )
+
+    __slots__ = tuple(sorted(set(attr for section, fields in FIELDS for key, attr in fields)))
+
+    def __init__(self):
+        pass
+
+    def from_xml(self, xml):
+        """Sets an attribute for every field of a transaction element and its
+            transaction and security elements. Fields missing from the
+            response are left unset.
+            @param self - the object pointer
+            @param xml - the transaction Element of the response
+        """
+        self.from_json(element_to_json(xml, self.FIELDS))
+
+    def from_json(self, json):
+        """Sets an attribute for every field of the transaction and its
+            details and security, leaving the fields missing from the response
+            unset.
+            @param self - the object pointer
+            @param json - the transaction of the json response
+        """
+        set_fields(self, json, self.FIELDS)
+
+    def to_dict(self):
+        """Returns the fields set on the transaction as a dict of attribute
+            name -> value.
+            @param self - the object pointer
+        """
+        return {attr: getattr(self, attr) for attr in self.__slots__ if hasattr(self, attr)}
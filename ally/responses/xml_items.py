@@ -0,0 +1,70 @@
+"""@package xml_items
+    Incremental parsing of the item lists in xml responses.
+
+    XMLItemParser walks a response body with ElementTree.iterparse and yields
+    the item elements (e.g. accountholdings/holding or orderstatus/order) one
+    at a time as soon as each is complete. Items are removed from the tree
+    once the consumer moves on, so only one item is held in memory at a time
+    however long the list is.
+"""
+
+from xml.etree import ElementTree
+import io
+
+
+class XMLItemParser:
+    """Yields the item elements of an xml response.
+
+        parser = XMLItemParser(body, 'orderstatus', 'order')
+        for element in parser:
+            ...
+        parser.error    # text of the <error> element, e.g. 'Success'
+    """
+    def __init__(self, source, container, item):
+        """XMLItemParser constructor.
+            @param self - the object pointer
+            @param source - response body as bytes or str, a binary file-like
+                object, or an already parsed Element (walked without clearing)
+            @param container - tag of the element holding the items
+            @param item - tag of the items
+        """
+        self.source = source
+        self.container = container
+        self.item = item
+        self.error = ''
+
+    def __iter__(self):
+        source = self.source
+        if isinstance(source, ElementTree.Element):
+            return self.__walk(source)
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        return self.__iterparse(source)
+
+    def __walk(self, root):
+        """A private generator over the items of a parsed tree."""
+        error = root.find('error')
+        self.error = error.text if error is not None else ''
+        container = root if root.tag == self.container else root.find(self.container)
+        if container is None:
+            return
+        for element in container.findall(self.item):
+            yield element
+
+    def __iterparse(self, source):
+        """A private generator over the items of a body being parsed."""
+        stack = []
+        for event, element in ElementTree.iterparse(source, events=("start", "end")):
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if element.tag == self.item and parent is not None and \
+               parent.tag == self.container:
+                yield element
+                parent.remove(element)
+            elif element.tag == 'error' and len(stack) == 1:
+                self.error = element.text or ''
@@ -0,0 +1,74 @@
+"""@package session
+    Pooled HTTP session management for the AllyAPI class.
+
+    Every call made through an AllyAPI instance shares one requests.Session so
+    that TCP connections (and their TLS handshakes) are kept alive and reused
+    between calls instead of being re-established for every request.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_session(pool_connections=10, pool_maxsize=10, pool_block=False,
+                   max_retries=0, keep_alive=True):
+    """Creates a requests.Session backed by a keep-alive connection pool.
+
+        @param pool_connections - number of per-host connection pools to cache
+        @param pool_maxsize - maximum number of connections kept open per host
+        @param pool_block - if True, block when all connections of a host are in
+            use instead of opening a throw-away connection
+        @param max_retries - number of connection-level retries
+        @param keep_alive - if False, connections are closed after every request
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          pool_block=pool_block,
+                          max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_pool_stats(session):
+    """Returns connection pool statistics for every host the session has
+        talked to, keyed by 'scheme://host:port'.
+
+        Each entry holds:
+            'connections' - number of connections opened so far
+            'requests' - number of requests sent through the pool
+            'idle' - connections currently idle and ready for reuse
+            'maxsize' - maximum number of connections kept per host
+            'reuse_ratio' - fraction of requests served on a reused connection
+
+        @param session - a session returned by create_session()
+    """
+    stats = {}
+    seen = set()
+    for adapter in session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            name = "{}://{}:{}".format(pool.scheme, pool.host, pool.port)
+            idle = 0
+            if pool.pool is not None:
+                # Empty slots in the pool queue are filled with None.
+                idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+            requests_sent = pool.num_requests
+            reused = max(requests_sent - pool.num_connections, 0)
+            stats[name] = {
+                "connections": pool.num_connections,
+                "requests": requests_sent,
+                "idle": idle,
+                "maxsize": pool.pool.maxsize if pool.pool is not None else 0,
+                "reuse_ratio": reused / requests_sent if requests_sent else 0.0,
+            }
+    return stats
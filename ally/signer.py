@@ -0,0 +1,100 @@
+"""@package signer
+    A reusable OAuth 1.0a (HMAC-SHA1) request signer.
+
+    The signing key depends only on the consumer and token secrets, so it is
+    computed once, along with the keyed HMAC state. Signing a request then only
+    generates a nonce and timestamp, builds the signature base string and
+    finishes a copy of the precomputed HMAC. The signer holds no per-request
+    state and can be shared between threads.
+"""
+
+from urllib.parse import quote, urlsplit, parse_qsl
+import hashlib
+import base64
+import hmac
+import time
+import uuid
+
+from requests.auth import AuthBase
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+
+def escape(value):
+    """Percent-encodes a value as required by RFC 5849 section 3.6."""
+    return quote(value, safe="~")
+
+
+class OAuthSigner(AuthBase):
+    """Signs requests for the Ally Invest API. Usable directly as the `auth`
+        argument of requests, or through sign() to obtain the Authorization
+        header for any other HTTP client.
+    """
+    def __init__(self, client_key, client_secret, oauth_token, oauth_secret):
+        """OAuthSigner constructor.
+            @param self - the object pointer
+            @param client_key - client (consumer) key from Ally
+            @param client_secret - client (consumer) secret from Ally
+            @param oauth_token - oauth token from Ally
+            @param oauth_secret - secret oauth key from Ally
+        """
+        key = "{}&{}".format(escape(client_secret), escape(oauth_secret)).encode("utf-8")
+        self.hmac = hmac.new(key, digestmod=hashlib.sha1)
+        # The static protocol parameters, already percent-encoded.
+        self.oauth_params = [(escape(k), escape(v)) for k, v in (
+            ("oauth_consumer_key", client_key),
+            ("oauth_signature_method", "HMAC-SHA1"),
+            ("oauth_token", oauth_token),
+            ("oauth_version", "1.0"),
+        )]
+
+    def __call__(self, request):
+        """Signs a requests.PreparedRequest.
+            @param self - the object pointer
+            @param request - request to sign
+        """
+        body_params = None
+        content_type = request.headers.get("Content-Type", "")
+        if request.body and content_type.startswith(FORM_CONTENT_TYPE):
+            body = request.body
+            if isinstance(body, bytes):
+                body = body.decode("utf-8")
+            body_params = parse_qsl(body, keep_blank_values=True)
+        request.headers["Authorization"] = self.sign(request.method, request.url, body_params)
+        return request
+
+    def sign(self, method, url, body_params=None, nonce=None, timestamp=None):
+        """Returns the value of the Authorization header for a request.
+            @param self - the object pointer
+            @param method - HTTP method
+            @param url - full request URL, including the query string
+            @param body_params - list of (name, value) pairs of a form encoded body
+            @param nonce - nonce to use, generated when not given
+            @param timestamp - timestamp to use, the current time when not given
+        """
+        oauth_params = self.oauth_params + [
+            ("oauth_nonce", escape(nonce or uuid.uuid4().hex)),
+            ("oauth_timestamp", str(timestamp or int(time.time()))),
+        ]
+
+        parts = urlsplit(url)
+        params = [(escape(k), escape(v))
+                  for k, v in parse_qsl(parts.query, keep_blank_values=True)]
+        if body_params:
+            params.extend((escape(k), escape(v)) for k, v in body_params)
+        params.extend(oauth_params)
+        normalized = "&".join(k + "=" + v for k, v in sorted(params))
+
+        scheme = parts.scheme.lower()
+        netloc = parts.netloc.lower()
+        if (scheme, parts.port) in (("http", 80), ("https", 443)):
+            netloc = netloc.rsplit(":", 1)[0]
+        base_uri = "{}://{}{}".format(scheme, netloc, parts.path or "/")
+        base_string = "&".join((method.upper(), escape(base_uri), escape(normalized)))
+
+        digest = self.hmac.copy()
+        digest.update(base_string.encode("utf-8"))
+        signature = base64.b64encode(digest.digest()).decode("ascii")
+
+        oauth_params.append(("oauth_signature", escape(signature)))
+        return "OAuth " + ", ".join('{}="{}"'.format(k, v) for k, v in oauth_params)
@@ -0,0 +1,2 @@
+from .server import StandInServer
+from .recorder import Recorder
@@ -0,0 +1,33 @@
+"""@package __main__
+    Runs the StandInServer from the command line:
+
+        python -m ally.standin --port 8080 --latency 0.05 --error-rate 0.01
+"""
+
+import argparse
+import time
+
+from .server import StandInServer, FIXTURES_DIR
+
+parser = argparse.ArgumentParser(description="Local stand-in for the Ally Invest API.")
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8080)
+parser.add_argument("--fixtures", default=FIXTURES_DIR, help="fixtures directory")
+parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+parser.add_argument("--jitter", type=float, default=0.0, help="maximum random extra latency")
+parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of failed requests")
+parser.add_argument("--error-codes", default="500", help="comma separated status codes, e.g. 429,503")
+parser.add_argument("--max-url-length", type=int, default=None, help="answer longer URLs with 414")
+parser.add_argument("--scale", type=int, default=1, help="multiply list payloads by this factor")
+args = parser.parse_args()
+
+server = StandInServer(host=args.host, port=args.port, fixtures_dir=args.fixtures,
+                       latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                       error_codes=[int(code) for code in args.error_codes.split(",")],
+                       max_url_length=args.max_url_length, scale=args.scale).start()
+print("Serving Ally API fixtures at " + server.base_url)
+try:
+    while True:
+        time.sleep(1)
+except KeyboardInterrupt:
+    server.stop()
@@ -0,0 +1,74 @@
+"""@package recorder
+    Records live Ally API responses as fixtures for the StandInServer.
+
+        with Recorder(ally, "my_fixtures"):
+            ally.get_accounts()
+            ally.get_quote(["AAPL", "MSFT"])
+
+        server = StandInServer(fixtures_dir="my_fixtures").start()
+
+    Every successful response received through the AllyAPI session is written
+    to the fixture path the StandInServer looks it up under. Account numbers
+    are replaced by 'id' in the path, but not in the response bodies; scrub
+    those before sharing recorded fixtures.
+"""
+
+from urllib.parse import urlsplit
+import os
+
+from .server import fixture_path
+
+
+class Recorder:
+    """Writes the responses of an AllyAPI session to a fixtures directory."""
+    def __init__(self, ally_api, fixtures_dir):
+        """Recorder constructor.
+            @param self - the object pointer
+            @param ally_api - the AllyAPI instance to record
+            @param fixtures_dir - directory the fixtures are written to
+        """
+        self.ally_api = ally_api
+        self.fixtures_dir = fixtures_dir
+        self.base_path = urlsplit(ally_api.url.base_url).path
+        self.recorded = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Starts recording and returns the recorder.
+            @param self - the object pointer
+        """
+        hooks = self.ally_api.session.hooks["response"]
+        if self.record not in hooks:
+            hooks.append(self.record)
+        return self
+
+    def stop(self):
+        """Stops recording.
+            @param self - the object pointer
+        """
+        hooks = self.ally_api.session.hooks["response"]
+        if self.record in hooks:
+            hooks.remove(self.record)
+
+    def record(self, response, *args, **kwargs):
+        """Response hook writing a response to its fixture file. Streamed
+            responses and errors are not recorded.
+            @param self - the object pointer
+            @param response - the requests.Response received
+        """
+        if kwargs.get("stream") or response.status_code != 200:
+            return
+        path = urlsplit(response.url).path
+        if not path.startswith(self.base_path):
+            return
+        name = fixture_path(path[len(self.base_path):], response.request.method)[0]
+        filename = os.path.join(self.fixtures_dir, *name.split("/"))
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "wb") as f:
+            f.write(response.content)
+        self.recorded.append(name)
@@ -0,0 +1,284 @@
+"""@package server
+    A local stand-in for the Ally Invest (TradeKing) REST API.
+
+    The server answers the endpoints defined in URLs with recorded json/xml
+    fixtures, so AllyAPI and AsyncAllyAPI can be tested and benchmarked
+    offline by pointing them at it:
+
+        server = StandInServer(latency=0.05).start()
+        ally = AllyAPI(secret, token, key, base_url=server.base_url)
+
+    Fixtures are looked up by URL path relative to /v1/ with account numbers
+    replaced by 'id', e.g. accounts/12345678/holdings.json is served from
+    fixtures/accounts/id/holdings.json. POST requests first look for a
+    '.post' variant (accounts/id/orders.post.xml). Quotes are generated for
+    whatever symbols are requested, using the recorded quotes as templates.
+
+    Latency, injected error codes (e.g. 429, 414, 5xx) and payload size are
+    configurable.
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from xml.etree import ElementTree
+import copy
+import json
+import os
+import random
+import re
+import threading
+import time
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Endpoints whose list payloads grow with the `scale` setting, as
+# (path without extension, container, item).
+SCALABLE = [
+    ("accounts/id/holdings", "accountholdings", "holding"),
+    ("accounts/id/orders", "orderstatus", "order"),
+    ("accounts/id/history", "transactions", "transaction"),
+    ("market/news/search", "articles", "article"),
+]
+
+ACCOUNT_ID = re.compile(r"^accounts/[^/.]+(?=[/.])")
+OPTION_SYMBOL = re.compile(r"^[A-Z]{1,6}\d{6}[CP]\d{8}$")
+
+
+def fixture_path(path, method="GET"):
+    """Returns the fixture name for a request path relative to /v1/.
+        @param path - request path without the version prefix
+        @param method - HTTP method
+    """
+    path = path.strip("/")
+    if not path.startswith("accounts/balances."):
+        path = ACCOUNT_ID.sub("accounts/id", path)
+    if method == "POST":
+        base, ext = os.path.splitext(path)
+        return [base + ".post" + ext, path]
+    return [path]
+
+
+class StandInServer:
+    """A threaded HTTP server replaying Ally API fixtures."""
+    def __init__(self, host="127.0.0.1", port=0, fixtures_dir=FIXTURES_DIR,
+                 latency=0.0, jitter=0.0, error_rate=0.0, error_codes=(500,),
+                 max_url_length=None, scale=1, seed=None):
+        """StandInServer constructor.
+            @param self - the object pointer
+            @param host - interface to listen on
+            @param port - port to listen on, 0 picks a free port
+            @param fixtures_dir - directory holding the fixture files
+            @param latency - seconds added to every response
+            @param jitter - maximum random number of seconds added on top of latency
+            @param error_rate - fraction of requests answered with an error
+            @param error_codes - status codes the injected errors are drawn from
+            @param max_url_length - answer longer request URLs with 414
+            @param scale - multiply the list payloads (holdings, orders, history,
+                news) by this factor
+            @param seed - seed for the random latency/error generator
+        """
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.max_url_length = max_url_length
+        self.scale = scale
+        self.random = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.forced = []
+        self.fixtures = {}
+        self.requests = []
+
+        handler = type("StandInHandler", (_Handler,), {"standin": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        """The base URL to pass to AllyAPI/AsyncAllyAPI."""
+        host, port = self.httpd.server_address[:2]
+        return "http://{}:{}/v1/".format(host, port)
+
+    def start(self):
+        """Starts serving in a background thread and returns the server.
+            @param self - the object pointer
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server and closes its socket.
+            @param self - the object pointer
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def fail_next(self, status, count=1, headers=None):
+        """Answers the next `count` requests with the given status code.
+            @param self - the object pointer
+            @param status - HTTP status code, e.g. 429
+            @param count - number of requests to fail
+            @param headers - extra response headers, e.g. {'Retry-After': '1'}
+        """
+        with self.lock:
+            self.forced.extend([(status, headers or {})] * count)
+
+    def load(self, name):
+        """Returns the parsed fixture, json as a dict and xml as an Element, or
+            None if there is no such fixture.
+            @param self - the object pointer
+            @param name - fixture name, e.g. 'market/clock.json'
+        """
+        with self.lock:
+            if name in self.fixtures:
+                return self.fixtures[name]
+        path = os.path.join(self.fixtures_dir, *name.split("/"))
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            content = f.read()
+        data = json.loads(content) if name.endswith(".json") else ElementTree.fromstring(content)
+        with self.lock:
+            self.fixtures[name] = data
+        return data
+
+    def respond(self, method, raw_path):
+        """Returns (status, headers, body) for a request.
+            @param self - the object pointer
+            @param method - HTTP method
+            @param raw_path - request path including the query string
+        """
+        with self.lock:
+            self.requests.append((method, raw_path))
+            forced = self.forced.pop(0) if self.forced else None
+            inject = self.error_rate and self.random.random() < self.error_rate
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            code = self.random.choice(self.error_codes) if inject else None
+        if delay:
+            time.sleep(delay)
+        if forced is not None:
+            return forced[0], forced[1], b""
+        if code is not None:
+            headers = {"Retry-After": "0"} if code == 429 else {}
+            return code, headers, b""
+        if self.max_url_length is not None and len(raw_path) > self.max_url_length:
+            return 414, {}, b""
+
+        parts = urlsplit(raw_path)
+        path = parts.path
+        if path.startswith("/v1/"):
+            path = path[len("/v1/"):]
+        data = None
+        for name in fixture_path(path, method):
+            data = self.load(name)
+            if data is not None:
+                break
+        if data is None:
+            return 404, {}, b""
+
+        data = copy.deepcopy(data)
+        query = parse_qs(parts.query)
+        base = os.path.splitext(fixture_path(path)[0])[0]
+        if base == "market/ext/quotes" and "symbols" in query:
+            data = self.__quotes(data, query["symbols"][0].split(","))
+        elif self.scale != 1:
+            for endpoint, container, item in SCALABLE:
+                if base == endpoint:
+                    data = self.__scale(data, container, item)
+
+        if isinstance(data, dict):
+            return 200, {"Content-Type": "application/json"}, json.dumps(data).encode("utf-8")
+        return 200, {"Content-Type": "text/xml"}, ElementTree.tostring(data, encoding="utf-8")
+
+    def __quotes(self, data, symbols):
+        """A private method building a quotes payload for the symbols."""
+        if isinstance(data, dict):
+            templates = data["response"]["quotes"]["quote"]
+            if isinstance(templates, dict):
+                templates = [templates]
+            stock, option = self.__templates(templates, lambda q: q.get("symbol", ""))
+            quotes = []
+            for symbol in symbols:
+                quote = dict(option if OPTION_SYMBOL.match(symbol) else stock)
+                quote["symbol"] = symbol
+                quotes.append(quote)
+            data["response"]["quotes"]["quote"] = quotes[0] if len(quotes) == 1 else quotes
+            return data
+
+        quotes_el = data.find("quotes")
+        templates = quotes_el.findall("quote")
+        for quote in templates:
+            quotes_el.remove(quote)
+        stock, option = self.__templates(templates, lambda q: q.findtext("symbol") or "")
+        for symbol in symbols:
+            quote = copy.deepcopy(option if OPTION_SYMBOL.match(symbol) else stock)
+            quote.find("symbol").text = symbol
+            quotes_el.append(quote)
+        return data
+
+    @staticmethod
+    def __templates(templates, symbol_of):
+        stocks = [q for q in templates if not OPTION_SYMBOL.match(symbol_of(q))]
+        options = [q for q in templates if OPTION_SYMBOL.match(symbol_of(q))]
+        stock = stocks[0] if stocks else templates[0]
+        return stock, options[0] if options else stock
+
+    def __scale(self, data, container, item):
+        """A private method repeating the items of a list payload."""
+        if isinstance(data, dict):
+            parent = data["response"].get(container) or {}
+            items = parent.get(item)
+            if items is None:
+                return data
+            if isinstance(items, dict):
+                items = [items]
+            parent[item] = [copy.deepcopy(items[i % len(items)])
+                            for i in range(len(items) * self.scale)]
+            return data
+
+        parent = data.find(container)
+        if parent is None:
+            return data
+        items = parent.findall(item)
+        for i in range(len(items) * (self.scale - 1)):
+            parent.append(copy.deepcopy(items[i % len(items)]))
+        return data
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    standin = None
+
+    def do_GET(self):
+        self.__reply("GET")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.__reply("POST")
+
+    def do_DELETE(self):
+        self.__reply("DELETE")
+
+    def __reply(self, method):
+        status, headers, body = self.standin.respond(method, self.path)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
@@ -0,0 +1,250 @@
+"""@package stream
+    Streaming market quotes (GET market/quotes on the streaming endpoint).
+
+    Ally keeps a single chunked HTTP response open and writes a JSON object
+    for every quote or trade as it happens. QuoteStream reads that response
+    incrementally, yielding Quote and Trade objects as they arrive, and
+    reconnects when the connection drops or the subscribed symbols change.
+
+    Data is only read from the socket when the consumer asks for the next
+    item, so a slow consumer applies TCP backpressure to the server instead of
+    growing an unbounded buffer. With conflate=True a consumer that falls
+    behind only sees the latest quote/trade per symbol of every batch read.
+"""
+
+import codecs
+import json
+import threading
+import time
+
+import requests
+
+from .responses.quote import Quote
+from .responses.trade import Trade
+from .symbols import get_symbol_string
+
+
+class StreamParser:
+    """Incrementally splits a stream of concatenated JSON objects."""
+    def __init__(self, max_buffer=1 << 20):
+        """StreamParser constructor.
+            @param self - the object pointer
+            @param max_buffer - maximum number of characters kept for an
+                incomplete message before the stream is considered corrupt
+        """
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.max_buffer = max_buffer
+
+    def reset(self):
+        """Discards any partially received message.
+            @param self - the object pointer
+        """
+        self.text_decoder.reset()
+        self.buffer = ""
+
+    def feed(self, chunk):
+        """Adds raw bytes to the parser and returns the list of complete
+            messages now available.
+            @param self - the object pointer
+            @param chunk - bytes read from the stream
+        """
+        buffer = self.buffer + self.text_decoder.decode(chunk)
+        messages = []
+        pos = 0
+        end = len(buffer)
+        while True:
+            while pos < end and buffer[pos].isspace():
+                pos += 1
+            if pos >= end:
+                break
+            try:
+                message, pos_next = self.decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # The rest of the message has not arrived yet.
+                break
+            messages.append(message)
+            pos = pos_next
+        self.buffer = buffer[pos:]
+        if len(self.buffer) > self.max_buffer:
+            self.buffer = ""
+            raise ValueError("Malformed quote stream: incomplete message too large.")
+        return messages
+
+
+class QuoteStream:
+    """A generator-style client of the streaming quotes endpoint.
+
+        for item in ally.stream_quotes(['AAPL', 'MSFT']):
+            if isinstance(item, Quote): ...
+    """
+    def __init__(self, ally_api, symbols, reconnect=True, max_retries=None,
+                 backoff=1.0, max_backoff=30.0, chunk_size=512, conflate=False,
+                 max_buffer=1 << 20):
+        """QuoteStream constructor.
+            @param self - the object pointer
+            @param ally_api - the AllyAPI instance providing session and credentials
+            @param symbols - single ticker or list of tickers to stream
+            @param reconnect - reconnect automatically when the connection drops
+            @param max_retries - consecutive failed connection attempts before giving
+                up, None retries forever
+            @param backoff - initial delay in seconds between reconnect attempts
+            @param max_backoff - upper bound of the reconnect delay
+            @param chunk_size - maximum number of bytes read from the socket at once
+            @param conflate - only yield the latest quote/trade per symbol of every
+                batch of messages read together
+            @param max_buffer - maximum size of an incomplete message
+        """
+        self.ally_api = ally_api
+        self.symbols = symbols
+        self.reconnect = reconnect
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.chunk_size = chunk_size
+        self.conflate = conflate
+        self.parser = StreamParser(max_buffer)
+
+        self.lock = threading.Lock()
+        self.response = None
+        self.resubscribe = False
+        self.closed = False
+        self.stats = {"connects": 0, "messages": 0, "dropped": 0}
+
+    def __iter__(self):
+        return self.__stream()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def set_symbols(self, symbols):
+        """Changes the streamed symbols. The stream resubscribes, i.e.
+            reconnects with the new symbols, before reading more data. Can be
+            called from any thread.
+            @param self - the object pointer
+            @param symbols - single ticker or list of tickers to stream
+        """
+        with self.lock:
+            self.symbols = symbols
+            self.resubscribe = True
+            response = self.response
+        if response is not None:
+            response.close()
+
+    def close(self):
+        """Stops the stream and closes the connection. Can be called from any
+            thread.
+            @param self - the object pointer
+        """
+        with self.lock:
+            self.closed = True
+            response = self.response
+        if response is not None:
+            response.close()
+
+    def get_stats(self):
+        """Returns the number of connections made, messages received and
+            messages dropped by conflation.
+            @param self - the object pointer
+        """
+        return dict(self.stats)
+
+    def __connect(self):
+        """A private method to open the streaming response."""
+        with self.lock:
+            self.resubscribe = False
+            symbols = get_symbol_string(self.symbols)
+        url = self.ally_api.url.stream_quotes_url() + "?symbols=" + symbols
+        rate_limiter = self.ally_api.rate_limiter
+        if rate_limiter:
+            rate_limiter.acquire("market")
+        response = self.ally_api.session.get(url, auth=self.ally_api.auth, stream=True,
+                                             timeout=self.ally_api.timeout)
+        if response.status_code >= 400:
+            response.close()
+            response.raise_for_status()
+        self.parser.reset()
+        self.stats["connects"] += 1
+        with self.lock:
+            self.response = response
+        return response
+
+    def __stream(self):
+        """A private generator yielding the streamed quotes and trades."""
+        failures = 0
+        while not self.closed:
+            try:
+                response = self.__connect()
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if self.closed or self.resubscribe:
+                        break
+                    for item in self.__parse(chunk):
+                        # Only a connection that delivers data counts as a success.
+                        failures = 0
+                        yield item
+                    if self.closed or self.resubscribe:
+                        break
+                else:
+                    # The server ended the stream. Reconnecting is throttled
+                    # like a failure so a server closing every connection at
+                    # once does not use up the market rate limit.
+                    failures += 1
+                    if not self.reconnect or \
+                       (self.max_retries is not None and failures > self.max_retries):
+                        return
+                    time.sleep(min(self.backoff * (2 ** (failures - 1)), self.max_backoff))
+            except Exception as e:
+                # Closing the response from another thread surfaces as an error
+                # in the reading thread; that is not a failure.
+                if self.closed or self.resubscribe:
+                    continue
+                failures += 1
+                if not self.reconnect or not self.__retryable(e) or \
+                   (self.max_retries is not None and failures > self.max_retries):
+                    raise
+                time.sleep(min(self.backoff * (2 ** (failures - 1)), self.max_backoff))
+            finally:
+                with self.lock:
+                    response, self.response = self.response, None
+                if response is not None:
+                    response.close()
+
+    @staticmethod
+    def __retryable(error):
+        """A private method telling whether reconnecting may fix an error."""
+        if isinstance(error, requests.HTTPError):
+            status = error.response.status_code if error.response is not None else 0
+            return status == 429 or status >= 500
+        return isinstance(error, (requests.ConnectionError, requests.Timeout,
+                                  requests.exceptions.ChunkedEncodingError))
+
+    def __parse(self, chunk):
+        """A private method returning the quotes and trades in a chunk."""
+        messages = self.parser.feed(chunk)
+        self.stats["messages"] += len(messages)
+        items = []
+        for message in messages:
+            if "quote" in message:
+                item = Quote()
+                item.from_json(message["quote"])
+            elif "trade" in message:
+                item = Trade()
+                item.from_json(message["trade"])
+            else:
+                # Status messages such as {"status": "connected"}.
+                continue
+            items.append(item)
+
+        if self.conflate and len(items) > 1:
+            latest = {}
+            for item in items:
+                key = (type(item), getattr(item, "symbol", None))
+                latest.pop(key, None)
+                latest[key] = item
+            self.stats["dropped"] += len(items) - len(latest)
+            items = list(latest.values())
+        return items
@@ -0,0 +1,26 @@
+"""@package symbols
+    Helpers for building the symbol lists passed to the market endpoints.
+"""
+
+
+def get_symbol_string(symbols):
+    """Returns a string that is either a single quote or a comma-separated
+        list of quotes depending on the type of quotes.
+        @param symbols - single ticker or list of ticker to get quotes for
+    """
+    if not isinstance(symbols, str): # list
+        symbols = ",".join(symbols)
+    return symbols
+
+
+def get_option_quote_symbol(symbol, exp_date, strike, put_call):
+    """Returns the OCC option symbol, e.g. AAPL201016C00120000.
+        @param symbol - underlying stock's ticker symbol
+        @param exp_date - options expiration date
+        @param strike - option's strike price
+        @param put_call - c=call, p=put
+    """
+    sym = "{sym}{year}{month:02d}{day:02d}{putcall}{strike}"
+    strike = str(int(strike*1000)).zfill(8)
+    return sym.format(sym=symbol.upper(), year=str(exp_date.year)[-2:], month=exp_date.month,
+                    day=exp_date.day, putcall=put_call.upper(), strike=strike)
@@ -0,0 +1,95 @@
+"""Benchmark of the JSON backends decoding response bodies.
+
+Decodes quote, orders and account history bodies of 1 to 10,000 items with
+every installed backend (see ally.json_decoder), and with
+requests.Response.json(), which AllyAPI used before, for comparison:
+
+    python benchmarks/bench_json.py --label orjson
+    python benchmarks/bench_json.py --compare benchmarks/results/json-orjson.json
+
+Run it from the repository root with the package importable
+(pip install -e . or PYTHONPATH=.).
+"""
+
+import argparse
+import json
+
+import requests
+
+from ally.json_decoder import get_backends, get_decoder
+
+import harness
+import payloads
+
+SIZES = (1, 10, 100, 1000, 10000)
+
+PAYLOADS = {
+    "quotes": payloads.quotes_json,
+    "orders": payloads.orders_json,
+    "history": payloads.history_json,
+}
+
+
+def body(payload, n):
+    return json.dumps(PAYLOADS[payload](n)).encode("utf-8")
+
+
+def response_json(payload):
+    """requests.Response.json() on a response holding the body."""
+    def setup(n):
+        response = requests.Response()
+        response._content = body(payload, n)
+        response.encoding = None
+        return response.json
+    return setup
+
+
+def backend(payload, name):
+    def setup(n):
+        content = body(payload, n)
+        decoder = get_decoder(name)
+        return lambda: decoder(content)
+    return setup
+
+
+def cases():
+    """Returns {case: setup} for the installed backends."""
+    result = {}
+    for payload in PAYLOADS:
+        result["{} Response.json()".format(payload)] = response_json(payload)
+        for name in get_backends():
+            result["{} {}".format(payload, name)] = backend(payload, name)
+    return result
+
+
+def run(selected=None, sizes=SIZES, repeat=3):
+    """Returns {case: {size: measurement}} for the selected cases."""
+    results = {}
+    for name, setup in cases().items():
+        if selected and name not in selected:
+            continue
+        results[name] = {}
+        for n in sizes:
+            results[name][str(n)] = harness.measure(setup(n), n, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma separated payload sizes")
+    parser.add_argument("--case", action="append", choices=sorted(cases()),
+                        help="only run this case, may be repeated")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--label", help="name of this run, defaults to the git revision")
+    parser.add_argument("--output", help="results file, defaults to benchmarks/results/")
+    parser.add_argument("--compare", help="results file of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = run(args.case, [int(n) for n in args.sizes.split(",")], args.repeat)
+    harness.report(results, harness.load(args.compare) if args.compare else None)
+    print("saved " + harness.save("json", results, args.label, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Per-object memory and construction time of the Quote and Holding models.
+
+Builds 50,000 option quotes and holdings. Quote is compared with objects
+filled by the same code but keeping their attributes in a per-instance
+__dict__, the layout the model used before. Use bench_parsing.py --compare
+for the change in parsing time across versions.
+
+    python benchmarks/bench_models.py [count]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from ally.responses.quote import Quote
+from ally.responses.holding import Holding
+from ally.responses.fields import set_fields
+
+import payloads
+
+
+class DictQuote():
+    """Quote with its fields in a per-instance __dict__."""
+    def from_json(self, json):
+        set_fields(self, json, Quote.SECTIONS)
+
+
+def build(cls, items):
+    result = []
+    for item in items:
+        obj = cls()
+        obj.from_json(item)
+        result.append(obj)
+    return result
+
+
+def measure(cls, items):
+    start = time.perf_counter()
+    build(cls, items)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build(cls, items)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return seconds / len(items) * 1e6, retained / len(items)
+
+
+def main(count=50000):
+    quotes = payloads.quotes_json(count * 2)["response"]["quotes"]["quote"][1::2]
+    holdings = payloads.holdings_json(count)["response"]["accountholdings"]["holding"]
+    cases = [
+        ("Quote (__dict__)", DictQuote, quotes),
+        ("Quote (__slots__)", Quote, quotes),
+        ("Holding", Holding, holdings),
+    ]
+    print("{} objects".format(count))
+    print("{:<22} {:>12} {:>14}".format("model", "us/object", "bytes/object"))
+    for name, cls, items in cases:
+        us, size = measure(cls, items)
+        print("{:<22} {:>12.2f} {:>14.1f}".format(name, us, size))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
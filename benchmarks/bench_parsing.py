@@ -0,0 +1,404 @@
+"""Throughput and allocation benchmark of response parsing and FIXML handling.
+
+Runs every case over synthetic payloads of 1 to 10,000 items and saves the
+results as json, so runs of different versions can be compared:
+
+    python benchmarks/bench_parsing.py --label v1.0.17
+    python benchmarks/bench_parsing.py --compare benchmarks/results/parsing-v1.0.17.json
+
+Run it from the repository root with the package importable
+(pip install -e . or PYTHONPATH=.). Cases measuring a feature the installed
+version does not have are skipped.
+"""
+
+from xml.etree import ElementTree
+import argparse
+import importlib
+import inspect
+import json
+import sys
+
+from ally.responses.quotes import QuotesResponse
+from ally.responses.account_holdings import AccountHoldingsResponse
+from ally.responses.orders import OrdersResponse
+from ally.responses.quote import Quote
+from ally.responses.holding import Holding
+from ally.responses.order import Order, get_multileg_fixml
+
+import harness
+import payloads
+
+SIZES = (1, 10, 100, 1000, 10000)
+
+
+class Unsupported(Exception):
+    """Raised by the setup of a case the installed version cannot run."""
+
+
+def require(module, name):
+    """Returns module.name, raising Unsupported when it does not exist."""
+    try:
+        return getattr(importlib.import_module(module), name)
+    except (ImportError, AttributeError):
+        raise Unsupported("{}.{}".format(module, name))
+
+
+def require_param(func, name):
+    """Raises Unsupported when func does not take the keyword argument name."""
+    if name not in inspect.signature(func).parameters:
+        raise Unsupported("{}({}=...)".format(func.__qualname__, name))
+
+
+def quotes_response(n):
+    data = payloads.quotes_json(n)
+    return lambda: QuotesResponse("json", data)
+
+
+def quotes_response_body(keep_raw):
+    """QuotesResponse decoding a json response body."""
+    def setup(n):
+        require_param(QuotesResponse.__init__, "keep_raw")
+        body = json.dumps(payloads.quotes_json(n)).encode("utf-8")
+        return lambda: QuotesResponse("json", body, keep_raw=keep_raw)
+    return setup
+
+
+def quotes_response_xml(incremental):
+    """QuotesResponse from an xml body, either parsed into a tree like
+    get_quote() or parsed incrementally.
+    """
+    def setup(n):
+        body = ElementTree.tostring(payloads.quotes_xml(n))
+        if incremental:
+            require("ally.responses.xml_items", "XMLItemParser")
+            return lambda: QuotesResponse("xml", body)
+        return lambda: QuotesResponse("xml", ElementTree.fromstring(body))
+    return setup
+
+
+def quotes_response_read(lazy):
+    """Builds the response and reads bid, ask and last of every quote."""
+    def setup(n):
+        # Older versions do not take lazy.
+        kwargs = {"lazy": True} if lazy else {}
+        if lazy:
+            require_param(QuotesResponse.__init__, "lazy")
+        data = payloads.quotes_json(n)
+
+        def run():
+            response = QuotesResponse("json", data, **kwargs)
+            return response, [(q.bid, q.ask, q.last) for q in response.get_quotes()]
+        return run
+    return setup
+
+
+def holdings_response(lazy):
+    def setup(n):
+        # Older versions do not take lazy.
+        kwargs = {"lazy": True} if lazy else {}
+        if lazy:
+            require_param(AccountHoldingsResponse.__init__, "lazy")
+        data = payloads.holdings_json(n)
+        return lambda: AccountHoldingsResponse("12345678", "json", data, **kwargs)
+    return setup
+
+
+def orders_response(lazy):
+    def setup(n):
+        # Older versions do not take lazy.
+        kwargs = {"lazy": True} if lazy else {}
+        if lazy:
+            require_param(OrdersResponse.__init__, "lazy")
+        convert_fixml_json = require("ally.fixml", "convert_fixml_json")
+        data = convert_fixml_json(payloads.orders_json(n))
+        return lambda: OrdersResponse("12345678", "json", data, **kwargs)
+    return setup
+
+
+def orders_response_xml(incremental):
+    """OrdersResponse from an xml body, either parsed into a tree and expanded
+    like get_orders() or parsed incrementally.
+    """
+    def setup(n):
+        # xml orders responses could not be parsed before the incremental parser.
+        require("ally.responses.xml_items", "XMLItemParser")
+        body = ElementTree.tostring(payloads.orders_xml(n))
+        if incremental:
+            return lambda: OrdersResponse("12345678", "xml", body)
+        convert_fixml_xml = require("ally.fixml", "convert_fixml_xml")
+        return lambda: OrdersResponse("12345678", "xml",
+                                      convert_fixml_xml(ElementTree.fromstring(body), True))
+    return setup
+
+
+def holdings_response_xml(incremental):
+    def setup(n):
+        # xml holdings responses could not be parsed before the incremental parser.
+        require("ally.responses.xml_items", "XMLItemParser")
+        body = ElementTree.tostring(payloads.holdings_xml(n))
+        if incremental:
+            return lambda: AccountHoldingsResponse("12345678", "xml", body)
+        return lambda: AccountHoldingsResponse("12345678", "xml", ElementTree.fromstring(body))
+    return setup
+
+
+def quote_from_json(n):
+    quotes = payloads.quotes_json(n)["response"]["quotes"]["quote"]
+    quotes = quotes if isinstance(quotes, list) else [quotes]
+
+    def run():
+        result = []
+        for quote_json in quotes:
+            quote = Quote()
+            quote.from_json(quote_json)
+            result.append(quote)
+        return result
+    return run
+
+
+def quote_from_xml(n):
+    quotes = payloads.quotes_xml(n).find("quotes").findall("quote")
+
+    def run():
+        result = []
+        for quote_xml in quotes:
+            quote = Quote()
+            quote.from_xml(quote_xml)
+            result.append(quote)
+        return result
+    return run
+
+
+def holding_from_xml(n):
+    holdings = payloads.holdings_xml(n).find("accountholdings").findall("holding")
+
+    def run():
+        result = []
+        for holding_xml in holdings:
+            holding = Holding()
+            holding.from_xml(holding_xml)
+            result.append(holding)
+        return result
+    return run
+
+
+def quote_batch(n):
+    QuoteBatch = require("ally.responses.quote_batch", "QuoteBatch")
+    if require("ally.responses.quote_batch", "numpy") is None:
+        raise Unsupported("numpy")
+    quotes = payloads.quotes_json(n)["response"]["quotes"]["quote"]
+    quotes = quotes if isinstance(quotes, list) else [quotes]
+    return lambda: QuoteBatch(quotes)
+
+
+def holding_from_json(n):
+    holdings = payloads.holdings_json(n)["response"]["accountholdings"]["holding"]
+
+    def run():
+        result = []
+        for holding_json in holdings:
+            holding = Holding()
+            holding.from_json(holding_json)
+            result.append(holding)
+        return result
+    return run
+
+
+def order_from_json(n):
+    convert_fixml_json = require("ally.fixml", "convert_fixml_json")
+    orders = convert_fixml_json(payloads.orders_json(n))["response"]["orderstatus"]["order"]
+
+    def run():
+        result = []
+        for order_json in orders:
+            order = Order()
+            order.from_json(order_json)
+            result.append(order)
+        return result
+    return run
+
+
+def order_from_xml(n):
+    convert_fixml_xml = require("ally.fixml", "convert_fixml_xml")
+    orders = convert_fixml_xml(payloads.orders_xml(n)).find("orderstatus").findall("order")
+
+    def run():
+        result = []
+        for order_xml in orders:
+            order = Order()
+            order.from_xml(order_xml)
+            result.append(order)
+        return result
+    return run
+
+
+def convert_json(n):
+    convert_fixml_json = require("ally.fixml", "convert_fixml_json")
+    data = payloads.orders_json(n)
+    return lambda: convert_fixml_json(data)
+
+
+def convert_xml(n):
+    convert_fixml_xml = require("ally.fixml", "convert_fixml_xml")
+    data = payloads.orders_xml(n)
+    return lambda: convert_fixml_xml(data)
+
+
+def get_orders_json(mode):
+    """Decodes a get_orders() json body and expands the FIXML like
+    AllyAPI.get_orders: on a copy, in place, or not at all.
+    """
+    def setup(n):
+        if mode != "none":
+            convert_fixml_json = require("ally.fixml", "convert_fixml_json")
+        if mode == "in_place":
+            require_param(convert_fixml_json, "in_place")
+        body = json.dumps(payloads.orders_json(n)).encode("utf-8")
+        if mode == "copy":
+            return lambda: convert_fixml_json(json.loads(body))
+        if mode == "in_place":
+            return lambda: convert_fixml_json(json.loads(body), in_place=True)
+        return lambda: json.loads(body)
+    return setup
+
+
+def get_orders_xml(mode):
+    def setup(n):
+        if mode != "none":
+            convert_fixml_xml = require("ally.fixml", "convert_fixml_xml")
+        if mode == "in_place":
+            require_param(convert_fixml_xml, "in_place")
+        body = ElementTree.tostring(payloads.orders_xml(n))
+        if mode == "copy":
+            return lambda: convert_fixml_xml(ElementTree.fromstring(body))
+        if mode == "in_place":
+            return lambda: convert_fixml_xml(ElementTree.fromstring(body), in_place=True)
+        return lambda: ElementTree.fromstring(body)
+    return setup
+
+
+def fixml_dict(n):
+    fixml_to_dict = require("ally.fixml", "fixml_to_dict")
+    messages = [ElementTree.fromstring(payloads.fixml_message(i)) for i in range(n)]
+    return lambda: [fixml_to_dict(fixml) for fixml in messages]
+
+
+def to_fixml(n):
+    orders = payloads.orders(n)
+    return lambda: [order.to_fixml() for order in orders]
+
+
+def validate_each(n):
+    orders = payloads.orders(n)
+    return lambda: [order.validate() for order in orders]
+
+
+def validate_batch(n):
+    validate_orders = require("ally.responses.order", "validate_orders")
+    orders = payloads.orders(n)
+    return lambda: validate_orders(orders)
+
+
+def to_fixml_string(n):
+    orders = payloads.orders(n)
+    return lambda: [ElementTree.tostring(order.to_fixml()) for order in orders]
+
+
+def bulk_fixml(n):
+    orders_fixml = require("ally.fixml", "orders_fixml")
+    orders = payloads.orders(n)
+    return lambda: orders_fixml(orders)
+
+
+def multileg_fixml_tree(n):
+    legs = payloads.option_legs(n)
+    return lambda: get_multileg_fixml(legs)
+
+
+def multileg_fixml_string(compiled):
+    def setup(n):
+        legs = payloads.option_legs(n)
+        if compiled:
+            multileg_fixml = require("ally.fixml", "multileg_fixml")
+            return lambda: multileg_fixml(legs)
+        return lambda: ElementTree.tostring(get_multileg_fixml(legs))
+    return setup
+
+
+CASES = {
+    "QuotesResponse(json)": quotes_response,
+    "QuotesResponse(json body)": quotes_response_body(True),
+    "QuotesResponse(json body) drop raw": quotes_response_body(False),
+    "QuotesResponse(xml tree)": quotes_response_xml(False),
+    "QuotesResponse(xml incremental)": quotes_response_xml(True),
+    "QuotesResponse(json) 3 fields": quotes_response_read(False),
+    "QuotesResponse(lazy) 3 fields": quotes_response_read(True),
+    "AccountHoldingsResponse(json)": holdings_response(False),
+    "AccountHoldingsResponse(lazy)": holdings_response(True),
+    "OrdersResponse(json)": orders_response(False),
+    "OrdersResponse(lazy)": orders_response(True),
+    "AccountHoldingsResponse(xml tree)": holdings_response_xml(False),
+    "AccountHoldingsResponse(xml incremental)": holdings_response_xml(True),
+    "OrdersResponse(xml tree)": orders_response_xml(False),
+    "OrdersResponse(xml incremental)": orders_response_xml(True),
+    "Quote.from_json": quote_from_json,
+    "Quote.from_xml": quote_from_xml,
+    "QuoteBatch": quote_batch,
+    "Holding.from_json": holding_from_json,
+    "Holding.from_xml": holding_from_xml,
+    "Order.from_json": order_from_json,
+    "Order.from_xml": order_from_xml,
+    "convert_fixml_json": convert_json,
+    "convert_fixml_xml": convert_xml,
+    "get_orders(json) copy": get_orders_json("copy"),
+    "get_orders(json) in place": get_orders_json("in_place"),
+    "get_orders(json) no expansion": get_orders_json("none"),
+    "get_orders(xml) copy": get_orders_xml("copy"),
+    "get_orders(xml) in place": get_orders_xml("in_place"),
+    "get_orders(xml) no expansion": get_orders_xml("none"),
+    "fixml_to_dict": fixml_dict,
+    "Order.validate": validate_each,
+    "validate_orders": validate_batch,
+    "Order.to_fixml": to_fixml,
+    "Order.to_fixml + tostring": to_fixml_string,
+    "orders_fixml": bulk_fixml,
+    "get_multileg_fixml": multileg_fixml_tree,
+    "get_multileg_fixml + tostring": multileg_fixml_string(False),
+    "multileg_fixml": multileg_fixml_string(True),
+}
+
+
+def run(cases=None, sizes=SIZES, repeat=3):
+    """Returns {case: {size: measurement}} for the selected cases."""
+    results = {}
+    for name, setup in CASES.items():
+        if cases and name not in cases:
+            continue
+        try:
+            measurements = {str(n): harness.measure(setup(n), n, repeat) for n in sizes}
+        except Unsupported as e:
+            print("skipping {}: this version has no {}".format(name, e), file=sys.stderr)
+            continue
+        results[name] = measurements
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma separated payload sizes")
+    parser.add_argument("--case", action="append", choices=sorted(CASES),
+                        help="only run this case, may be repeated")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--label", help="name of this run, defaults to the git revision")
+    parser.add_argument("--output", help="results file, defaults to benchmarks/results/")
+    parser.add_argument("--compare", help="results file of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = run(args.case, [int(n) for n in args.sizes.split(",")], args.repeat)
+    harness.report(results, harness.load(args.compare) if args.compare else None)
+    print("saved " + harness.save("parsing", results, args.label, args.output))
+
+
+if __name__ == "__main__":
+    main()
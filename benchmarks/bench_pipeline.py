@@ -0,0 +1,89 @@
+"""Benchmark of placing a basket of orders against the stand-in server.
+
+Compares previewing and posting the orders one at a time with OrderPipeline,
+which previews and submits them concurrently, for 1 to 50 orders and a
+simulated round trip of 20 ms:
+
+    python benchmarks/bench_pipeline.py --label v1.0.17
+
+Run it from the repository root with the package importable
+(pip install -e . or PYTHONPATH=.).
+"""
+
+import argparse
+
+from ally import AllyAPI
+from ally.order_pipeline import OrderPipeline, preview_ok
+from ally.requests.post_order import PostOrderRequest
+from ally.requests.post_order_preview import PostOrderPreviewRequest
+from ally.standin import StandInServer
+
+import harness
+import payloads
+
+SIZES = (1, 10, 50)
+LATENCY = 0.02
+ACCOUNT = "12345678"
+
+
+def sequential(api, n):
+    """Previews then posts every order in turn."""
+    basket = payloads.orders(n)
+
+    def run():
+        for order in basket:
+            preview = PostOrderPreviewRequest(ACCOUNT, order).execute(api)
+            if preview_ok(order, preview):
+                PostOrderRequest(ACCOUNT, order).execute(api)
+    return run
+
+
+def pipeline(api, n):
+    basket = payloads.orders(n)
+
+    def run():
+        return list(OrderPipeline(api, ACCOUNT).run(basket))
+    return run
+
+
+CASES = {
+    "one at a time": sequential,
+    "OrderPipeline": pipeline,
+}
+
+
+def run(cases=None, sizes=SIZES, repeat=3, latency=LATENCY):
+    """Returns {case: {size: measurement}} for the selected cases."""
+    results = {}
+    with StandInServer(latency=latency) as server:
+        api = AllyAPI("secret", "token", "key", base_url=server.base_url, rate_limiter=False)
+        for name, setup in CASES.items():
+            if cases and name not in cases:
+                continue
+            results[name] = {}
+            for n in sizes:
+                results[name][str(n)] = harness.measure(setup(api, n), n, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma separated numbers of orders")
+    parser.add_argument("--case", action="append", choices=sorted(CASES),
+                        help="only run this case, may be repeated")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=LATENCY,
+                        help="simulated round trip in seconds")
+    parser.add_argument("--label", help="name of this run, defaults to the git revision")
+    parser.add_argument("--output", help="results file, defaults to benchmarks/results/")
+    parser.add_argument("--compare", help="results file of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = run(args.case, [int(n) for n in args.sizes.split(",")], args.repeat, args.latency)
+    harness.report(results, harness.load(args.compare) if args.compare else None)
+    print("saved " + harness.save("pipeline", results, args.label, args.output))
+
+
+if __name__ == "__main__":
+    main()
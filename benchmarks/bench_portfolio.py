@@ -0,0 +1,138 @@
+"""Benchmark of portfolio aggregation over the holdings of many accounts.
+
+Compares a Python loop over the Holding strings with Portfolio, and
+repricing the portfolio with update_quotes() with rebuilding it, for 1 to
+10,000 holdings spread over 10 accounts:
+
+    python benchmarks/bench_portfolio.py --label v1.0.17
+
+Run it from the repository root with the package importable
+(pip install -e . or PYTHONPATH=.).
+"""
+
+import argparse
+from collections import defaultdict
+
+from ally.responses.holding import Holding
+from ally.portfolio import Portfolio
+
+import harness
+import payloads
+
+SIZES = (1, 10, 100, 1000, 10000)
+ACCOUNTS = 10
+
+
+def accounts(n):
+    """n holdings of 10 accounts, each symbol held by every account."""
+    result = defaultdict(list)
+    for i, holding_json in enumerate(payloads.holdings_json(n)["response"]["accountholdings"]["holding"]):
+        holding = Holding()
+        holding.from_json(holding_json)
+        holding.sym = payloads.symbol(i // ACCOUNTS)
+        result[str(i % ACCOUNTS)].append(holding)
+    return result
+
+
+def loop(n):
+    """Totals and exposure per symbol and account in Python."""
+    holdings = accounts(n)
+
+    def run():
+        totals = defaultdict(float)
+        symbols = defaultdict(float)
+        pnl = defaultdict(float)
+        for account_id, account in holdings.items():
+            for holding in account:
+                marketvalue = float(holding.marketvalue)
+                gainloss = float(holding.gainloss)
+                totals["marketvalue"] += marketvalue
+                totals["costbasis"] += float(holding.costbasis)
+                totals["gainloss"] += gainloss
+                symbols[holding.sym] += marketvalue
+                pnl[account_id] += gainloss
+        return totals, symbols, pnl
+    return run
+
+
+def portfolio(n):
+    holdings = accounts(n)
+
+    def run():
+        result = Portfolio(holdings)
+        return result.totals(), result.exposure("symbol"), result.pnl("account")
+    return run
+
+
+def quotes(n):
+    """Last prices of a tenth of the symbols held."""
+    return {payloads.symbol(i): 100.0 + i % 7 for i in range(0, max(n // ACCOUNTS, 1), 10)}
+
+
+def update(n):
+    result = Portfolio(accounts(n))
+    result.totals(), result.exposure("symbol"), result.pnl("account")
+    prices = quotes(n)
+
+    def run():
+        result.update_quotes(prices)
+        return result.totals(), result.exposure("symbol"), result.pnl("account")
+    return run
+
+
+def rebuild(n):
+    """Reprices by setting the prices on the holdings and rebuilding."""
+    holdings = accounts(n)
+    prices = quotes(n)
+
+    def run():
+        for account in holdings.values():
+            for holding in account:
+                if holding.sym in prices:
+                    holding.lastprice = prices[holding.sym]
+                    holding.marketvalue = float(holding.qty) * prices[holding.sym]
+                    holding.gainloss = holding.marketvalue - float(holding.costbasis)
+        result = Portfolio(holdings)
+        return result.totals(), result.exposure("symbol"), result.pnl("account")
+    return run
+
+
+CASES = {
+    "Python loop": loop,
+    "Portfolio": portfolio,
+    "update_quotes": update,
+    "reprice and rebuild": rebuild,
+}
+
+
+def run(cases=None, sizes=SIZES, repeat=3):
+    """Returns {case: {size: measurement}} for the selected cases."""
+    results = {}
+    for name, setup in CASES.items():
+        if cases and name not in cases:
+            continue
+        results[name] = {}
+        for n in sizes:
+            results[name][str(n)] = harness.measure(setup(n), n, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma separated numbers of holdings")
+    parser.add_argument("--case", action="append", choices=sorted(CASES),
+                        help="only run this case, may be repeated")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--label", help="name of this run, defaults to the git revision")
+    parser.add_argument("--output", help="results file, defaults to benchmarks/results/")
+    parser.add_argument("--compare", help="results file of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = run(args.case, [int(n) for n in args.sizes.split(",")], args.repeat)
+    harness.report(results, harness.load(args.compare) if args.compare else None)
+    print("saved " + harness.save("portfolio", results, args.label, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Micro-benchmark of the cost of signing one API request.
+
+Compares the previous approach (a requests_oauthlib OAuth1 object, rebuilt
+every 10 seconds and signing through oauthlib) with the cached OAuthSigner
+used by AllyAPI.
+
+    python benchmarks/bench_signing.py [iterations]
+"""
+
+import sys
+import timeit
+
+import requests
+from requests_oauthlib import OAuth1
+
+from ally.signer import OAuthSigner
+
+URL = "https://api.tradeking.com/v1/market/ext/quotes.json?symbols=AAPL,MSFT,INTC,AMD"
+KEYS = ("CONSUMER KEY", "CONSUMER SECRET", "OAUTH TOKEN", "OAUTH TOKEN SECRET")
+
+
+def prepared_request():
+    return requests.Request("GET", URL).prepare()
+
+
+def main(iterations=20000):
+    oauth1 = OAuth1(KEYS[0], KEYS[1], KEYS[2], KEYS[3], signature_type='auth_header')
+    signer = OAuthSigner(*KEYS)
+    request = prepared_request()
+
+    cases = [
+        ("OAuth1 (requests_oauthlib)", lambda: oauth1(request)),
+        ("OAuth1, rebuilt per call", lambda: OAuth1(KEYS[0], KEYS[1], KEYS[2], KEYS[3],
+                                                    signature_type='auth_header')(request)),
+        ("OAuthSigner", lambda: signer(request)),
+        ("OAuthSigner.sign", lambda: signer.sign("GET", URL)),
+    ]
+    print("{:<30} {:>12}".format("signer", "us/call"))
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=iterations, repeat=3))
+        print("{:<30} {:>12.2f}".format(name, best / iterations * 1e6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
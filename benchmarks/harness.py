@@ -0,0 +1,104 @@
+"""Timing, allocation and result-file helpers shared by the benchmarks."""
+
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def measure(func, items, repeat=3):
+    """Returns the timing and allocations of one call of func.
+
+    seconds is the best of `repeat` timeit runs; peak_bytes is the largest
+    amount of memory allocated during a call and retained_bytes what is still
+    allocated afterwards while the result is kept alive.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    items = max(items, 1)
+    return {
+        "items": items,
+        "seconds": seconds,
+        "us_per_item": seconds / items * 1e6,
+        "items_per_sec": items / seconds if seconds else 0.0,
+        "peak_bytes": peak - before,
+        "retained_bytes": current - before,
+        "bytes_per_item": (current - before) / items,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "describe", "--always", "--dirty"],
+                                       stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))
+                                       ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(label=None):
+    revision = git_revision()
+    return {
+        "label": label or revision or "unknown",
+        "revision": revision,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+    }
+
+
+def save(name, results, label=None, path=None):
+    """Writes {'meta': ..., 'results': {case: {size: measurement}}} to path,
+    by default benchmarks/results/<name>-<label>.json, and returns the path.
+    """
+    meta = metadata(label)
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, "{}-{}.json".format(name, meta["label"]))
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=1, sort_keys=True)
+    return path
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def report(results, baseline=None):
+    """Prints the results, with the ratio to a baseline results file if given.
+    Ratios below 1.0 are improvements.
+    """
+    base = baseline["results"] if baseline else {}
+    header = "{:<34} {:>6} {:>12} {:>12} {:>12}".format(
+        "case", "items", "us/item", "bytes/item", "peak KiB")
+    if baseline:
+        header += " {:>8} {:>8}".format("time x", "mem x")
+    print(header)
+    for case, sizes in results.items():
+        for size, m in sizes.items():
+            line = "{:<34} {:>6} {:>12.3f} {:>12.1f} {:>12.1f}".format(
+                case, size, m["us_per_item"], m["bytes_per_item"], m["peak_bytes"] / 1024)
+            old = base.get(case, {}).get(str(size))
+            if old:
+                line += " {:>8.2f} {:>8.2f}".format(
+                    m["us_per_item"] / old["us_per_item"] if old["us_per_item"] else 0.0,
+                    m["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 0.0)
+            print(line)
@@ -0,0 +1,161 @@
+"""Synthetic API payloads for the benchmarks.
+
+The payloads are built from the stand-in server fixtures, so they have the
+same shape as real Ally responses, with every item given its own symbol and
+order id.
+"""
+
+from xml.etree import ElementTree
+import copy
+import datetime
+import json
+import os
+
+try:
+    from ally.standin.server import FIXTURES_DIR
+except ImportError:
+    # Versions without the stand-in server; the fixtures of this checkout are used.
+    FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "ally", "standin", "fixtures")
+from ally.responses.order import (Order, ORDER_TYPE, SIDE, SECURITY_TYPE, TIME_IN_FORCE,
+                                  OPTION_POSITION, OPTION_CLASS)
+
+FIXML = ('<FIXML xmlns="http://www.fixprotocol.org/FIXML-5-0-SP2"><ExecRpt OrdID="SVI-{id}" '
+         'ID="{id}" Stat="0" Acct="12345678" AcctTyp="1" Side="{side}" Typ="2" Px="{px}" '
+         'TmInForce="0" LeavesQty="10" TrdDt="2020-10-16T00:00:00.000-04:00" '
+         'TxnTm="2020-10-16T10:14:03.000-04:00"><Instrmt Sym="{sym}" SecTyp="CS" '
+         'Desc="{sym} INC"/><OrdQty Qty="10"/><Comm Comm="0.00"/></ExecRpt></FIXML>')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES_DIR, *name.split("/")), "rb") as f:
+        content = f.read()
+    return json.loads(content) if name.endswith(".json") else ElementTree.fromstring(content)
+
+
+def symbol(i):
+    return "S{:05d}".format(i)
+
+
+def quotes_json(n):
+    """A get_quote() json response with n quotes, alternating stock and option."""
+    data = fixture("market/ext/quotes.json")
+    templates = data["response"]["quotes"]["quote"]
+    templates = [templates[0], templates[-1]]
+    quotes = []
+    for i in range(n):
+        quote = dict(templates[i % 2])
+        quote["symbol"] = symbol(i)
+        quotes.append(quote)
+    data["response"]["quotes"]["quote"] = quotes[0] if n == 1 else quotes
+    return data
+
+
+def quotes_xml(n):
+    """A get_quote() xml response with n quotes, alternating stock and option."""
+    data = fixture("market/ext/quotes.xml")
+    parent = data.find("quotes")
+    templates = parent.findall("quote")
+    for quote in templates:
+        parent.remove(quote)
+    templates = [templates[0], templates[-1]]
+    for i in range(n):
+        quote = copy.deepcopy(templates[i % 2])
+        quote.find("symbol").text = symbol(i)
+        parent.append(quote)
+    return data
+
+
+def holdings_json(n):
+    """A get_account_holdings() json response with n holdings."""
+    data = fixture("accounts/id/holdings.json")
+    template = data["response"]["accountholdings"]["holding"][0]
+    holdings = []
+    for i in range(n):
+        holding = copy.deepcopy(template)
+        holding["instrument"]["sym"] = symbol(i)
+        holdings.append(holding)
+    data["response"]["accountholdings"]["holding"] = holdings
+    return data
+
+
+def holdings_xml(n):
+    """A get_account_holdings() xml response with n holdings."""
+    data = fixture("accounts/id/holdings.xml")
+    parent = data.find("accountholdings")
+    templates = parent.findall("holding")
+    for holding in templates:
+        parent.remove(holding)
+    for i in range(n):
+        holding = copy.deepcopy(templates[0])
+        holding.find("instrument/sym").text = symbol(i)
+        parent.append(holding)
+    return data
+
+
+def fixml_message(i):
+    return FIXML.format(id=1000000000 + i, side=1 + i % 2, px="{:.2f}".format(100 + i % 50),
+                        sym=symbol(i))
+
+
+def orders_json(n):
+    """A raw get_orders() json response with n orders."""
+    data = fixture("accounts/id/orders.json")
+    orders = [{"fixmlmessage": fixml_message(i)} for i in range(n)]
+    data["response"]["orderstatus"]["order"] = orders[0] if n == 1 else orders
+    return data
+
+
+def orders_xml(n):
+    """A raw get_orders() xml response with n orders."""
+    data = fixture("accounts/id/orders.xml")
+    parent = data.find("orderstatus")
+    for order in parent.findall("order"):
+        parent.remove(order)
+    for i in range(n):
+        order = ElementTree.SubElement(parent, "order")
+        ElementTree.SubElement(order, "fixmlmessage").text = fixml_message(i)
+    return data
+
+
+def history_json(n):
+    """A get_account_history() json response with n transactions."""
+    data = fixture("accounts/id/history.json")
+    template = data["response"]["transactions"]["transaction"][0]
+    transactions = []
+    for i in range(n):
+        transaction = copy.deepcopy(template)
+        transaction["symbol"] = transaction["transaction"]["security"]["sym"] = symbol(i)
+        transactions.append(transaction)
+    data["response"]["transactions"]["transaction"] = transactions
+    return data
+
+
+def orders(n):
+    """n Order objects, alternating stock limit orders and option legs."""
+    result = []
+    for i in range(n):
+        if i % 2:
+            result.append(Order(acct="12345678", sym=symbol(i), qty=1,
+                                sec_typ=SECURITY_TYPE.OPTION, side=SIDE.BUY,
+                                typ=ORDER_TYPE.LIMIT, px=1.5,
+                                tm_in_force=TIME_IN_FORCE.DAY,
+                                pos_efct=OPTION_POSITION.OPEN, strk_px=120.0,
+                                cfi=OPTION_CLASS.CALL, mat_dt=datetime.datetime(2020, 11, 20),
+                                mmy="202011"))
+        else:
+            result.append(Order(acct="12345678", sym=symbol(i), qty=10,
+                                sec_typ=SECURITY_TYPE.COMMON_STOCK, side=SIDE.BUY,
+                                typ=ORDER_TYPE.LIMIT, px=100.0,
+                                tm_in_force=TIME_IN_FORCE.DAY))
+    return result
+
+
+def option_legs(n):
+    """n option legs sharing the fields a multi-leg order requires to match."""
+    return [Order(acct="12345678", sym="AAPL", qty=1, sec_typ=SECURITY_TYPE.OPTION,
+                  side=SIDE.BUY if i % 2 else SIDE.SELL, typ=ORDER_TYPE.LIMIT, px=1.5,
+                  tm_in_force=TIME_IN_FORCE.DAY, pos_efct=OPTION_POSITION.OPEN,
+                  strk_px=100.0 + i, cfi=OPTION_CLASS.CALL,
+                  mat_dt=datetime.datetime(2020, 11, 20), mmy="202011")
+            for i in range(n)]
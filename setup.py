@@ -14,8 +14,16 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     packages=find_packages(),
+    package_data={
+        'ally.standin': ['fixtures/*', 'fixtures/*/*', 'fixtures/*/*/*', 'fixtures/*/*/*/*'],
+    },
     install_requires=[
         'requests',
         'requests_oauthlib',
-    ]
+    ],
+    extras_require={
+        'async': ['aiohttp'],
+        'numpy': ['numpy'],
+        'fast-json': ['orjson'],
+    }
 )